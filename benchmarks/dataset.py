@@ -0,0 +1,275 @@
+"""
+Fills an empty database with a deterministic synthetic boarding house.
+
+Usage:
+    python -m benchmarks.dataset [--url sqlite:///marites_bench.db] [--scale production] [--seed 0]
+
+Rooms, tenants, leases and payments are streamed to the bulk inserts of
+`BoardingHouseManager` chunk by chunk, so even millions of payments are never
+held in memory at once. The same seed and scale always produce the same rows,
+primary keys included, which is why the database has to be empty.
+
+A SQLite database gets its tables from the models. A MySQL database has to be
+created from database/schema first, since only those scripts add the
+tenantCount and change log triggers.
+
+The rows respect the schema constraints:
+    - every contact number matches `chk_contactNumber` (09 followed by 9 digits)
+    - every room gets a capacity of at least its number of tenants
+    - every room with tenants has exactly one lease, held by one of its tenants
+    - every lease ends after it starts and every payment falls within its lease
+"""
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+from random import Random
+from time import perf_counter
+from re import findall
+from typing import Any, Iterator, NamedTuple
+
+from sqlalchemy import func, select, text, Engine
+
+from src.models.base import Base
+from src.models.entities import Room, Tenant, Lease, Payment
+from src.managers.manager import BoardingHouseManager
+from src.services.service import get_engine, dispose_engines, sessionmaker
+
+URL = "sqlite://"
+SEED = 0
+CHUNK_SIZE = 10_000
+
+TRIGGERS_SCRIPT = Path(__file__).parent.parent / "database" / "schema" / "2. triggers.sql"
+
+LAST_NAMES = (
+    "Santos", "Reyes", "Cruz", "Bautista", "Ocampo", "Garcia", "Mendoza", "Torres",
+    "Tomas", "Andrada", "Castillo", "Flores", "Villanueva", "Ramos", "Castro", "Rivera",
+    "Aquino", "Navarro", "Salazar", "Mercado", "Dela Cruz", "Del Rosario", "Gonzales", "Lopez"
+)
+
+FIRST_NAMES = (
+    "Jose", "Juan", "Mark", "John", "Michael", "Angelo", "Christian", "Paolo",
+    "Maria", "Ana", "Kristine", "Angelica", "Nicole", "Patricia", "Camille", "Andrea",
+    "Miguel", "Gabriel", "Rafael", "Carlo", "Bea", "Joy", "Grace", "Princess"
+)
+
+BIRTH_DATES = (date(1960, 1, 1), date(2005, 12, 31))
+LEASE_STARTS = (date(2020, 1, 1), date(2024, 12, 31))
+LEASE_DAYS = (180, 730)
+MONTHLY_RENTS = (2_500, 15_000)  # whole pesos
+SPARE_CAPACITY = 2
+PAID_RATIO = 0.9
+
+class Scale(NamedTuple):
+    rooms: int
+    tenants: int
+    payments: int
+
+SCALES = {
+    "tiny": Scale(100, 1_000, 10_000),
+    "small": Scale(1_000, 10_000, 100_000),
+    "medium": Scale(5_000, 50_000, 1_000_000),
+    "production": Scale(10_000, 100_000, 5_000_000),
+}
+
+class LeaseKey(NamedTuple):
+    leaser_id: int
+    room_number: int
+    lease_start: date
+    lease_days: int
+    monthly_rent_amount: Decimal
+
+def random_date(rng: Random, bounds: tuple[date, date]) -> date:
+    start, end = bounds
+    return start + timedelta(days=rng.randrange((end - start).days + 1))
+
+class Dataset:
+    """
+    Deterministic synthetic dataset of a given scale.
+    
+    Every table draws from its own random generator seeded from `seed`, so
+    each stream is reproducible on its own regardless of how far the others
+    have been consumed.
+    """
+    
+    def __init__(self, scale: Scale, seed: int = SEED) -> None:
+        self.scale = scale
+        self.seed = seed
+        
+        # Spread the tenants over the rooms; a few hundred thousand draws at most
+        rng = self.__rng("occupancy")
+        self.occupancy = [0] * scale.rooms
+        
+        for _ in range(scale.tenants if scale.rooms else 0):
+            self.occupancy[rng.randrange(scale.rooms)] += 1
+        
+        self.leases: list[LeaseKey] = []
+    
+    def __rng(self, table: str) -> Random:
+        return Random(f"{self.seed}:{table}")
+    
+    def rooms(self) -> Iterator[dict[str, Any]]:
+        rng = self.__rng("rooms")
+        
+        for index, tenants in enumerate(self.occupancy):
+            yield {
+                "room_number": index + 1,
+                "max_capacity": max(tenants + rng.randint(0, SPARE_CAPACITY), 1),
+                # Counted up by the tenants triggers
+                "tenant_count": 0
+            }
+    
+    def tenants(self) -> Iterator[dict[str, Any]]:
+        rng = self.__rng("tenants")
+        tenant_id = 0
+        
+        for index, tenants in enumerate(self.occupancy):
+            for _ in range(tenants):
+                tenant_id += 1
+                
+                yield {
+                    "tenant_id": tenant_id,
+                    "last_name": rng.choice(LAST_NAMES),
+                    "first_name": rng.choice(FIRST_NAMES),
+                    "middle_name": rng.choice(LAST_NAMES),
+                    "birth_date": random_date(rng, BIRTH_DATES),
+                    "contact_number": f"09{rng.randrange(10 ** 9):09d}",
+                    "room_number": index + 1
+                }
+    
+    def lease_keys(self) -> list[LeaseKey]:
+        """
+        Function to get one lease per occupied room, held by its first tenant.
+        The payments are drawn against these, so they are kept in memory.
+        """
+        if not self.leases and self.scale.tenants:
+            rng = self.__rng("leases")
+            first_tenant_id = 1
+            
+            for index, tenants in enumerate(self.occupancy):
+                if tenants:
+                    self.leases.append(LeaseKey(
+                        first_tenant_id,
+                        index + 1,
+                        random_date(rng, LEASE_STARTS),
+                        rng.randint(*LEASE_DAYS),
+                        Decimal(rng.randint(*MONTHLY_RENTS))
+                    ))
+                
+                first_tenant_id += tenants
+        
+        return self.leases
+    
+    def lease_rows(self) -> Iterator[dict[str, Any]]:
+        for lease_id, lease in enumerate(self.lease_keys(), start=1):
+            yield {
+                "lease_id": lease_id,
+                "leaser_id": lease.leaser_id,
+                "room_number": lease.room_number,
+                "lease_start": lease.lease_start,
+                "lease_end": lease.lease_start + timedelta(days=lease.lease_days),
+                "monthly_rent_amount": lease.monthly_rent_amount
+            }
+    
+    def payments(self) -> Iterator[dict[str, Any]]:
+        leases = self.lease_keys()
+        
+        if not leases:
+            return
+        
+        rng = self.__rng("payments")
+        
+        for payment_id in range(1, self.scale.payments + 1):
+            lease = leases[rng.randrange(len(leases))]
+            
+            yield {
+                "payment_id": payment_id,
+                "room_number": lease.room_number,
+                "leaser_id": lease.leaser_id,
+                "payment_amount": lease.monthly_rent_amount,
+                "payment_date": lease.lease_start + timedelta(days=rng.randrange(lease.lease_days)),
+                "paid": rng.random() < PAID_RATIO
+            }
+
+def seed(manager: BoardingHouseManager, dataset: Dataset, chunk_size: int = CHUNK_SIZE) -> dict[str, int]:
+    """
+    Function to insert `dataset` into the empty database of `manager`.
+    Returns the number of rows inserted per table.
+    """
+    with manager.session() as session:
+        for entity in (Room, Tenant, Lease, Payment):
+            if session.scalar(select(func.count()).select_from(entity)):
+                raise ValueError(f"{entity.__tablename__} is not empty, seed a fresh database")
+    
+    return {
+        "rooms": manager.bulk_add_rooms(dataset.rooms(), chunk_size),
+        "tenants": manager.bulk_add_tenants(dataset.tenants(), chunk_size),
+        "leases": manager.bulk_add_leases(dataset.lease_rows(), chunk_size),
+        "payments": manager.bulk_add_payments(dataset.payments(), chunk_size)
+    }
+
+def create_schema(engine: Engine) -> None:
+    """
+    Function to create the tables of a SQLite database, triggers included, from
+    the models. Any other database must have had the scripts of database/schema
+    applied, as `create_all` would leave out its triggers; raises ValueError
+    when one of them is missing.
+    """
+    if engine.dialect.name == "sqlite":
+        Base.metadata.create_all(engine)
+        return
+    
+    with engine.connect() as connection:
+        triggers = set(connection.scalars(text(
+            "SELECT TRIGGER_NAME FROM information_schema.TRIGGERS WHERE TRIGGER_SCHEMA = DATABASE()"
+        )))
+    
+    if missing := [name for name in findall(r"CREATE TRIGGER `(\w+)`", TRIGGERS_SCRIPT.read_text()) if name not in triggers]:
+        raise ValueError(f"missing triggers {', '.join(missing)}, create the database from database/schema first")
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default=URL)
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    parser.add_argument("--rooms", type=int, help="overrides the rooms of --scale")
+    parser.add_argument("--tenants", type=int, help="overrides the tenants of --scale")
+    parser.add_argument("--payments", type=int, help="overrides the payments of --scale")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+    
+    scale = SCALES[args.scale]._replace(**{
+        field: getattr(args, field)
+        for field in Scale._fields
+        if getattr(args, field) is not None
+    })
+    
+    engine = get_engine(args.url)
+    
+    try:
+        create_schema(engine)
+    except ValueError as err:
+        parser.error(str(err))
+    
+    manager = BoardingHouseManager(sessionmaker(bind=engine, expire_on_commit=False))
+    
+    started = perf_counter()
+    
+    try:
+        counts = seed(manager, Dataset(scale, args.seed), args.chunk_size)
+    except ValueError as err:
+        parser.error(str(err))
+    
+    seconds = perf_counter() - started
+    
+    for table, rows in counts.items():
+        print(f"{table:10}{rows:>12}")
+    
+    print(f"{sum(counts.values())} rows in {seconds:.1f} s ({sum(counts.values()) / seconds:.0f} rows/s)")
+    
+    dispose_engines()
+
+if __name__ == "__main__":
+    main()
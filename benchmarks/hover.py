@@ -0,0 +1,109 @@
+"""
+Benchmarks the CPU spent on the hover buttons while the mouse moves over a long list.
+
+Usage:
+    python -m benchmarks.hover [--rows 5000] [--seconds 5] [--rate 500] [--output results.json]
+
+The payments list of a room window is filled with `--rows` rows, then motion
+events are generated over it in real time, `--rate` per second like a gaming
+mouse, while the pointer sweeps up and down the visible rows. Reported is the
+CPU time of the process per second of movement, and how often the buttons
+were moved, which should be once per row entered rather than once per event.
+
+Needs a display.
+"""
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from datetime import date, timedelta
+from json import dump
+from time import perf_counter, process_time, sleep
+from typing import Any
+
+from src.views.rooms import HEADING_HEIGHT, RoomOpenWindow, reconcile
+from src.views.root import window_pool
+
+ROWS = 5_000
+SECONDS = 5.0
+RATE = 500  # motion events per second
+SWEEP_SPEED = 300  # pixels per second
+
+def fill(window: RoomOpenWindow, rows: int) -> None:
+    reconcile(
+        window.payments_treeview,
+        (
+            (str(i), (date(2024, 1, 1) + timedelta(days=i), "5000.00", "Paid"))
+            for i in range(rows)
+        )
+    )
+
+def sweep(window: RoomOpenWindow, seconds: float, rate: int) -> dict[str, Any]:
+    """
+    Function to move the pointer over the visible rows for `seconds`, one
+    motion event every 1 / `rate` seconds, letting Tk run between events.
+    """
+    tree = window.payments_treeview
+    button = window.edit_payment_button
+    
+    tree.update()
+    
+    x = tree.winfo_width() // 2
+    span = tree.winfo_height() - HEADING_HEIGHT - 1
+    
+    events = 0
+    moves = 0
+    placed = None
+    
+    started = perf_counter()
+    cpu_started = process_time()
+    
+    while (elapsed := perf_counter() - started) < seconds:
+        # Triangle wave, down the list and back up
+        offset = int(elapsed * SWEEP_SPEED) % (2 * span)
+        y = HEADING_HEIGHT + (offset if offset < span else 2 * span - offset)
+        
+        tree.event_generate("<Motion>", x=x, y=y)
+        tree.update()
+        events += 1
+        
+        if (position := button.place_info().get("y")) != placed:
+            placed = position
+            moves += 1
+        
+        sleep(max(0.0, started + events / rate - perf_counter()))
+    
+    cpu = process_time() - cpu_started
+    
+    return {
+        "events": events,
+        "button_moves": moves,
+        "cpu_ms_per_second": cpu / seconds * 1000,
+        "cpu_us_per_event": cpu / events * 1_000_000 if events else 0.0
+    }
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=ROWS)
+    parser.add_argument("--seconds", type=float, default=SECONDS)
+    parser.add_argument("--rate", type=int, default=RATE)
+    parser.add_argument("--output", help="file to write the results to as JSON")
+    args = parser.parse_args()
+    
+    window = window_pool.acquire(RoomOpenWindow)
+    fill(window, args.rows)
+    
+    results = {"rows": args.rows, "rate": args.rate, **sweep(window, args.seconds, args.rate)}
+    
+    window.destroy()
+    
+    print(
+        f"{results['events']} motion events, buttons moved {results['button_moves']} times, "
+        f"{results['cpu_ms_per_second']:.1f} ms CPU per second ({results['cpu_us_per_event']:.0f} us per event)"
+    )
+    
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            dump(results, file, indent=2)
+
+if __name__ == "__main__":
+    main()
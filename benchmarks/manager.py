@@ -0,0 +1,299 @@
+"""
+Benchmarks the hot paths of BoardingHouseManager at several dataset sizes.
+
+Usage:
+    python -m benchmarks.manager [--url URL] [--scales tiny,small] [--output results.json]
+    python -m benchmarks.manager --compare baseline.json [--threshold 1.2]
+
+Every scale is seeded with `benchmarks.dataset` into an emptied database, then
+each operation is timed on its own. Reported per operation are the latency
+percentiles, the rows handled per second and the SQL statements per call.
+
+The results are written as JSON. With `--compare`, the run is checked against
+an earlier result file and exits with status 1 when an operation got slower
+than `--threshold` times its baseline median or issues more statements.
+
+Runs against an in-memory SQLite database unless `--url` is given. A MySQL
+database has to be created from database/schema first; its rows are deleted
+before every scale, so point it at a scratch database, never at production data.
+"""
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from datetime import date, datetime, timezone
+from json import dump, load
+from platform import python_version
+from random import Random
+from statistics import mean, quantiles
+from sys import exit
+from time import perf_counter
+from typing import Any, Callable, NamedTuple, Optional
+
+from sqlalchemy import __version__ as sqlalchemy_version, delete, event, func, select, Engine
+
+from src.models.entities import Room, Tenant, Lease, Payment, Change
+from src.managers.manager import BoardingHouseManager
+from src.services.service import get_engine, dispose_engines, sessionmaker
+
+from benchmarks.dataset import SCALES, SEED, Dataset, create_schema, seed
+
+URL = "sqlite://"
+DEFAULT_SCALES = "tiny,small"
+THRESHOLD = 1.2
+
+# Full scans are timed fewer times than point operations
+SCAN_REPEATS = 5
+POINT_REPEATS = 50
+
+class Operation(NamedTuple):
+    name: str
+    repeats: int
+    prepare: Callable[[int], Any]
+    run: Callable[[Any], int]  # returns the number of rows handled
+
+class StatementCounter:
+    """
+    Counts the SQL statements sent through an engine; an executemany counts once.
+    """
+    
+    def __init__(self, engine: Engine) -> None:
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self.__count)
+    
+    def __count(self, *args: Any) -> None:
+        self.count += 1
+
+def clear_database(manager: BoardingHouseManager) -> None:
+    with manager.session() as session:
+        # The change log last, as the deletes above log changes too
+        for entity in (Payment, Lease, Tenant, Room, Change):
+            session.execute(delete(entity))
+        
+        session.commit()
+    
+    manager.clear_cache()
+
+def operations(manager: BoardingHouseManager, rng: Random) -> list[Operation]:
+    """
+    Function to get the benchmarked operations, in the order they are run.
+    Destructive operations come last so they do not shrink the data of the others.
+    """
+    with manager.session() as session:
+        room_numbers = list(session.scalars(select(Room.room_number)))
+        leases = list(session.execute(select(Lease.leaser_id, Lease.room_number)))
+        next_room_number = (session.scalar(select(func.max(Room.room_number))) or 0) + 1
+    
+    # Room with space for every tenant added by the benchmark
+    manager.add_room(Room(room_number=next_room_number, max_capacity=POINT_REPEATS + 1, tenant_count=0))
+    
+    # Occupied rooms deleted one per call, never the same one twice
+    doomed_rooms = [room_number for _, room_number in leases]
+    rng.shuffle(doomed_rooms)
+    
+    def get_all_rooms(_: Any) -> int:
+        manager.clear_cache()
+        return len(list(manager.get_all_rooms()))
+    
+    def get_room(room_number: int) -> int:
+        manager.clear_cache()
+        return int(manager.get_room(room_number) is not None)
+    
+    def get_room_detail(room_number: int) -> int:
+        room = manager.get_room_detail(room_number)
+        
+        return 0 if room is None else 1 + len(room.tenants) + len(room.payments)
+    
+    def add_tenant(tenant: Tenant) -> int:
+        manager.add_tenant(tenant)
+        return 1
+    
+    def add_payment(payment: Payment) -> int:
+        manager.add_payment(payment)
+        return 1
+    
+    def delete_room(room: Room) -> int:
+        manager.delete_room(room)
+        return 1
+    
+    def get_all_payments(_: Any) -> int:
+        return len(list(manager.get_all_payments()))
+    
+    def random_room(_: int) -> int:
+        return rng.choice(room_numbers)
+    
+    def new_tenant(i: int) -> Tenant:
+        return Tenant(
+            last_name="Benchmark",
+            first_name=f"Tenant {i}",
+            middle_name="",
+            birth_date=date(2000, 1, 1),
+            contact_number=f"09{i:09d}",
+            room_number=next_room_number
+        )
+    
+    def new_payment(_: int) -> Payment:
+        leaser_id, room_number = rng.choice(leases)
+        
+        return Payment(
+            room_number=room_number,
+            leaser_id=leaser_id,
+            payment_amount=5000,
+            payment_date=date(2024, 1, 1),
+            paid=True
+        )
+    
+    return [
+        Operation("get_all_rooms", SCAN_REPEATS, lambda i: None, get_all_rooms),
+        Operation("get_room", POINT_REPEATS, random_room, get_room),
+        Operation("get_room_detail", POINT_REPEATS, random_room, get_room_detail),
+        Operation("get_all_payments", SCAN_REPEATS, lambda i: None, get_all_payments),
+        Operation("add_tenant", POINT_REPEATS, new_tenant, add_tenant),
+        Operation("add_payment", POINT_REPEATS, new_payment, add_payment),
+        Operation(
+            "delete_room",
+            min(POINT_REPEATS, len(doomed_rooms) - 1),
+            lambda i: Room(room_number=doomed_rooms[i]),
+            delete_room
+        ),
+    ]
+
+def measure(operation: Operation, counter: StatementCounter) -> dict[str, float]:
+    """
+    Function to time `operation.repeats` calls after one untimed warm-up call.
+    Only the call itself is timed, not the preparation of its argument.
+    """
+    operation.run(operation.prepare(operation.repeats))
+    
+    times = []
+    rows = 0
+    statements = counter.count
+    
+    for i in range(operation.repeats):
+        argument = operation.prepare(i)
+        
+        started = perf_counter()
+        rows += operation.run(argument)
+        times.append(perf_counter() - started)
+    
+    statements = counter.count - statements
+    cuts = quantiles(times, n=100, method="inclusive") if len(times) > 1 else times * 99
+    
+    return {
+        "calls": len(times),
+        "mean_ms": mean(times) * 1000,
+        "p50_ms": cuts[49] * 1000,
+        "p95_ms": cuts[94] * 1000,
+        "p99_ms": cuts[98] * 1000,
+        "max_ms": max(times) * 1000,
+        "rows_per_second": rows / sum(times) if sum(times) else 0.0,
+        "statements_per_call": statements / len(times)
+    }
+
+def run_scale(manager: BoardingHouseManager, counter: StatementCounter, scale: str, seed_value: int) -> dict[str, dict[str, float]]:
+    clear_database(manager)
+    seed(manager, Dataset(SCALES[scale], seed_value))
+    
+    rng = Random(seed_value)
+    
+    return {
+        operation.name: measure(operation, counter)
+        for operation in operations(manager, rng)
+        if operation.repeats > 0
+    }
+
+def print_results(results: dict[str, dict[str, dict[str, float]]]) -> None:
+    print(f"{'':10}{'operation':18}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'rows/s':>12}{'stmts':>7}")
+    
+    for scale, scale_results in results.items():
+        for name, result in scale_results.items():
+            print(
+                f"{scale:10}{name:18}{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}"
+                f"{result['p99_ms']:>10.2f}{result['rows_per_second']:>12.0f}{result['statements_per_call']:>7.1f}"
+            )
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    """
+    Function to compare a run against a baseline run. Returns the description
+    of every regression: a median slower than `threshold` times the baseline
+    or more statements per call.
+    """
+    regressions = []
+    
+    print(f"\n{'':10}{'operation':18}{'base p50':>10}{'p50':>10}{'ratio':>8}{'stmts':>12}")
+    
+    for scale, scale_results in results["results"].items():
+        for name, result in scale_results.items():
+            if (base := baseline["results"].get(scale, {}).get(name)) is None:
+                continue
+            
+            ratio = result["p50_ms"] / base["p50_ms"] if base["p50_ms"] else 1.0
+            statements = f"{base['statements_per_call']:.1f}->{result['statements_per_call']:.1f}"
+            
+            print(f"{scale:10}{name:18}{base['p50_ms']:>10.2f}{result['p50_ms']:>10.2f}{ratio:>8.2f}{statements:>12}")
+            
+            if ratio > threshold:
+                regressions.append(f"{scale}/{name}: median {ratio:.2f}x the baseline")
+            
+            if result["statements_per_call"] > base["statements_per_call"]:
+                regressions.append(f"{scale}/{name}: {statements} statements per call")
+    
+    return regressions
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default=URL)
+    parser.add_argument("--scales", default=DEFAULT_SCALES, help=f"comma-separated, of {', '.join(SCALES)}")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--output", help="file to write the results to as JSON")
+    parser.add_argument("--compare", help="earlier result file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    args = parser.parse_args()
+    
+    scales = args.scales.split(",")
+    
+    if unknown := [scale for scale in scales if scale not in SCALES]:
+        parser.error(f"unknown scales: {', '.join(unknown)}")
+    
+    engine = get_engine(args.url)
+    
+    try:
+        create_schema(engine)
+    except ValueError as err:
+        parser.error(str(err))
+    
+    manager = BoardingHouseManager(sessionmaker(bind=engine, expire_on_commit=False))
+    counter = StatementCounter(engine)
+    
+    results = {
+        "meta": {
+            "url": engine.url.render_as_string(hide_password=True),
+            "dialect": engine.dialect.name,
+            "python": python_version(),
+            "sqlalchemy": sqlalchemy_version,
+            "seed": args.seed,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds")
+        },
+        "results": {scale: run_scale(manager, counter, scale, args.seed) for scale in scales}
+    }
+    
+    dispose_engines()
+    print_results(results["results"])
+    
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            dump(results, file, indent=2)
+    
+    regressions: Optional[list[str]] = None
+    
+    if args.compare is not None:
+        with open(args.compare) as file:
+            regressions = compare(results, load(file), args.threshold)
+        
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+    
+    if regressions:
+        exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Benchmarks the startup of the application up to a usable login form.
+
+Usage:
+    python -m benchmarks.startup [--repeats 10] [--headless] [--output results.json]
+
+Every start runs in a fresh interpreter and reports:
+    - import_ms: importing `src.app.app`
+    - login_ms: process start until the login form is drawn
+    - warm_up_ms: loading the database code in the background afterwards
+    - process_ms: the whole process, as seen from outside
+It also checks that SQLAlchemy and tkcalendar are not loaded before the login
+form shows, as these are what the background warm-up is for.
+
+A cold start compiles every module from source, with the bytecode cache
+redirected to an empty directory; a warm start reuses a primed one. Bytecode
+is written for both, whatever PYTHONDONTWRITEBYTECODE says. The operating
+system file cache is not dropped, so a cold start after a reboot is slower still.
+
+With `--headless` no window is created, for machines without a display; the
+login time is then the import time alone.
+"""
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from json import dump, loads
+from os import environ
+from pathlib import Path
+from statistics import median
+from subprocess import run
+from sys import executable, exit
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+REPEATS = 10
+
+# Modules the login form must show without
+DEFERRED_MODULES = ("sqlalchemy", "tkcalendar", "src.models.entities", "src.controllers.controller")
+
+CHILD = """
+import sys
+from json import dumps
+from time import perf_counter
+
+started = perf_counter()
+
+from src.app.app import App
+from src.app.startup import start_warm_up, finish_warm_up
+
+imported = perf_counter()
+
+if {headless}:
+    app = None
+else:
+    app = App()
+    app.main_window.update()
+
+login = perf_counter()
+loaded = [module for module in {deferred!r} if module in sys.modules]
+
+start_warm_up()
+finish_warm_up()
+
+warmed_up = perf_counter()
+
+if app is not None:
+    app.main_window.destroy()
+
+print(dumps({{
+    "import_ms": (imported - started) * 1000,
+    "login_ms": (login - started) * 1000,
+    "warm_up_ms": (warmed_up - login) * 1000,
+    "loaded_before_login": loaded
+}}))
+"""
+
+def start(headless: bool, pycache: str) -> dict[str, Any]:
+    """
+    Function to time one start of the application in a fresh interpreter,
+    with its bytecode cache in `pycache`. The interpreter startup itself is
+    part of `process_ms` only.
+    """
+    code = CHILD.format(headless=headless, deferred=DEFERRED_MODULES)
+    env = {
+        **{name: value for name, value in environ.items() if name != "PYTHONDONTWRITEBYTECODE"},
+        "PYTHONPYCACHEPREFIX": pycache
+    }
+    
+    started = perf_counter()
+    process = run([executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True)
+    process_ms = (perf_counter() - started) * 1000
+    
+    if process.returncode != 0:
+        raise RuntimeError(f"the application failed to start:\n{process.stderr}")
+    
+    return {**loads(process.stdout.splitlines()[-1]), "process_ms": process_ms}
+
+def summarize(starts: list[dict[str, Any]]) -> dict[str, Any]:
+    return {
+        **{
+            f"{key[:-3]}_p50_ms": median(start[key] for start in starts)
+            for key in ("import_ms", "login_ms", "warm_up_ms", "process_ms")
+        },
+        "max_login_ms": max(start["login_ms"] for start in starts),
+        "loaded_before_login": sorted({module for start in starts for module in start["loaded_before_login"]})
+    }
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--headless", action="store_true", help="do not create the login window")
+    parser.add_argument("--output", help="file to write the results to as JSON")
+    args = parser.parse_args()
+    
+    cold = []
+    warm = []
+    
+    for _ in range(args.repeats):
+        with TemporaryDirectory() as pycache:
+            cold.append(start(args.headless, pycache))
+    
+    with TemporaryDirectory() as pycache:
+        start(args.headless, pycache)  # primes the bytecode cache
+        
+        for _ in range(args.repeats):
+            warm.append(start(args.headless, pycache))
+    
+    results = {"cold": summarize(cold), "warm": summarize(warm)}
+    
+    print(f"{'':6}{'import ms':>11}{'login ms':>11}{'warm-up ms':>12}{'process ms':>12}")
+    
+    for name, result in results.items():
+        print(
+            f"{name:6}{result['import_p50_ms']:>11.1f}{result['login_p50_ms']:>11.1f}"
+            f"{result['warm_up_p50_ms']:>12.1f}{result['process_p50_ms']:>12.1f}"
+        )
+    
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            dump(results, file, indent=2)
+    
+    if loaded := results["cold"]["loaded_before_login"]:
+        print(f"REGRESSION loaded before the login form: {', '.join(loaded)}")
+        exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Benchmarks opening and closing the room window and its forms.
+
+Usage:
+    python -m benchmarks.windows [--cycles 200] [--scale tiny] [--output results.json]
+
+The room list is opened on an in-memory SQLite database seeded with
+`benchmarks.dataset`. Rooms are then opened and closed through their
+controllers, one after the other, like a user going through them, and so are
+the forms of a room. The room details are loaded before the timer starts, so
+only the windows are measured. Windows come from the window pool as in the
+application, so after the first cycle an open reuses a hidden window.
+
+Reported per window are the latency percentiles of an open (window drawn and
+filled) and of a close, and the memory growth per open/close cycle: of the
+whole process (resident set size, Linux only) and of the Python heap. After
+the first `--warm-up` cycles, neither should grow.
+
+Needs a display.
+"""
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from gc import collect
+from json import dump
+from os import sysconf
+from pathlib import Path
+from random import Random
+from statistics import quantiles
+from time import perf_counter
+from tracemalloc import get_traced_memory, start as start_tracing, stop as stop_tracing
+from typing import Any, Callable, Optional
+
+from src.controllers.controller import (
+    RoomListController, RoomOpenController, RoomFormController, TenantFormController,
+    LeaseFormController, PaymentFormController, load_room_detail
+)
+from src.managers.manager import BoardingHouseManager
+from src.models.base import Base
+from src.services.service import get_engine, dispose_engines, sessionmaker
+from src.views.forms import RoomForm, TenantForm, LeaseForm, PaymentForm
+from src.views.rooms import RoomListWindow, RoomOpenWindow
+from src.views.root import W, get_root, window_pool
+
+from benchmarks.dataset import SCALES, SEED, Dataset, seed
+
+URL = "sqlite://"
+CYCLES = 200
+WARM_UP = 20
+
+STATM = Path("/proc/self/statm")
+
+def resident_memory() -> Optional[int]:
+    """
+    Function to get the resident set size of the process in bytes, where the
+    platform exposes it.
+    """
+    if not STATM.exists():
+        return None
+    
+    return int(STATM.read_text().split()[1]) * sysconf("SC_PAGE_SIZE")
+
+def percentiles(times: list[float]) -> dict[str, float]:
+    cuts = quantiles(times, n=100, method="inclusive")
+    
+    return {
+        "p50_ms": cuts[49] * 1000,
+        "p95_ms": cuts[94] * 1000,
+        "max_ms": max(times) * 1000
+    }
+
+def growth(samples: list[int]) -> float:
+    """
+    Function to get the growth per cycle of `samples`, as the slope of their
+    least-squares line, which a single garbage collection does not skew.
+    """
+    n = len(samples)
+    mean_x = (n - 1) / 2
+    mean_y = sum(samples) / n
+    
+    return (
+        sum((x - mean_x) * (y - mean_y) for x, y in enumerate(samples))
+        / sum((x - mean_x) ** 2 for x in range(n))
+    )
+
+def run_cycles(
+    open_window: Callable[[int], Any],
+    cycles: int,
+    warm_up: int
+) -> dict[str, Any]:
+    """
+    Function to open a window through `open_window`, which returns its
+    controller, and close it again through that controller, `cycles` times
+    after `warm_up` untimed cycles.
+    """
+    opens = []
+    closes = []
+    heap = []
+    resident = []
+    
+    root = get_root()
+    
+    start_tracing()
+    
+    for cycle in range(warm_up + cycles):
+        started = perf_counter()
+        controller = open_window(cycle)
+        controller.window.update()
+        opened = perf_counter()
+        
+        controller.close()
+        root.update()
+        closed = perf_counter()
+        
+        del controller
+        
+        if cycle < warm_up:
+            continue
+        
+        opens.append(opened - started)
+        closes.append(closed - opened)
+        
+        collect()
+        heap.append(get_traced_memory()[0])
+        
+        if (rss := resident_memory()) is not None:
+            resident.append(rss)
+    
+    stop_tracing()
+    
+    return {
+        "cycles": cycles,
+        "open": percentiles(opens),
+        "close": percentiles(closes),
+        "heap_bytes_per_cycle": growth(heap),
+        "rss_bytes_per_cycle": growth(resident) if resident else None
+    }
+
+def subjects(list_controller: RoomListController, room_numbers: list[int]) -> dict[str, Callable[[int], Any]]:
+    """
+    Function to get the benchmarked windows, each as a function opening it
+    the way its button does. The forms are opened on a room with a lease.
+    """
+    manager = list_controller.manager
+    details = {room_number: load_room_detail(manager, room_number) for room_number in set(room_numbers)}
+    
+    def open_room(cycle: int) -> RoomOpenController:
+        detail = details[room_numbers[cycle % len(room_numbers)]]
+        controller = RoomOpenController(list_controller, window_pool.acquire(RoomOpenWindow), *detail)
+        list_controller.window.withdraw()
+        
+        return controller
+    
+    leased = next(detail for detail in details.values() if detail[0] is not None and detail[0].lease)
+    room_controller = RoomOpenController(list_controller, window_pool.acquire(RoomOpenWindow), *leased)
+    room = room_controller.room
+    
+    def form(window_class: type[W]) -> W:
+        return window_pool.acquire(window_class, room_controller.window)
+    
+    return {
+        "room": open_room,
+        "room_form": lambda _: RoomFormController(room_controller, form(RoomForm), room),
+        "tenant_form": lambda _: TenantFormController(room_controller, form(TenantForm)),
+        "lease_form": lambda _: LeaseFormController(room_controller, form(LeaseForm)),
+        "payment_form": lambda _: PaymentFormController(room_controller, form(PaymentForm), room)
+    }
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cycles", type=int, default=CYCLES)
+    parser.add_argument("--warm-up", type=int, default=WARM_UP)
+    parser.add_argument("--scale", choices=SCALES, default="tiny")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--output", help="file to write the results to as JSON")
+    args = parser.parse_args()
+    
+    if args.cycles < 2:
+        parser.error("--cycles must be at least 2")
+    
+    engine = get_engine(URL)
+    Base.metadata.create_all(engine)
+    
+    manager = BoardingHouseManager(sessionmaker(bind=engine, expire_on_commit=False))
+    seed(manager, Dataset(SCALES[args.scale], args.seed))
+    
+    rng = Random(args.seed)
+    room_numbers = [rng.randint(1, SCALES[args.scale].rooms) for _ in range(args.cycles)]
+    
+    list_controller = RoomListController(manager, RoomListWindow())
+    list_controller.window.update()
+    
+    results = {
+        name: run_cycles(open_window, args.cycles, args.warm_up)
+        for name, open_window in subjects(list_controller, room_numbers).items()
+    }
+    
+    list_controller.close()
+    dispose_engines()
+    
+    print(f"{'':14}{'open p50':>10}{'open p95':>10}{'close p50':>11}{'heap KiB':>10}{'rss KiB':>9}")
+    
+    for name, result in results.items():
+        rss = result["rss_bytes_per_cycle"]
+        
+        print(
+            f"{name:14}{result['open']['p50_ms']:>10.2f}{result['open']['p95_ms']:>10.2f}"
+            f"{result['close']['p50_ms']:>11.2f}{result['heap_bytes_per_cycle'] / 1024:>+10.1f}"
+            f"{'' if rss is None else format(rss / 1024, '+.1f'):>9}"
+        )
+    
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            dump(results, file, indent=2)
+
+if __name__ == "__main__":
+    main()
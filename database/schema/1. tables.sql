@@ -9,6 +9,7 @@ DROP TABLE IF EXISTS `rooms`;
 DROP TABLE IF EXISTS `tenants`;
 DROP TABLE IF EXISTS `leases`;
 DROP TABLE IF EXISTS `payments`;
+DROP TABLE IF EXISTS `changes`;
 
 -- Create rooms table
 CREATE TABLE `rooms` (
@@ -38,7 +39,8 @@ CREATE TABLE `tenants` (
     CONSTRAINT `chk_contactNumber` 
 		CHECK (REGEXP_LIKE(`contactNumber`, _utf8mb4'^09[0-9]{9}$')),
     INDEX (`roomNumber`),
-    INDEX (`lastName`, `firstName`)
+    INDEX (`lastName`, `firstName`),
+    INDEX `ix_contactNumber` (`contactNumber`)
 );
 
 -- Create leases table
@@ -89,4 +91,16 @@ CREATE TABLE `payments` (
         ON UPDATE CASCADE ON DELETE CASCADE,
     INDEX (`leaserId`),
     INDEX (`roomNumber`)
+);
+
+-- Create changes table, the log of row changes filled by the triggers
+-- No foreign key, as changes of deleted rooms are logged too
+CREATE TABLE `changes` (
+    `changeId` BIGINT UNSIGNED AUTO_INCREMENT,
+    `tableName` VARCHAR(16) NOT NULL,
+    `rowId` INT UNSIGNED NOT NULL,
+    `roomNumber` INT UNSIGNED NOT NULL,
+    `action` VARCHAR(6) NOT NULL,
+    
+    PRIMARY KEY (`changeId`)
 );
\ No newline at end of file
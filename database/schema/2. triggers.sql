@@ -34,4 +34,144 @@ AFTER DELETE ON `tenants`
 FOR EACH ROW
     UPDATE `rooms` 
     SET `tenantCount` = `tenantCount` - 1
-    WHERE `rooms`.`roomNumber` = OLD.`roomNumber`;
\ No newline at end of file
+    WHERE `rooms`.`roomNumber` = OLD.`roomNumber`;
+
+-- The triggers below log every row change in the changes table, which other
+-- clients poll. Rows deleted by a foreign key cascade fire no trigger in MySQL,
+-- but the deletion of the parent row is logged for the same room.
+
+-- Triggers to log room changes in the changes table
+DROP TRIGGER IF EXISTS `log_rooms_afterInsert`;
+CREATE TRIGGER `log_rooms_afterInsert`
+AFTER INSERT ON `rooms`
+FOR EACH ROW
+    INSERT INTO `changes` (`tableName`, `rowId`, `roomNumber`, `action`)
+    VALUES ('rooms', NEW.`roomNumber`, NEW.`roomNumber`, 'INSERT');
+
+-- On update, a renumbered room is logged as deleted and added
+DROP TRIGGER IF EXISTS `log_rooms_afterUpdate`;
+DELIMITER //
+CREATE TRIGGER `log_rooms_afterUpdate`
+AFTER UPDATE ON `rooms`
+FOR EACH ROW
+BEGIN
+    IF NEW.`roomNumber` = OLD.`roomNumber` THEN
+        INSERT INTO `changes` (`tableName`, `rowId`, `roomNumber`, `action`)
+        VALUES ('rooms', NEW.`roomNumber`, NEW.`roomNumber`, 'UPDATE');
+    ELSE
+        INSERT INTO `changes` (`tableName`, `rowId`, `roomNumber`, `action`)
+        VALUES ('rooms', OLD.`roomNumber`, OLD.`roomNumber`, 'DELETE');
+        INSERT INTO `changes` (`tableName`, `rowId`, `roomNumber`, `action`)
+        VALUES ('rooms', NEW.`roomNumber`, NEW.`roomNumber`, 'INSERT');
+    END IF;
+END; //
+DELIMITER ;
+
+DROP TRIGGER IF EXISTS `log_rooms_afterDelete`;
+CREATE TRIGGER `log_rooms_afterDelete`
+AFTER DELETE ON `rooms`
+FOR EACH ROW
+    INSERT INTO `changes` (`tableName`, `rowId`, `roomNumber`, `action`)
+    VALUES ('rooms', OLD.`roomNumber`, OLD.`roomNumber`, 'DELETE');
+
+-- Triggers to log tenant changes in the changes table
+DROP TRIGGER IF EXISTS `log_tenants_afterInsert`;
+CREATE TRIGGER `log_tenants_afterInsert`
+AFTER INSERT ON `tenants`
+FOR EACH ROW
+    INSERT INTO `changes` (`tableName`, `rowId`, `roomNumber`, `action`)
+    VALUES ('tenants', NEW.`tenantId`, NEW.`roomNumber`, 'INSERT');
+
+-- On update, a tenant moved to another room is logged for both rooms
+DROP TRIGGER IF EXISTS `log_tenants_afterUpdate`;
+DELIMITER //
+CREATE TRIGGER `log_tenants_afterUpdate`
+AFTER UPDATE ON `tenants`
+FOR EACH ROW
+BEGIN
+    IF NEW.`roomNumber` = OLD.`roomNumber` THEN
+        INSERT INTO `changes` (`tableName`, `rowId`, `roomNumber`, `action`)
+        VALUES ('tenants', NEW.`tenantId`, NEW.`roomNumber`, 'UPDATE');
+    ELSE
+        INSERT INTO `changes` (`tableName`, `rowId`, `roomNumber`, `action`)
+        VALUES ('tenants', OLD.`tenantId`, OLD.`roomNumber`, 'UPDATE');
+        INSERT INTO `changes` (`tableName`, `rowId`, `roomNumber`, `action`)
+        VALUES ('tenants', NEW.`tenantId`, NEW.`roomNumber`, 'UPDATE');
+    END IF;
+END; //
+DELIMITER ;
+
+DROP TRIGGER IF EXISTS `log_tenants_afterDelete`;
+CREATE TRIGGER `log_tenants_afterDelete`
+AFTER DELETE ON `tenants`
+FOR EACH ROW
+    INSERT INTO `changes` (`tableName`, `rowId`, `roomNumber`, `action`)
+    VALUES ('tenants', OLD.`tenantId`, OLD.`roomNumber`, 'DELETE');
+
+-- Triggers to log lease changes in the changes table
+DROP TRIGGER IF EXISTS `log_leases_afterInsert`;
+CREATE TRIGGER `log_leases_afterInsert`
+AFTER INSERT ON `leases`
+FOR EACH ROW
+    INSERT INTO `changes` (`tableName`, `rowId`, `roomNumber`, `action`)
+    VALUES ('leases', NEW.`leaseId`, NEW.`roomNumber`, 'INSERT');
+
+-- On update, a lease moved to another room is logged for both rooms
+DROP TRIGGER IF EXISTS `log_leases_afterUpdate`;
+DELIMITER //
+CREATE TRIGGER `log_leases_afterUpdate`
+AFTER UPDATE ON `leases`
+FOR EACH ROW
+BEGIN
+    IF NEW.`roomNumber` = OLD.`roomNumber` THEN
+        INSERT INTO `changes` (`tableName`, `rowId`, `roomNumber`, `action`)
+        VALUES ('leases', NEW.`leaseId`, NEW.`roomNumber`, 'UPDATE');
+    ELSE
+        INSERT INTO `changes` (`tableName`, `rowId`, `roomNumber`, `action`)
+        VALUES ('leases', OLD.`leaseId`, OLD.`roomNumber`, 'UPDATE');
+        INSERT INTO `changes` (`tableName`, `rowId`, `roomNumber`, `action`)
+        VALUES ('leases', NEW.`leaseId`, NEW.`roomNumber`, 'UPDATE');
+    END IF;
+END; //
+DELIMITER ;
+
+DROP TRIGGER IF EXISTS `log_leases_afterDelete`;
+CREATE TRIGGER `log_leases_afterDelete`
+AFTER DELETE ON `leases`
+FOR EACH ROW
+    INSERT INTO `changes` (`tableName`, `rowId`, `roomNumber`, `action`)
+    VALUES ('leases', OLD.`leaseId`, OLD.`roomNumber`, 'DELETE');
+
+-- Triggers to log payment changes in the changes table
+DROP TRIGGER IF EXISTS `log_payments_afterInsert`;
+CREATE TRIGGER `log_payments_afterInsert`
+AFTER INSERT ON `payments`
+FOR EACH ROW
+    INSERT INTO `changes` (`tableName`, `rowId`, `roomNumber`, `action`)
+    VALUES ('payments', NEW.`paymentId`, NEW.`roomNumber`, 'INSERT');
+
+-- On update, a payment moved to another room is logged for both rooms
+DROP TRIGGER IF EXISTS `log_payments_afterUpdate`;
+DELIMITER //
+CREATE TRIGGER `log_payments_afterUpdate`
+AFTER UPDATE ON `payments`
+FOR EACH ROW
+BEGIN
+    IF NEW.`roomNumber` = OLD.`roomNumber` THEN
+        INSERT INTO `changes` (`tableName`, `rowId`, `roomNumber`, `action`)
+        VALUES ('payments', NEW.`paymentId`, NEW.`roomNumber`, 'UPDATE');
+    ELSE
+        INSERT INTO `changes` (`tableName`, `rowId`, `roomNumber`, `action`)
+        VALUES ('payments', OLD.`paymentId`, OLD.`roomNumber`, 'UPDATE');
+        INSERT INTO `changes` (`tableName`, `rowId`, `roomNumber`, `action`)
+        VALUES ('payments', NEW.`paymentId`, NEW.`roomNumber`, 'UPDATE');
+    END IF;
+END; //
+DELIMITER ;
+
+DROP TRIGGER IF EXISTS `log_payments_afterDelete`;
+CREATE TRIGGER `log_payments_afterDelete`
+AFTER DELETE ON `payments`
+FOR EACH ROW
+    INSERT INTO `changes` (`tableName`, `rowId`, `roomNumber`, `action`)
+    VALUES ('payments', OLD.`paymentId`, OLD.`roomNumber`, 'DELETE');
\ No newline at end of file
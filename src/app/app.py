@@ -1,5 +1,6 @@
+from src.app.startup import start_warm_up
 from src.views.forms import LoginForm
-from src.controllers.controller import LoginFormController
+from src.controllers.login import LoginFormController
 
 class App:
    def __init__(self) -> None:
@@ -8,5 +9,8 @@ class App:
    def start(self) -> None:
       LoginFormController(self.main_window)
       
-      self.main_window.eval("tk::PlaceWindow . center")
+      self.main_window.center()
+      
+      # Loads the database code while the user types the credentials
+      self.main_window.after_idle(start_warm_up)
       self.main_window.mainloop()
\ No newline at end of file
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from threading import Thread
+from typing import Optional
+
+warm_up_thread: Optional[Thread] = None
+
+def warm_up() -> None:
+    """
+    Function to load everything the login form does not need: SQLAlchemy, the
+    entity mappers, the controllers with their windows and the calendar widget.
+    Loading it again once loaded costs only the module lookups.
+    """
+    from sqlalchemy.orm import configure_mappers
+    
+    import src.controllers.controller
+    import src.models.entities
+    import tkcalendar
+    
+    from src.services.instrumentation import configure_sql_log
+    
+    configure_mappers()
+    configure_sql_log()
+
+def start_warm_up() -> Thread:
+    """
+    Function to run `warm_up` on a background thread, so that it happens while
+    the user types the credentials instead of before the login form shows.
+    """
+    global warm_up_thread
+    
+    if warm_up_thread is None:
+        warm_up_thread = Thread(target=warm_up, name="marites-warm-up", daemon=True)
+        warm_up_thread.start()
+    
+    return warm_up_thread
+
+def finish_warm_up() -> None:
+    """
+    Function to wait for the background warm-up, if any. The warm-up is run
+    again on the calling thread, which is instant after a successful one and
+    raises the error of a failed one.
+    """
+    if warm_up_thread is not None:
+        warm_up_thread.join()
+    
+    warm_up()
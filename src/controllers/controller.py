@@ -1,88 +1,90 @@
 from __future__ import annotations
 
 from decimal import Decimal
-from typing import Optional
+from typing import Any, Callable, Optional
 from datetime import date
-from re import match
+from time import monotonic
 
-from sqlalchemy.exc import OperationalError
-
-from src.services.service import SessionFactory
-from src.views.forms import RoomForm, TenantForm, LeaseForm, PaymentForm, LoginForm
-from src.views.rooms import RoomListWindow, RoomOpenWindow
+from src.services.service import dispose_engines
+from src.services.executor import DatabaseExecutor, Debouncer
+from src.services.changes import ChangeFeed
+from src.services.events import (
+    ROOM_EVENTS, TENANT_EVENTS, RoomAdded, RoomUpdated, RoomDeleted, TenantAdded, TenantUpdated, TenantDeleted,
+    LeaseAdded, LeaseUpdated, LeaseDeleted, PaymentAdded, PaymentUpdated, PaymentDeleted, RecordsImported
+)
+from src.services.instrumentation import instrumented
+from src.views.forms import RoomForm, TenantForm, LeaseForm, PaymentForm
+from src.views.rooms import RoomListWindow, RoomOpenWindow, VirtualScroller, reconcile, set_loading
+from src.views.tenants import TenantSearchWindow
+from src.views.root import window_pool
 from src.models.entities import Room, Tenant, Lease, Payment
-from src.managers.manager import BoardingHouseManager
+from src.models.projections import RoomRow, TenantRow, PaymentRow, ChangeRow
+from src.models.validators import valid_contact_number, valid_amount, valid_name, amount_characters
+from src.managers.manager import BoardingHouseManager, CHANGES_PAGE_SIZE
 
 from tkinter import messagebox, StringVar
 
+from sqlalchemy.orm.attributes import set_committed_value
+
+TENANTS_PAGE_SIZE = 50
+
+CHANGES_POLL_INTERVAL = 2000  # milliseconds
+
 def to_uppercase(var: StringVar) -> None:
     var.set(var.get().upper())
 
-def valid_contact_number(contact_number: str) -> bool:
-    return bool(match(r"^09[0-9]{9}", contact_number))
+def load_room_detail(
+    manager: BoardingHouseManager, 
+    room_number: int
+) -> tuple[Optional[Room], list[TenantRow], list[PaymentRow]]:
+    return (
+        manager.get_room_with_lease(room_number),
+        manager.get_tenant_rows(room_number),
+        manager.get_payment_rows(room_number)
+    )
 
-def valid_amount(amount: str) -> bool:
-    try:
-        float(amount)
-    except:
-        return False
-    else:
-        return True
+def load_first_rooms(
+    manager: BoardingHouseManager,
+    prefix: str,
+    sort_by: str,
+    descending: bool,
+    limit: int
+) -> tuple[int, list[RoomRow]]:
+    return (
+        manager.count_rooms(prefix),
+        manager.get_rooms_page(prefix, sort_by, descending, None, limit)
+    )
 
-class LoginFormController:
-    def __init__(self, window: LoginForm) -> None:
-        self.window = window
-        
-        self.__set_formatters()
-        self.__set_actions()
+def find_tenants(
+    manager: BoardingHouseManager,
+    text: str,
+    after: Optional[TenantRow],
+    limit: int
+) -> list[TenantRow]:
+    tenants = manager.search_tenants(text, after, limit)
     
-    def __set_formatters(self) -> None:
-        self.un_var = StringVar(master=self.window)
-        self.pw_var = StringVar(master=self.window)
-        
-        self.window.username_entry.configure(textvariable=self.un_var)
-        self.window.password_entry.configure(textvariable=self.pw_var)
+    # Nothing starts with the text, so it may be misspelled
+    if not tenants and after is None and not valid_contact_number(text.strip()):
+        tenants = manager.fuzzy_search_tenants(text, limit)
     
-    def __set_actions(self) -> None:
-        self.window.protocol("WM_DELETE_WINDOW", self.close)
-        
-        self.window.login_button.configure(command=self.login_pressed)
-        
-    def login_pressed(self) -> None:
-        username = self.un_var.get()
-        password = self.pw_var.get()
-        
-        try:
-            self.session = SessionFactory(username, password).get_session()
-        
-        except OperationalError as err:
-            print(err)
-            
-            messagebox.showerror(
-                title="Login Failed",
-                message="Username and/or password not recognized."
-            )
-            
-            self.un_var.set("")
-            self.pw_var.set("")
-        
-        else:
-            RoomListController(
-                BoardingHouseManager(self.session),
-                RoomListWindow()
-            )
-            
-            self.window.destroy()
-            
-            del self
+    return tenants
+
+def start_change_feed(manager: BoardingHouseManager) -> int:
+    manager.prune_changes()
     
-    def close(self) -> None:
-        self.window.destroy()
-        
-        if hasattr(self, "session"):
-            self.session.close()
-        
-        del self
+    return manager.latest_change_id()
+
+def room_item(room: RoomRow) -> tuple[str, tuple[str, str]]:
+    return (
+        str(room.room_number),
+        (f"Room {room.room_number}", f"{room.tenant_count} / {room.max_capacity}")
+    )
+
+def show_database_error(err: BaseException) -> None:
+    messagebox.showerror(
+        title="Database Error",
+        message=f"The request could not be completed.\n{err}"
+    )
 
 class RoomListController:
     def __init__(
@@ -92,12 +94,27 @@ class RoomListController:
     ) -> None:
         self.manager = manager
         self.window = window
+        self.executor = DatabaseExecutor(self.window)
+        
+        self.sort_by = "room_number"
+        self.sort_descending = False
+        self.rooms_query: Optional[tuple[str, str, bool]] = None
+        
+        # The open room, refreshed when another desk changes it
+        self.room_controller: Optional[RoomOpenController] = None
+        
+        # The open tenant searches, which have no parent window to close with
+        self.search_controllers: list[TenantSearchController] = []
+        
+        self.change_feed: Optional[ChangeFeed] = None
+        self.changes_job: Optional[str] = None
         
         self.set_formatters()
         self.set_validations()
         self.set_actions()
         
         self.load_rooms()
+        self.follow_changes()
   
     def set_formatters(self) -> None:
         self.search_var = StringVar(master=self.window)
@@ -117,50 +134,237 @@ class RoomListController:
         self.window.protocol("WM_DELETE_WINDOW", self.close)
         
         self.window.add_room_button.configure(command=self.add_room_pressed)
+        self.window.search_tenants_button.configure(command=self.search_tenants_pressed)
         self.window.open_room_button.configure(command=self.open_room_pressed)
         self.window.delete_room_button.configure(command=self.delete_room_pressed)
         
+        # Query once typing pauses instead of on every keystroke
+        self.search_debouncer = Debouncer(self.window, self.load_rooms)
+        
         self.search_var.trace_add(
             "write", 
-            lambda *_: self.load_rooms()
+            lambda *_: self.search_debouncer()
+        )
+        
+        self.window.rooms_treeview.heading("room_number", command=lambda: self.sort_rooms("room_number"))
+        self.window.rooms_treeview.heading("occupancy", command=lambda: self.sort_rooms("occupancy"))
+        
+        self.rooms_scroller = VirtualScroller(
+            self.window.rooms_treeview,
+            self.window.rooms_scrollbar,
+            self.fetch_rooms,
+            room_item
+        )
+        
+        # Writes of this desk update the rooms they touch, as they commit
+        self.unsubscribe = self.manager.events.subscribe(
+            self.room_event,
+            *ROOM_EVENTS,
+            *TENANT_EVENTS,
+            RecordsImported,
+            dispatch=self.executor.call_soon
         )
     
+    @instrumented
     def load_rooms(self) -> None:
-        self.window.rooms_treeview.delete(*self.window.rooms_treeview.get_children())
-        
-        for room in filter(
-            lambda r: self.search_var.get() in str(r.room_number), 
-            self.manager.get_all_rooms()
-        ):
-            self.window.rooms_treeview.insert(
-                "",
-                "end",
-                room.room_number,
-                values=(
-                    f"Room {room.room_number}",
-                    f"{room.tenant_count} / {room.max_capacity}"
-                )
+        query = (self.search_var.get(), self.sort_by, self.sort_descending)
+        
+        # Reloading the same rooms, e.g. after a write, refreshes them in place
+        if query == self.rooms_query:
+            self.executor.submit(
+                self.manager.count_rooms,
+                query[0],
+                on_success=self.rooms_scroller.invalidate,
+                on_error=show_database_error,
+                key="rooms"
             )
+            return
+        
+        self.rooms_query = query
+        
+        # Blocks of the previous query are of no use anymore
+        for block in self.rooms_scroller.pending:
+            self.executor.cancel(f"rooms_{block * self.rooms_scroller.block_size}")
+        
+        set_loading(self.window.rooms_treeview, True)
+        
+        # A new search or sort supersedes any rooms still being fetched
+        self.executor.submit(
+            load_first_rooms,
+            self.manager,
+            *self.rooms_query,
+            self.rooms_scroller.block_size,
+            on_success=lambda result: self.show_rooms(*result),
+            on_error=self.rooms_failed,
+            key="rooms"
+        )
     
-    def add_room_pressed(self) -> None:
-        RoomFormController(self, RoomForm(self.window))
+    def show_rooms(self, total: int, rooms: list[RoomRow]) -> None:
+        set_loading(self.window.rooms_treeview, False)
+        
+        self.rooms_scroller.reset(total, rooms)
     
-    def open_room_pressed(self) -> None:
-        if r := self.window.rooms_treeview.selection():
-            room = self.manager.get_room(int(r[0]))
+    def rooms_failed(self, err: BaseException) -> None:
+        set_loading(self.window.rooms_treeview, False)
+        
+        show_database_error(err)
+    
+    @instrumented
+    def fetch_rooms(self, offset: int, limit: int, after: Optional[RoomRow]) -> None:
+        generation = self.rooms_scroller.generation
+        
+        def block_failed(err: BaseException) -> None:
+            self.rooms_scroller.fetch_failed(offset, generation)
+            show_database_error(err)
+        
+        # Continue from the preceding room when it is known, skip rows otherwise
+        self.executor.submit(
+            self.manager.get_rooms_page,
+            *self.rooms_query,
+            after,
+            limit,
+            0 if after is not None else offset,
+            on_success=lambda rooms: self.rooms_scroller.set_rows(offset, rooms, generation),
+            on_error=block_failed,
+            key=f"rooms_{offset}"
+        )
+    
+    def follow_changes(self) -> None:
+        """
+        Function to start polling the change log, so the rooms changed by other
+        desks are refreshed without a full reload. A database without the change
+        log is not polled.
+        """
+        self.executor.submit(
+            start_change_feed,
+            self.manager,
+            on_success=self.changes_followed,
+            key="changes"
+        )
+    
+    def changes_followed(self, cursor: int) -> None:
+        self.change_feed = ChangeFeed(cursor)
+        self.schedule_changes()
+    
+    def schedule_changes(self, delay: int = CHANGES_POLL_INTERVAL) -> None:
+        self.changes_job = self.window.after(delay, self.poll_changes)
+    
+    def poll_changes(self) -> None:
+        self.changes_job = None
+        self.change_feed.expire(monotonic())
+        
+        # A failed poll is retried on the next one
+        self.executor.submit(
+            self.manager.get_changes,
+            *self.change_feed.pending(),
+            on_success=self.apply_changes,
+            on_error=lambda _: self.schedule_changes(),
+            key="changes"
+        )
+    
+    def apply_changes(self, changes: list[ChangeRow]) -> None:
+        # A full page means more changes are waiting
+        self.schedule_changes(0 if len(changes) >= CHANGES_PAGE_SIZE else CHANGES_POLL_INTERVAL)
+        
+        if not (changes := self.change_feed.advance(changes, monotonic())):
+            return
+        
+        room_numbers = {change.room_number for change in changes}
+        
+        if self.room_controller is not None and self.room_controller.room.room_number in room_numbers:
+            self.room_controller.reload_data()
+        
+        # Added or removed rooms shift the rows
+        if any(change.table_name == "rooms" and change.action != "UPDATE" for change in changes):
+            self.load_rooms()
+        else:
+            self.refresh_rooms(room_numbers)
+    
+    def room_event(self, event: Any) -> None:
+        if isinstance(event, (RoomAdded, RoomDeleted, RecordsImported)):
+            self.load_rooms()
+        elif isinstance(event, TenantUpdated):
+            self.refresh_rooms({event.room_number, event.previous_room_number})
         else:
+            self.refresh_rooms({event.room_number})
+    
+    def refresh_rooms(self, room_numbers: set[int]) -> None:
+        """
+        Function to refresh the rows of the rooms in `room_numbers`, when no
+        rooms were added or removed.
+        """
+        # A new occupancy may move the room to another row
+        if self.sort_by != "room_number":
+            self.load_rooms()
             return
         
+        query = self.rooms_query
+        
+        self.executor.submit(
+            self.manager.get_room_rows,
+            room_numbers,
+            on_success=lambda rooms: self.rooms_changed(query, rooms)
+        )
+    
+    def rooms_changed(self, query: Optional[tuple[str, str, bool]], rooms: list[RoomRow]) -> None:
+        # Rows of another search or sort order are refetched anyway
+        if query == self.rooms_query:
+            self.rooms_scroller.update_rows(rooms, lambda room: room.room_number)
+    
+    def sort_rooms(self, column: str) -> None:
+        if self.sort_by == column:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_by = column
+            self.sort_descending = False
+        
+        self.load_rooms()
+    
+    def add_room_pressed(self) -> None:
+        RoomFormController(self, window_pool.acquire(RoomForm, self.window))
+    
+    def search_tenants_pressed(self) -> None:
+        TenantSearchController(self, window_pool.acquire(TenantSearchWindow))
+    
+    @instrumented
+    def open_room_pressed(self) -> None:
+        # Rows still being fetched have no room number yet
+        if (r := self.window.rooms_treeview.selection()) and r[0].isdigit():
+            self.open_room_number(int(r[0]))
+    
+    def open_room_number(self, room_number: int) -> None:
+        self.executor.submit(
+            load_room_detail,
+            self.manager,
+            room_number,
+            on_success=lambda detail: self.open_room(*detail),
+            on_error=show_database_error,
+            key="open_room"
+        )
+    
+    def open_room(
+        self, 
+        room: Optional[Room], 
+        tenant_rows: list[TenantRow], 
+        payment_rows: list[PaymentRow]
+    ) -> None:
         if room:
-            RoomOpenController(self, RoomOpenWindow(), room)
+            self.room_controller = RoomOpenController(
+                self, window_pool.acquire(RoomOpenWindow), room, tenant_rows, payment_rows
+            )
             self.window.withdraw()
     
+    @instrumented
     def delete_room_pressed(self) -> None:
-        if r := self.window.rooms_treeview.selection():
-            room = self.manager.get_room(int(r[0]))
-        else:
-            return
-        
+        if (r := self.window.rooms_treeview.selection()) and r[0].isdigit():
+            self.executor.submit(
+                self.manager.get_room,
+                int(r[0]),
+                on_success=self.confirm_delete_room,
+                on_error=show_database_error
+            )
+    
+    def confirm_delete_room(self, room: Optional[Room]) -> None:
         if room:
             messagebox.showwarning("Delete Room", message="You are about to delete a room.")
             
@@ -168,17 +372,157 @@ class RoomListController:
                 title="Delete Room",
                 message=f"Are you sure you want to delete Room {room.room_number}?\nDoing so will also delete all records under this room, such as tenants, lease, and payments."
             ):
-                self.manager.delete_room(room)
-                messagebox.showinfo(
-                    title="Room Deleted",
-                    message="Room deleted successfully."
+                self.executor.submit(
+                    self.manager.delete_room,
+                    room,
+                    on_success=lambda _: self.room_deleted(),
+                    on_error=show_database_error
                 )
-                
-                self.load_rooms()
+    
+    def room_deleted(self) -> None:
+        messagebox.showinfo(
+            title="Room Deleted",
+            message="Room deleted successfully."
+        )
     
     def close(self) -> None:
+        self.search_debouncer.cancel()
+        self.unsubscribe()
+        
+        if self.changes_job is not None:
+            self.window.after_cancel(self.changes_job)
+        
+        # Windows left open would call the shut down executor and keep the main loop running
+        if self.room_controller is not None:
+            self.room_controller.close()
+        
+        for search_controller in list(self.search_controllers):
+            search_controller.close()
+        
+        window_pool.release_children(self.window)
+        
+        self.executor.shutdown()
         self.window.destroy()
-        self.manager.close_session()
+        dispose_engines()
+        
+        del self
+
+class TenantSearchController:
+    def __init__(
+        self, 
+        parent: RoomListController, 
+        window: TenantSearchWindow
+    ) -> None:
+        self.parent = parent
+        self.window = window
+        
+        self.tenant_rows: list[TenantRow] = []
+        self.tenants_exhausted = True
+        self.tenants_pending = False
+        
+        self.parent.search_controllers.append(self)
+        
+        self.set_formatters()
+        self.set_actions()
+        
+        # Build the name index for misspelled searches while the user types
+        self.parent.executor.submit(self.parent.manager.enable_name_index)
+    
+    def set_formatters(self) -> None:
+        self.search_var = StringVar(master=self.window)
+        
+        self.window.search_tenant_entry.configure(textvariable=self.search_var)
+    
+    def set_actions(self) -> None:
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        
+        self.window.open_room_button.configure(command=self.open_room_pressed)
+        self.window.tenants_treeview.bind("<Double-1>", lambda _: self.open_room_pressed())
+        self.window.tenants_treeview.configure(yscrollcommand=self.tenants_scrolled)
+        
+        # Query once typing pauses instead of on every keystroke
+        self.search_debouncer = Debouncer(self.window, self.search_tenants)
+        
+        self.search_var.trace_add(
+            "write",
+            lambda *_: self.search_debouncer()
+        )
+    
+    @instrumented
+    def search_tenants(self) -> None:
+        self.tenant_rows = []
+        
+        if not self.search_var.get().strip():
+            self.parent.executor.cancel("tenant_search")
+            self.show_tenants([])
+            return
+        
+        self.load_more_tenants()
+    
+    @instrumented
+    def load_more_tenants(self) -> None:
+        self.tenants_pending = True
+        set_loading(self.window.tenants_treeview, True)
+        
+        # A newer search supersedes any page still being fetched
+        self.parent.executor.submit(
+            find_tenants,
+            self.parent.manager,
+            self.search_var.get(),
+            self.tenant_rows[-1] if self.tenant_rows else None,
+            TENANTS_PAGE_SIZE,
+            on_success=self.show_tenants,
+            on_error=self.tenants_failed,
+            key="tenant_search"
+        )
+    
+    def show_tenants(self, tenants: list[TenantRow]) -> None:
+        self.tenants_pending = False
+        set_loading(self.window.tenants_treeview, False)
+        
+        self.tenant_rows.extend(tenants)
+        self.tenants_exhausted = len(tenants) < TENANTS_PAGE_SIZE
+        
+        reconcile(
+            self.window.tenants_treeview,
+            (
+                (
+                    tenant.tenant_id,
+                    (tenant.formatted_name, tenant.contact_number, f"Room {tenant.room_number}")
+                )
+                for tenant in self.tenant_rows
+            )
+        )
+    
+    def tenants_failed(self, err: BaseException) -> None:
+        self.tenants_pending = False
+        set_loading(self.window.tenants_treeview, False)
+        
+        show_database_error(err)
+    
+    def tenants_scrolled(self, first: str, last: str) -> None:
+        self.window.tenants_scrollbar.set(first, last)
+        
+        # Fetch the next page once the user nears the end of the loaded tenants
+        if float(last) >= 0.9 and not (self.tenants_exhausted or self.tenants_pending):
+            self.load_more_tenants()
+    
+    def open_room_pressed(self) -> None:
+        if t := self.window.tenants_treeview.selection():
+            tenant_id = int(t[0])
+            
+            if tenant := next((row for row in self.tenant_rows if row.tenant_id == tenant_id), None):
+                self.parent.open_room_number(tenant.room_number)
+                self.close()
+    
+    def close(self) -> None:
+        self.search_debouncer.cancel()
+        self.parent.executor.cancel("tenant_search")
+        
+        if self in self.parent.search_controllers:
+            self.parent.search_controllers.remove(self)
+        
+        window_pool.release(self.window)
         
         del self
 
@@ -233,6 +577,8 @@ class RoomFormController:
         self.window.max_capacity_entry.configure(textvariable=self.mxcap_var)
     
     def set_actions(self) -> None:
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        
         self.window.add_room_button.configure(command=self.add_room_pressed)
     
     def load_data(self) -> None:
@@ -242,6 +588,7 @@ class RoomFormController:
             
             self.window.room_number_entry.configure(state="disabled")
     
+    @instrumented
     def add_room_pressed(self) -> None:
         room_num = self.rmnum_var.get()
         max_cap = self.mxcap_var.get()
@@ -288,13 +635,7 @@ class RoomFormController:
                 title="Room Added"
                 message=f"Room {room.room_number} with max capacity {room.max_capacity} sucessfully added."
             
-            self.window.destroy()
-            
-            if isinstance(self.parent, RoomListController):
-                self.parent.load_rooms()
-            
-            if isinstance(self.parent, RoomOpenController):
-                self.parent.load_room()
+            window_pool.release(self.window)
             
             messagebox.showinfo(title=title, message=message)
             
@@ -305,19 +646,30 @@ class RoomFormController:
                 title="Invalid Entries",
                 message="At least one of the inputs entered are invalid. Room Number & Max Capacity cannot be less than 1."
             )
+    
+    def close(self) -> None:
+        window_pool.release(self.window)
+        del self
 
 class RoomOpenController:
     def __init__(
         self, 
         parent: RoomListController, 
         window: RoomOpenWindow, 
-        room: Room
+        room: Room,
+        tenant_rows: list[TenantRow],
+        payment_rows: list[PaymentRow]
     ) -> None:
         self.parent = parent
         self.window = window
         self.room = room
+        self.tenant_rows = tenant_rows
+        self.payment_rows = payment_rows
+        
+        self.closed = False
         
         self.set_actions()
+        self.set_subscriptions()
         
         self.load_data()
     
@@ -335,12 +687,162 @@ class RoomOpenController:
         self.window.edit_room_button.configure(command=self.edit_room_pressed)
         self.window.add_lease_button.configure(command=self.add_lease_pressed)
     
+    def set_subscriptions(self) -> None:
+        """
+        Function to patch the widgets showing what a write of this desk changed
+        in the room, instead of reloading the room.
+        """
+        events = self.parent.manager.events
+        dispatch = self.parent.executor.call_soon
+        
+        self.subscriptions = [
+            events.subscribe(self.while_open(handler), *event_types, dispatch=dispatch)
+            for handler, event_types in (
+                (self.room_updated, (RoomUpdated,)),
+                (self.room_deleted, (RoomDeleted,)),
+                (self.tenant_changed, (TenantAdded, TenantUpdated)),
+                (self.tenant_deleted, (TenantDeleted,)),
+                (self.lease_changed, (LeaseAdded, LeaseUpdated, LeaseDeleted)),
+                (self.payment_changed, (PaymentAdded, PaymentUpdated)),
+                (self.payment_deleted, (PaymentDeleted,)),
+                (lambda _: self.reload_data(), (RecordsImported,))
+            )
+        ]
+    
+    def while_open(self, callback: Callable[[Any], None]) -> Callable[[Any], None]:
+        """
+        Function to wrap a callback of a submitted call or event so that it is
+        dropped once this controller is closed, as its pooled window may show
+        another room by then.
+        """
+        return lambda result: None if self.closed else callback(result)
+    
     def load_data(self) -> None:
         self.load_room()
         self.load_lease()
         self.load_tenants()        
         self.load_payments()        
     
+    @instrumented
+    def reload_data(self) -> None:
+        set_loading(self.window.tenants_treeview, True)
+        set_loading(self.window.payments_treeview, True)
+        
+        self.parent.executor.submit(
+            load_room_detail,
+            self.parent.manager,
+            self.room.room_number,
+            on_success=lambda detail: self.room_reloaded(*detail),
+            on_error=self.reload_failed,
+            key=f"room_{self.room.room_number}"
+        )
+    
+    def room_reloaded(
+        self, 
+        room: Optional[Room], 
+        tenant_rows: list[TenantRow], 
+        payment_rows: list[PaymentRow]
+    ) -> None:
+        set_loading(self.window.tenants_treeview, False)
+        set_loading(self.window.payments_treeview, False)
+        
+        if room is None:
+            self.close()
+            return
+        
+        self.room = room
+        self.tenant_rows = tenant_rows
+        self.payment_rows = payment_rows
+        
+        self.load_data()
+    
+    def reload_failed(self, err: BaseException) -> None:
+        set_loading(self.window.tenants_treeview, False)
+        set_loading(self.window.payments_treeview, False)
+        
+        show_database_error(err)
+    
+    def room_updated(self, event: RoomUpdated) -> None:
+        if event.room_number == self.room.room_number:
+            # Shown as already committed, so a later update_room of this room never writes it back
+            set_committed_value(self.room, "max_capacity", event.room.max_capacity)
+            self.load_room()
+    
+    def room_deleted(self, event: RoomDeleted) -> None:
+        if event.room_number == self.room.room_number:
+            self.close()
+    
+    def tenant_changed(self, event: TenantAdded | TenantUpdated) -> None:
+        room_number = self.room.room_number
+        previous_room_number = event.previous_room_number if isinstance(event, TenantUpdated) else event.room_number
+        
+        if room_number not in (event.room_number, previous_room_number):
+            return
+        
+        tenant_rows = [tenant for tenant in self.tenant_rows if tenant.tenant_id != event.tenant.tenant_id]
+        
+        # Moved out of this room otherwise
+        if event.room_number == room_number:
+            tenant_rows.append(event.tenant)
+            tenant_rows.sort(key=lambda tenant: tenant.tenant_id)
+        
+        # The tenant count is kept by the database, see room_updated
+        set_committed_value(self.room, "tenant_count", self.room.tenant_count + len(tenant_rows) - len(self.tenant_rows))
+        self.tenant_rows = tenant_rows
+        
+        self.load_room()
+        self.load_tenants()
+    
+    def tenant_deleted(self, event: TenantDeleted) -> None:
+        if event.room_number == self.room.room_number:
+            tenant_rows = [tenant for tenant in self.tenant_rows if tenant.tenant_id != event.tenant_id]
+            
+            set_committed_value(self.room, "tenant_count", self.room.tenant_count - len(self.tenant_rows) + len(tenant_rows))
+            self.tenant_rows = tenant_rows
+            
+            self.load_room()
+            self.load_tenants()
+    
+    def lease_changed(self, event: LeaseAdded | LeaseUpdated | LeaseDeleted) -> None:
+        # The lease shows its leaser, so only the room and lease are fetched again
+        if event.room_number == self.room.room_number:
+            self.parent.executor.submit(
+                self.parent.manager.get_room_with_lease,
+                self.room.room_number,
+                on_success=self.lease_reloaded,
+                on_error=show_database_error,
+                key=f"lease_{self.room.room_number}"
+            )
+    
+    def lease_reloaded(self, room: Optional[Room]) -> None:
+        if room is None:
+            self.close()
+            return
+        
+        self.room = room
+        
+        self.load_room()
+        self.load_lease()
+    
+    def payment_changed(self, event: PaymentAdded | PaymentUpdated) -> None:
+        if event.room_number == self.room.room_number:
+            self.payment_rows = sorted(
+                (
+                    *(payment for payment in self.payment_rows if payment.payment_id != event.payment.payment_id),
+                    event.payment
+                ),
+                key=lambda payment: payment.payment_id,
+                reverse=True
+            )
+            
+            self.load_payments()
+    
+    def payment_deleted(self, event: PaymentDeleted) -> None:
+        if event.room_number == self.room.room_number:
+            self.payment_rows = [payment for payment in self.payment_rows if payment.payment_id != event.payment_id]
+            
+            self.load_payments()
+    
     def load_room(self) -> None:
         self.window.title(f"Room {self.room.room_number}")
         self.window.room_number_label.configure(text=f"Room Number: {self.room.room_number}")
@@ -365,42 +867,40 @@ class RoomOpenController:
         self.window.add_payment_button.configure(state="normal" if self.room.lease else "disabled")
     
     def load_tenants(self) -> None:
-        self.window.tenants_treeview.delete(*self.window.tenants_treeview.get_children())
-        
-        if self.room.tenants:
-            for tenant in self.room.tenants:
-                self.window.tenants_treeview.insert(
-                    "",
-                    "end",
+        reconcile(
+            self.window.tenants_treeview,
+            (
+                (
                     tenant.tenant_id,
-                    values=(
-                        tenant.formatted_name,
-                        tenant.contact_number,
-                        tenant.birth_date
-                    )
+                    (tenant.formatted_name, tenant.contact_number, tenant.birth_date)
                 )
+                for tenant in self.tenant_rows
+            )
+        )
     
     def load_payments(self) -> None:
-        self.window.payments_treeview.delete(*self.window.payments_treeview.get_children())
-        
-        for payment in reversed(self.room.payments):
-            self.window.payments_treeview.insert(
-                "",
-                "end",
-                payment.payment_id,
-                values=(
-                    payment.payment_date,
-                    payment.payment_amount,
-                    "Paid" if payment.paid else "Unpaid"
+        reconcile(
+            self.window.payments_treeview,
+            (
+                (
+                    payment.payment_id,
+                    (payment.payment_date, payment.payment_amount, "Paid" if payment.paid else "Unpaid")
                 )
+                for payment in self.payment_rows
             )
+        )
     
+    @instrumented
     def delete_tenant_pressed(self) -> None:
         if t := self.window.tenants_treeview.selection():
-            tenant = self.parent.manager.get_tenant(int(t[0]))
-        else:
-            return
-        
+            self.parent.executor.submit(
+                self.parent.manager.get_tenant,
+                int(t[0]),
+                on_success=self.while_open(self.confirm_delete_tenant),
+                on_error=show_database_error
+            )
+    
+    def confirm_delete_tenant(self, tenant: Optional[Tenant]) -> None:
         if tenant:
             if self.room.lease and tenant == self.room.lease.leaser:
                 messagebox.showerror(title="Leaser Deletion", message="You are not allowed to delete the leaser.")
@@ -412,20 +912,24 @@ class RoomOpenController:
                 title="Delete Tenant",
                 message=f"Are you sure you want to delete {tenant.formatted_name}?"
             ):
-                self.parent.manager.delete_tenant(tenant)
-                messagebox.showinfo(
-                    title="Tenant Deleted",
-                    message="Tenant deleted successfully."
+                self.parent.executor.submit(
+                    self.parent.manager.delete_tenant,
+                    tenant,
+                    on_success=self.while_open(lambda _: self.record_deleted("Tenant Deleted", "Tenant deleted successfully.")),
+                    on_error=show_database_error
                 )
-                
-                self.load_data()
     
+    @instrumented
     def delete_payment_pressed(self) -> None:
         if p := self.window.payments_treeview.selection():
-            payment = self.parent.manager.get_payment(int(p[0]))
-        else:
-            return
-
+            self.parent.executor.submit(
+                self.parent.manager.get_payment,
+                int(p[0]),
+                on_success=self.while_open(self.confirm_delete_payment),
+                on_error=show_database_error
+            )
+    
+    def confirm_delete_payment(self, payment: Optional[Payment]) -> None:
         messagebox.showwarning("Delete Payment", message="You are about to delete a payment record.")
         
         if payment:
@@ -433,31 +937,47 @@ class RoomOpenController:
                 title="Delete Payment",
                 message=f"Are you sure you want to delete {payment}?"
             ):
-                self.parent.manager.delete_tenant(payment)
-                messagebox.showinfo(
-                    title="Payment Deleted",
-                    message="Payment Record deleted successfully."
+                self.parent.executor.submit(
+                    self.parent.manager.delete_payment,
+                    payment,
+                    on_success=self.while_open(lambda _: self.record_deleted("Payment Deleted", "Payment Record deleted successfully.")),
+                    on_error=show_database_error
                 )
-                
-                self.load_data()
     
+    def record_deleted(self, title: str, message: str) -> None:
+        messagebox.showinfo(title=title, message=message)
+    
+    @instrumented
     def edit_tenant_pressed(self) -> None:
         if (s := self.window.tenants_treeview.selection()):
-            tenant = self.parent.manager.get_tenant(int(s[0]))
-        
+            self.parent.executor.submit(
+                self.parent.manager.get_tenant,
+                int(s[0]),
+                on_success=self.while_open(self.edit_tenant),
+                on_error=show_database_error
+            )
+    
+    def edit_tenant(self, tenant: Optional[Tenant]) -> None:
         if tenant:
-            TenantFormController(self, TenantForm(self.window), tenant)
+            TenantFormController(self, window_pool.acquire(TenantForm, self.window), tenant)
     
+    @instrumented
     def edit_payment_pressed(self) -> None:
         if (s := self.window.payments_treeview.selection()):
-            payment = self.parent.manager.get_payment(int(s[0]))
-            
+            self.parent.executor.submit(
+                self.parent.manager.get_payment,
+                int(s[0]),
+                on_success=self.while_open(self.edit_payment),
+                on_error=show_database_error
+            )
+    
+    def edit_payment(self, payment: Optional[Payment]) -> None:
         if payment:
-            PaymentFormController(self, PaymentForm(self.window), self.room, payment)
+            PaymentFormController(self, window_pool.acquire(PaymentForm, self.window), self.room, payment)
     
     def add_tenant_pressed(self) -> None:
         if self.room.tenant_count < self.room.max_capacity:
-            TenantFormController(self, TenantForm(self.window))
+            TenantFormController(self, window_pool.acquire(TenantForm, self.window))
         else:
             messagebox.showinfo(
                 title="Max Capacity Reached",
@@ -465,40 +985,50 @@ class RoomOpenController:
             )
         
     def add_payment_pressed(self) -> None:
-        PaymentFormController(self, PaymentForm(self.window), self.room)
+        PaymentFormController(self, window_pool.acquire(PaymentForm, self.window), self.room)
     
     def edit_room_pressed(self) -> None:
-        RoomFormController(self, RoomForm(self.window), self.room)
+        RoomFormController(self, window_pool.acquire(RoomForm, self.window), self.room)
         
+    @instrumented
     def add_lease_pressed(self) -> None:
         if self.room.lease:
-            if len(self.room.payments) == 0:
+            if len(self.payment_rows) == 0:
                 messagebox.showwarning("Delete Lease", message="You are about to delete the lease.")
                 
                 if messagebox.askyesno(
                     title="Delete Lease",
                     message=f"Are you sure you want to delete the lease?"
                 ):
-                    self.parent.manager.delete_lease(self.room.lease)
-                    messagebox.showinfo(
-                        title="Lease Deleted",
-                        message="Lease deleted successfully."
+                    self.parent.executor.submit(
+                        self.parent.manager.delete_lease,
+                        self.room.lease,
+                        on_success=self.while_open(lambda _: self.record_deleted("Lease Deleted", "Lease deleted successfully.")),
+                        on_error=show_database_error
                     )
-                    
-                    self.load_lease()
-                    self.load_payments()
             else:
                 messagebox.showerror(
                     title="Error Deleting Lease",
                     message="Payments for this room must first be cleared before adding a new lease."
                 )
         else:
-            LeaseFormController(self, LeaseForm(self.window))
+            LeaseFormController(self, window_pool.acquire(LeaseForm, self.window))
         
     def close(self) -> None:
-        self.window.destroy()
+        self.closed = True
+        self.parent.executor.cancel(f"room_{self.room.room_number}")
+        self.parent.executor.cancel(f"lease_{self.room.room_number}")
+        
+        window_pool.release_children(self.window)
+        window_pool.release(self.window)
+        
+        if self.parent.room_controller is self:
+            self.parent.room_controller = None
+        
+        for unsubscribe in self.subscriptions:
+            unsubscribe()
+        
         self.parent.window.deiconify()
-        self.parent.load_rooms()
         del self
     
 class TenantFormController:
@@ -531,21 +1061,21 @@ class TenantFormController:
         self.window.lastname_entry.configure(
             validate="key", 
             validatecommand=(
-                self.window.register(lambda change: change.isalpha() or change == "" or change.isspace()), 
+                self.window.register(valid_name), 
                 "%S"
             )
         )
         self.window.firstname_entry.configure(
             validate="key", 
             validatecommand=(
-                self.window.register(lambda change: change.isalpha() or change == "" or change.isspace()), 
+                self.window.register(valid_name), 
                 "%S"
             )
         )
         self.window.middlename_entry.configure(
             validate="key", 
             validatecommand=(
-                self.window.register(lambda change: change.isalpha() or change == "" or change.isspace()), 
+                self.window.register(valid_name), 
                 "%S"
             )
         )
@@ -584,6 +1114,7 @@ class TenantFormController:
         self.contc_var.set(self.tenant.contact_number)
         self.window.birthdate_dateentry.set_date(self.tenant.birth_date)
     
+    @instrumented
     def add_tenant_pressed(self) -> None:
         lastname: str = self.window.lastname_entry.get().strip().upper()
         firstname: str = self.window.firstname_entry.get().strip().upper()
@@ -622,9 +1153,7 @@ class TenantFormController:
                 title = "Tenant Added"
                 message = f"{tenant.formatted_name} was added successfully."
             
-            self.parent.load_data()
-            
-            self.window.destroy()
+            window_pool.release(self.window)
             
             messagebox.showinfo(title=title, message=message)
         
@@ -635,7 +1164,7 @@ class TenantFormController:
             )
     
     def close(self) -> None:
-        self.window.destroy()
+        window_pool.release(self.window)
         del self
     
 class LeaseFormController:
@@ -656,7 +1185,7 @@ class LeaseFormController:
         self.window.rent_entry.configure(
             validate="key", 
             validatecommand=(
-                self.window.register(lambda change: change.isdigit() or change == "" or change == "."), 
+                self.window.register(amount_characters), 
                 "%S"
             )
         )
@@ -669,10 +1198,11 @@ class LeaseFormController:
     def populate_leaser_combobox(self) -> None:
         leaser_names = (
             f"{leaser.tenant_id} | {leaser.formatted_name}" 
-            for leaser in self.parent.room.tenants
+            for leaser in self.parent.tenant_rows
         )
         self.window.leaser_combobox["values"] = list(leaser_names)
     
+    @instrumented
     def add_lease_pressed(self) -> None:
         leaser_id: str = self.window.leaser_combobox.get().split("|")[0].strip()
         start_date: date = self.window.startdate_entry.get_date()
@@ -692,9 +1222,7 @@ class LeaseFormController:
                 monthly_rent_amount=Decimal(rent)
             ))
             
-            self.parent.load_lease()
-            
-            self.window.destroy()
+            window_pool.release(self.window)
             
             messagebox.showinfo(title="Lease Added", message="Lease added successfully.")
             
@@ -707,7 +1235,7 @@ class LeaseFormController:
             )
 
     def close(self) -> None:
-        self.window.destroy()
+        window_pool.release(self.window)
         del self
 
 class PaymentFormController:
@@ -749,7 +1277,7 @@ class PaymentFormController:
         self.window.payment_amount_entry.configure(
             validate="key", 
             validatecommand=(
-                self.window.register(lambda change: change.isdigit() or change == "" or change == "."), 
+                self.window.register(amount_characters), 
                 "%S"
             )
         )
@@ -765,6 +1293,7 @@ class PaymentFormController:
             self.rent_var.set(str(self.payment.payment_amount))
             self.window.paid_var.set(self.payment.paid)
     
+    @instrumented
     def add_payment_pressed(self) -> None:
         payment_date: date = self.window.payment_date_entry.get_date()
         payment_amount: str = self.window.payment_amount_entry.get().strip()
@@ -785,7 +1314,7 @@ class PaymentFormController:
                 payment = self.parent.parent.manager.add_payment(Payment(
                     leaser_id=self.room.lease.leaser_id,
                     room_number=self.room.room_number,
-                    payment_amount=payment_amount,
+                    payment_amount=Decimal(payment_amount),
                     payment_date=payment_date,
                     paid=paid
                 ))
@@ -793,9 +1322,7 @@ class PaymentFormController:
                 title = "Payment Added"
                 message = f"Payment for {payment.payment_date} worth {payment.payment_amount} has been added successfully."
             
-            self.parent.load_payments()
-            
-            self.window.destroy()
+            window_pool.release(self.window)
             
             messagebox.showinfo(title=title, message=message)
             
@@ -808,5 +1335,5 @@ class PaymentFormController:
             )
 
     def close(self) -> None:
-        self.window.destroy()
+        window_pool.release(self.window)
         del self
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from tkinter import messagebox, StringVar
+
+from src.app.startup import finish_warm_up
+from src.views.forms import LoginForm
+
+class LoginFormController:
+    """
+    Controller of the login form. Unlike the other controllers it imports no
+    database code up front, so the login form shows before SQLAlchemy loads.
+    """
+    
+    def __init__(self, window: LoginForm) -> None:
+        self.window = window
+        
+        self.__set_formatters()
+        self.__set_actions()
+    
+    def __set_formatters(self) -> None:
+        self.un_var = StringVar(master=self.window)
+        self.pw_var = StringVar(master=self.window)
+        
+        self.window.username_entry.configure(textvariable=self.un_var)
+        self.window.password_entry.configure(textvariable=self.pw_var)
+    
+    def __set_actions(self) -> None:
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        
+        self.window.login_button.configure(command=self.login_pressed)
+    
+    def login_pressed(self) -> None:
+        # Usually done by now, as the warm-up starts when the login form shows
+        finish_warm_up()
+        
+        from sqlalchemy.exc import OperationalError
+        
+        from src.controllers.controller import RoomListController
+        from src.managers.manager import BoardingHouseManager
+        from src.services.instrumentation import action
+        from src.services.service import SessionFactory
+        from src.views.rooms import RoomListWindow
+        
+        username = self.un_var.get()
+        password = self.pw_var.get()
+        
+        with action("LoginFormController.login_pressed"):
+            try:
+                session_factory = SessionFactory(username, password)
+                session_factory.check_connection()
+            
+            except OperationalError as err:
+                print(err)
+                
+                messagebox.showerror(
+                    title="Login Failed",
+                    message="Username and/or password not recognized."
+                )
+                
+                self.un_var.set("")
+                self.pw_var.set("")
+            
+            else:
+                RoomListController(
+                    BoardingHouseManager(session_factory.session),
+                    RoomListWindow()
+                )
+                
+                self.window.destroy()
+                
+                del self
+    
+    def close(self) -> None:
+        self.window.destroy()
+        
+        del self
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+from src.models.entities import Room, Tenant, Lease, Payment, Change
+from src.models.projections import RoomRow, TenantRow, ChangeRow
+from src.managers.manager import BULK_CHUNK_SIZE, CHANGES_PAGE_SIZE, chunked, changes_query, rooms_page_query, rooms_count_query, room_detail_query, room_lease_query, tenant_search_query
+
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import asc, delete, desc, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+class AsyncBoardingHouseManager:
+    """
+    asyncio counterpart of `BoardingHouseManager`.
+    
+    Every call runs in its own short-lived `AsyncSession`, so many calls can be
+    awaited concurrently from one event loop, each on its own pooled connection.
+    Returned entities are detached with their loaded attributes; relationships
+    are only available where they were eagerly loaded (see `get_room_detail`).
+    
+    It keeps none of the caches, the name index or the events of
+    `BoardingHouseManager`: its writes are not published to an `EventBus`, a
+    `BoardingHouseManager` on the same database serves its cached entities
+    until they expire, and its name index never sees them. Open windows still
+    pick the writes up from the change log (see `get_changes`).
+    """
+    
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        self.session_factory = session_factory
+    
+    async def add_room(self, room: Room) -> Room:
+        return await self.__add(room)
+    
+    async def add_tenant(self, tenant: Tenant) -> Tenant:
+        return await self.__add(tenant)
+    
+    async def add_lease(self, lease: Lease) -> Lease:
+        return await self.__add(lease)
+    
+    async def add_payment(self, payment: Payment) -> Payment:
+        return await self.__add(payment)
+    
+    async def bulk_add_rooms(self, rooms: Iterable[dict[str, Any]], chunk_size: int = BULK_CHUNK_SIZE) -> int:
+        return await self.__bulk_insert(Room, rooms, chunk_size)
+    
+    async def bulk_add_tenants(self, tenants: Iterable[dict[str, Any]], chunk_size: int = BULK_CHUNK_SIZE) -> int:
+        return await self.__bulk_insert(
+            Tenant,
+            (
+                {
+                    **tenant,
+                    "last_name": tenant["last_name"].upper(),
+                    "first_name": tenant["first_name"].upper(),
+                    "middle_name": tenant.get("middle_name", "").upper()
+                }
+                for tenant in tenants
+            ),
+            chunk_size
+        )
+    
+    async def bulk_add_leases(self, leases: Iterable[dict[str, Any]], chunk_size: int = BULK_CHUNK_SIZE) -> int:
+        return await self.__bulk_insert(Lease, leases, chunk_size)
+    
+    async def bulk_add_payments(self, payments: Iterable[dict[str, Any]], chunk_size: int = BULK_CHUNK_SIZE) -> int:
+        return await self.__bulk_insert(Payment, payments, chunk_size)
+    
+    async def update_room(self, room: Room) -> None:
+        await self.__add(room)
+    
+    async def update_tenant(self, tenant: Tenant) -> None:
+        await self.__add(tenant)
+    
+    async def update_lease(self, lease: Lease) -> None:
+        await self.__add(lease)
+    
+    async def update_payment(self, payment: Payment) -> None:
+        await self.__add(payment)
+    
+    async def delete_room(self, room: Room) -> None:
+        await self.__delete(*(
+            delete(entity).where(entity.room_number == room.room_number)
+            for entity in (Payment, Lease, Tenant, Room)
+        ))
+    
+    async def delete_tenant(self, tenant: Tenant) -> None:
+        await self.__delete(
+            delete(Payment).where(Payment.leaser_id == tenant.tenant_id),
+            delete(Lease).where(Lease.leaser_id == tenant.tenant_id),
+            delete(Tenant).where(Tenant.tenant_id == tenant.tenant_id)
+        )
+    
+    async def delete_lease(self, lease: Lease) -> None:
+        await self.__delete(delete(Lease).where(Lease.lease_id == lease.lease_id))
+    
+    async def delete_payment(self, payment: Payment) -> None:
+        await self.__delete(delete(Payment).where(Payment.payment_id == payment.payment_id))
+    
+    async def get_room(self, room_number: int) -> Optional[Room]:
+        async with self.session_factory() as session:
+            return await session.get(Room, room_number)
+    
+    async def get_tenant(self, tenant_id: int) -> Optional[Tenant]:
+        async with self.session_factory() as session:
+            return await session.get(Tenant, tenant_id)
+    
+    async def get_lease(self, lease_id: int) -> Optional[Lease]:
+        async with self.session_factory() as session:
+            return await session.get(Lease, lease_id)
+    
+    async def get_payment(self, payment_id: int) -> Optional[Payment]:
+        async with self.session_factory() as session:
+            return await session.get(Payment, payment_id)
+    
+    async def get_room_detail(self, room_number: int) -> Optional[Room]:
+        async with self.session_factory() as session:
+            return (await session.scalars(room_detail_query(room_number))).one_or_none()
+    
+    async def get_room_with_lease(self, room_number: int) -> Optional[Room]:
+        async with self.session_factory() as session:
+            return (await session.scalars(room_lease_query(room_number))).one_or_none()
+    
+    async def get_all_rooms(self) -> list[Room]:
+        return await self.__all(select(Room).order_by(asc(Room.room_number)))
+    
+    async def get_rooms_page(
+        self,
+        prefix: str = "",
+        sort_by: str = "room_number",
+        descending: bool = False,
+        after: Optional[RoomRow] = None,
+        limit: int = 100,
+        offset: int = 0
+    ) -> list[RoomRow]:
+        async with self.session_factory() as session:
+            return [
+                RoomRow(*row)
+                for row in await session.execute(rooms_page_query(prefix, sort_by, descending, after, limit, offset))
+            ]
+    
+    async def count_rooms(self, prefix: str = "") -> int:
+        async with self.session_factory() as session:
+            return await session.scalar(rooms_count_query(prefix))
+    
+    async def search_tenants(
+        self,
+        text: str,
+        after: Optional[TenantRow] = None,
+        limit: int = 50
+    ) -> list[TenantRow]:
+        async with self.session_factory() as session:
+            return [TenantRow(*row) for row in await session.execute(tenant_search_query(text, after, limit))]
+    
+    async def latest_change_id(self) -> int:
+        async with self.session_factory() as session:
+            return await session.scalar(select(func.coalesce(func.max(Change.change_id), 0)))
+    
+    async def get_changes(
+        self,
+        after: int,
+        missing: Iterable[int] = (),
+        limit: int = CHANGES_PAGE_SIZE
+    ) -> list[ChangeRow]:
+        async with self.session_factory() as session:
+            return [ChangeRow(*row) for row in await session.execute(changes_query(after, missing, limit))]
+    
+    async def get_all_tenants(self) -> list[Tenant]:
+        return await self.__all(select(Tenant).order_by(asc(Tenant.tenant_id)))
+    
+    async def get_all_leases(self) -> list[Lease]:
+        return await self.__all(select(Lease).order_by(asc(Lease.lease_id)))
+    
+    async def get_all_payments(self) -> list[Payment]:
+        return await self.__all(select(Payment).order_by(desc(Payment.payment_date)))
+    
+    async def __add(self, entity: Any) -> Any:
+        async with self.session_factory() as session:
+            session.add(entity)
+            await session.commit()
+        
+        return entity
+    
+    async def __bulk_insert(self, entity: type, rows: Iterable[dict[str, Any]], chunk_size: int) -> int:
+        count = 0
+        
+        async with self.session_factory() as session:
+            # One executemany INSERT per chunk
+            for chunk in chunked(rows, chunk_size):
+                await session.execute(insert(entity), chunk)
+                count += len(chunk)
+            
+            await session.commit()
+        
+        return count
+    
+    async def __delete(self, *statements: Any) -> None:
+        async with self.session_factory() as session:
+            for statement in statements:
+                await session.execute(statement)
+            
+            await session.commit()
+    
+    async def __all(self, query: Any) -> list[Any]:
+        async with self.session_factory() as session:
+            return list(await session.scalars(query))
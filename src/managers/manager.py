@@ -1,100 +1,873 @@
 from __future__ import annotations
 
-from src.models.entities import Room, Tenant, Lease, Payment
-from src.services.service import Session
+from src.models.entities import Room, Tenant, Lease, Payment, Change
+from src.models.projections import RoomRow, TenantRow, PaymentRow, ChangeRow
+from src.models.validators import valid_contact_number
+from src.services.service import Session, sessionmaker
+from src.services.cache import EntityCache
+from src.services.search import TrigramIndex, SEARCH_LIMIT
+from src.services.events import (
+    EventBus, RoomAdded, RoomUpdated, RoomDeleted, TenantAdded, TenantUpdated, TenantDeleted,
+    LeaseAdded, LeaseUpdated, LeaseDeleted, PaymentAdded, PaymentUpdated, PaymentDeleted, RecordsImported
+)
 
-from typing import Iterable, Optional
+from contextlib import contextmanager, nullcontext
+from itertools import islice
+from threading import Lock
+from typing import Any, Callable, Hashable, Iterable, Iterator, Optional
 
-from sqlalchemy import asc, desc
+from sqlalchemy import and_, asc, delete, desc, false, func, insert, inspect, or_, select, tuple_, Select
+from sqlalchemy.orm import joinedload, selectinload, scoped_session
+
+ROOM_SORT_COLUMNS = {
+    "room_number": Room.room_number,
+    "occupancy": Room.tenant_count,
+}
+
+MAX_ROOM_NUMBER_DIGITS = 10
+
+BATCH_FLUSH_SIZE = 500
+
+BULK_CHUNK_SIZE = 1000
+
+CHANGES_PAGE_SIZE = 500
+
+# Changes kept in the change log when it is pruned, far more than a client falls behind
+CHANGES_KEPT = 100_000
+
+def room_number_prefix_filter(prefix: str):
+    """
+    Function to build an index-friendly filter for room numbers whose decimal
+    form starts with `prefix`, as a union of room number ranges
+    (e.g. "12" -> 12, 120-129, 1200-1299, ...).
+    """
+    if not prefix.isdigit() or prefix.startswith("0"):
+        return false()
+    
+    start = int(prefix)
+    
+    return or_(*(
+        Room.room_number.between(start * 10 ** k, (start + 1) * 10 ** k - 1)
+        for k in range(MAX_ROOM_NUMBER_DIGITS - len(prefix) + 1)
+    ))
+
+ROOM_ROW_COLUMNS = (Room.room_number, Room.tenant_count, Room.max_capacity)
+
+TENANT_ROW_COLUMNS = (
+    Tenant.tenant_id,
+    Tenant.last_name,
+    Tenant.first_name,
+    Tenant.middle_name,
+    Tenant.contact_number,
+    Tenant.birth_date,
+    Tenant.room_number
+)
+
+PAYMENT_ROW_COLUMNS = (Payment.payment_id, Payment.payment_date, Payment.payment_amount, Payment.paid)
+
+CHANGE_ROW_COLUMNS = (Change.change_id, Change.table_name, Change.row_id, Change.room_number, Change.action)
+
+def rooms_page_query(
+    prefix: str,
+    sort_by: str,
+    descending: bool,
+    after: Optional[RoomRow],
+    limit: int,
+    offset: int = 0
+) -> Select[tuple[int, int, int]]:
+    column = ROOM_SORT_COLUMNS[sort_by]
+    order = desc if descending else asc
+    
+    query = select(*ROOM_ROW_COLUMNS)
+    
+    if prefix:
+        query = query.where(room_number_prefix_filter(prefix))
+    
+    if after is not None:
+        if column is Room.room_number:
+            key, last = Room.room_number, after.room_number
+        else:
+            key = tuple_(column, Room.room_number)
+            last = tuple_(getattr(after, column.key), after.room_number)
+        
+        query = query.where(key < last if descending else key > last)
+    
+    if column is Room.room_number:
+        query = query.order_by(order(Room.room_number))
+    else:
+        query = query.order_by(order(column), order(Room.room_number))
+    
+    if offset:
+        query = query.offset(offset)
+    
+    return query.limit(limit)
+
+def rooms_count_query(prefix: str) -> Select[tuple[int]]:
+    query = select(func.count()).select_from(Room)
+    
+    if prefix:
+        query = query.where(room_number_prefix_filter(prefix))
+    
+    return query
+
+def prefix_range(column: Any, prefix: str):
+    """
+    Function to build an index-friendly filter for strings starting with `prefix`,
+    as the range `prefix <= column < successor of prefix`. Unlike LIKE, the range
+    uses the index whatever the collation or case sensitivity of the backend.
+    """
+    return and_(column >= prefix, column < prefix[:-1] + chr(ord(prefix[-1]) + 1))
+
+def tenant_search_query(text: str, after: Optional[TenantRow], limit: int) -> Select:
+    """
+    Function to build the query of `search_tenants`.
+    
+    A contact number (09 followed by 9 digits) is looked up exactly through
+    `ix_contactNumber`. Anything else is a name prefix on `ix_lastName_firstName`:
+    "SANTOS" matches last names starting with SANTOS, and "SANTOS, JU" matches
+    the last name SANTOS with first names starting with JU.
+    """
+    query = select(*TENANT_ROW_COLUMNS)
+    text = text.strip().upper()
+    
+    if valid_contact_number(text):
+        query = query.where(Tenant.contact_number == text)
+        
+        if after is not None:
+            query = query.where(Tenant.tenant_id > after.tenant_id)
+        
+        return query.order_by(asc(Tenant.tenant_id)).limit(limit)
+    
+    last_name, _, first_name = (part.strip() for part in text.partition(","))
+    
+    if first_name:
+        query = query.where(Tenant.last_name == last_name, prefix_range(Tenant.first_name, first_name))
+    elif last_name:
+        query = query.where(prefix_range(Tenant.last_name, last_name))
+    
+    key = tuple_(Tenant.last_name, Tenant.first_name, Tenant.tenant_id)
+    
+    if after is not None:
+        query = query.where(key > tuple_(after.last_name, after.first_name, after.tenant_id))
+    
+    return query.order_by(asc(Tenant.last_name), asc(Tenant.first_name), asc(Tenant.tenant_id)).limit(limit)
+
+def changes_query(after: int, missing: Iterable[int], limit: int) -> Select:
+    """
+    Function to build the query of `get_changes`: the changes logged after the
+    change `after`, plus the earlier ones in `missing`, oldest first.
+    """
+    condition = Change.change_id > after
+    
+    if missing := list(missing):
+        condition = or_(condition, Change.change_id.in_(missing))
+    
+    return select(*CHANGE_ROW_COLUMNS).where(condition).order_by(asc(Change.change_id)).limit(limit)
+
+def room_detail_query(room_number: int) -> Select[tuple[Room]]:
+    return (
+        select(Room)
+        .options(
+            joinedload(Room.lease).joinedload(Lease.leaser),
+            selectinload(Room.tenants),
+            selectinload(Room.payments)
+        )
+        .where(Room.room_number == room_number)
+    )
+
+def room_lease_query(room_number: int) -> Select[tuple[Room]]:
+    return (
+        select(Room)
+        .options(joinedload(Room.lease).joinedload(Lease.leaser))
+        .where(Room.room_number == room_number)
+    )
+
+def room_row(room: Room) -> RoomRow:
+    return RoomRow(*(getattr(room, column.key) for column in ROOM_ROW_COLUMNS))
+
+def tenant_row(tenant: Tenant) -> TenantRow:
+    return TenantRow(*(getattr(tenant, column.key) for column in TENANT_ROW_COLUMNS))
+
+def payment_row(payment: Payment) -> PaymentRow:
+    return PaymentRow(*(getattr(payment, column.key) for column in PAYMENT_ROW_COLUMNS))
+
+def chunked(rows: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    iterator = iter(rows)
+    
+    while chunk := list(islice(iterator, size)):
+        yield chunk
 
 class BoardingHouseManager:
-    def __init__(self, session: Session) -> None:
-        self.session = session
+    def __init__(self, session_factory: sessionmaker[Session], events: Optional[EventBus] = None) -> None:
+        self.session_factory = session_factory
+        
+        # Every write publishes a domain event here once it has committed
+        self.events = events if events is not None else EventBus()
+        
+        # Batches are per thread, so worker threads never share a session
+        self.batch_sessions = scoped_session(session_factory)
+        
+        self.rooms_cache = EntityCache()
+        self.tenants_cache = EntityCache()
+        self.payments_cache = EntityCache()
+        self.room_lists_cache = EntityCache()
+        
+        # Built on first use of fuzzy_search_tenants, see enable_name_index
+        self.name_index: Optional[TrigramIndex] = None
+        self.name_index_build_lock = Lock()
+        self.name_index_lock = Lock()
+        
+        # Changes made while the name index is being built, replayed onto it once built
+        self.name_index_backlog: Optional[list[Callable[[TrigramIndex], None]]] = None
+    
+    @property
+    def in_batch(self) -> bool:
+        return self.batch_sessions.registry.has()
+    
+    @contextmanager
+    def session(self) -> Iterator[Session]:
+        """
+        Context manager for the session of one manager operation.
+        
+        Outside of a batch, every operation gets a short-lived session whose
+        connection is checked out from the engine's pool and returned when the
+        operation ends. Returned entities are detached but keep their loaded
+        attributes. Inside a batch, the batch's session is used instead.
+        """
+        if self.in_batch:
+            yield self.batch_sessions()
+            return
+        
+        with self.session_factory() as session:
+            yield session
+    
+    @contextmanager
+    def batch(self, flush_size: int = BATCH_FLUSH_SIZE) -> Iterator[BoardingHouseManager]:
+        """
+        Context manager for a unit of work spanning several manager calls.
+        
+        Inside the block, `add_*`, `update_*` and `delete_*` calls join the batch
+        instead of committing on their own. Pending changes are flushed every
+        `flush_size` calls and committed once when the block exits, or rolled back
+        if it raises. Nested batches join the outermost one.
+        
+        Note that autoincrement ids of added objects are only assigned once the
+        batch is flushed. A batch belongs to the thread that opened it, and reads
+        inside it bypass the entity caches.
+        """
+        if self.in_batch:
+            yield self
+            return
+        
+        session = self.batch_sessions()
+        session.info["flush_size"] = flush_size
+        session.info["pending"] = 0
+        session.info["name_index_updates"] = name_index_updates = []
+        session.info["events"] = events = []
+        
+        try:
+            yield self
+        
+        except BaseException:
+            session.rollback()
+            raise
+        
+        else:
+            session.commit()
+        
+        finally:
+            self.batch_sessions.remove()
+            
+            # Other threads may have cached rows the batch has since changed
+            self.clear_cache()
+        
+        # Only reached once the batch has committed
+        for update in name_index_updates:
+            self.__update_name_index(update)
+        
+        for event in events:
+            self.events.publish(event())
+    
+    def __commit(self, session: Session) -> None:
+        if not self.in_batch:
+            session.commit()
+            return
+        
+        session.info["pending"] += 1
+        
+        if session.info["pending"] >= session.info["flush_size"]:
+            session.flush()
+            session.info["pending"] = 0
+    
+    def __update_name_index(self, update: Callable[[TrigramIndex], None]) -> None:
+        """
+        Function to apply a change to the tenant name index, if it is built or
+        being built. Inside a batch, the change waits until the batch has committed.
+        """
+        if self.in_batch:
+            self.batch_sessions().info["name_index_updates"].append(update)
+            return
+        
+        with self.name_index_lock:
+            if self.name_index is not None:
+                update(self.name_index)
+            elif self.name_index_backlog is not None:
+                self.name_index_backlog.append(update)
+    
+    def __publish(self, event: Callable[[], Any]) -> None:
+        """
+        Function to publish the event built by `event()`. Inside a batch, it is
+        built and published once the batch has committed, when ids are assigned.
+        """
+        if self.in_batch:
+            self.batch_sessions().info["events"].append(event)
+        else:
+            self.events.publish(event())
+    
+    def __index_tenants(self, index: TrigramIndex, tenant_ids: Optional[list[int]]) -> None:
+        """
+        Function to index the tenants of `tenant_ids`, or every tenant not indexed
+        yet when the database could not tell the ids of the bulk inserted rows.
+        """
+        with self.session() as session:
+            if tenant_ids is None:
+                tenant_ids = [
+                    tenant_id
+                    for tenant_id in session.scalars(select(Tenant.tenant_id))
+                    if tenant_id not in index.rows
+                ]
+            
+            for chunk in chunked(tenant_ids, BULK_CHUNK_SIZE):
+                index.add_all(
+                    TenantRow(*row)
+                    for row in session.execute(select(*TENANT_ROW_COLUMNS).where(Tenant.tenant_id.in_(chunk)))
+                )
+    
+    def __cached(self, cache: EntityCache, key: Hashable, load: Callable[[], Any]) -> Any:
+        if self.in_batch:
+            return load()
+        
+        return cache.get(key, load)
+    
+    @contextmanager
+    def __invalidating(self, cache: EntityCache, key: Hashable) -> Iterator[None]:
+        """
+        Context manager for the write of a possibly cached entity. The callers
+        change the very instance the cache hands out before writing it, so its
+        cache entry is dropped whether the write commits or fails.
+        """
+        try:
+            yield
+        finally:
+            cache.invalidate(key)
+    
+    def cache_stats(self) -> dict[str, dict[str, int]]:
+        """
+        Function to get the hit and miss counters and the size of each entity cache.
+        """
+        return {
+            "rooms": self.rooms_cache.stats(),
+            "tenants": self.tenants_cache.stats(),
+            "payments": self.payments_cache.stats(),
+            "room_lists": self.room_lists_cache.stats()
+        }
+    
+    def clear_cache(self) -> None:
+        self.rooms_cache.clear()
+        self.tenants_cache.clear()
+        self.payments_cache.clear()
+        self.room_lists_cache.clear()
 
     def add_room(self, room: Room) -> Room:
-        self.session.add(room)
-        self.session.commit()
+        with self.session() as session:
+            session.add(room)
+            self.__commit(session)
+        
+        self.rooms_cache.invalidate(room.room_number)
+        self.room_lists_cache.clear()
+        self.__publish(lambda: RoomAdded(room.room_number))
+        
         return room
 
     def add_tenant(self, tenant: Tenant) -> Tenant:        
-        self.session.add(tenant)
-        self.session.commit()
+        with self.session() as session:
+            session.add(tenant)
+            self.__commit(session)
+        
+        # The tenant count of the room changes through the triggers
+        self.rooms_cache.invalidate(tenant.room_number)
+        self.room_lists_cache.clear()
+        self.__update_name_index(lambda index: index.add(tenant_row(tenant)))
+        self.__publish(lambda: TenantAdded(tenant.room_number, tenant_row(tenant)))
+        
         return tenant
         
     def add_lease(self, lease: Lease) -> Lease:
-        self.session.add(lease)
-        self.session.commit()
+        with self.session() as session:
+            session.add(lease)
+            self.__commit(session)
+        
+        self.__publish(lambda: LeaseAdded(lease.room_number, lease.lease_id))
+        
         return lease
         
     def add_payment(self, payment: Payment) -> Payment:
-        self.session.add(payment)
-        self.session.commit()
+        with self.session() as session:
+            session.add(payment)
+            self.__commit(session)
+        
+        self.payments_cache.invalidate(payment.payment_id)
+        self.__publish(lambda: PaymentAdded(payment.room_number, payment_row(payment)))
+        
         return payment
         
+    def bulk_add_rooms(self, rooms: Iterable[dict[str, Any]], chunk_size: int = BULK_CHUNK_SIZE) -> int:
+        """
+        Function to insert many rooms, given as dictionaries keyed by attribute name.
+        Returns the number of rows inserted.
+        """
+        count = self.__bulk_insert(Room, rooms, chunk_size)
+        
+        self.rooms_cache.clear()
+        self.room_lists_cache.clear()
+        self.__publish(lambda: RecordsImported(Room.__tablename__, count))
+        
+        return count
+    
+    def bulk_add_tenants(self, tenants: Iterable[dict[str, Any]], chunk_size: int = BULK_CHUNK_SIZE) -> int:
+        """
+        Function to insert many tenants, given as dictionaries keyed by attribute name.
+        
+        Names are uppercased here since bulk inserts bypass the mapper events.
+        Returns the number of rows inserted.
+        """
+        # The ids of the inserted tenants, when the database returns them from an executemany INSERT
+        inserted_ids: Optional[list[int]] = [] if self.__returns_bulk_ids() else None
+        
+        count = self.__bulk_insert(
+            Tenant,
+            (
+                {
+                    **tenant,
+                    "last_name": tenant["last_name"].upper(),
+                    "first_name": tenant["first_name"].upper(),
+                    "middle_name": tenant.get("middle_name", "").upper()
+                }
+                for tenant in tenants
+            ),
+            chunk_size,
+            inserted_ids
+        )
+        
+        self.tenants_cache.clear()
+        self.rooms_cache.clear()
+        self.room_lists_cache.clear()
+        self.__update_name_index(lambda index: self.__index_tenants(index, inserted_ids))
+        self.__publish(lambda: RecordsImported(Tenant.__tablename__, count))
+        
+        return count
+    
+    def bulk_add_leases(self, leases: Iterable[dict[str, Any]], chunk_size: int = BULK_CHUNK_SIZE) -> int:
+        """
+        Function to insert many leases, given as dictionaries keyed by attribute name.
+        Returns the number of rows inserted.
+        """
+        count = self.__bulk_insert(Lease, leases, chunk_size)
+        
+        self.__publish(lambda: RecordsImported(Lease.__tablename__, count))
+        
+        return count
+    
+    def bulk_add_payments(self, payments: Iterable[dict[str, Any]], chunk_size: int = BULK_CHUNK_SIZE) -> int:
+        """
+        Function to insert many payments, given as dictionaries keyed by attribute name.
+        Returns the number of rows inserted.
+        """
+        count = self.__bulk_insert(Payment, payments, chunk_size)
+        
+        self.payments_cache.clear()
+        self.__publish(lambda: RecordsImported(Payment.__tablename__, count))
+        
+        return count
+    
+    def __bulk_insert(
+        self,
+        entity: type,
+        rows: Iterable[dict[str, Any]],
+        chunk_size: int,
+        inserted_ids: Optional[list[Any]] = None
+    ) -> int:
+        count = 0
+        
+        with self.session() as session:
+            # Inside a batch, a failed insert undoes only its own rows, through a savepoint
+            with session.begin_nested() if self.in_batch else nullcontext():
+                # One executemany INSERT per chunk
+                for chunk in chunked(rows, chunk_size):
+                    if inserted_ids is None:
+                        session.execute(insert(entity), chunk)
+                    else:
+                        inserted_ids.extend(session.scalars(insert(entity).returning(*inspect(entity).primary_key), chunk))
+                    
+                    count += len(chunk)
+            
+            self.__commit(session)
+        
+        return count
+    
+    def __returns_bulk_ids(self) -> bool:
+        # e.g. SQLite and MariaDB, but not MySQL
+        with self.session() as session:
+            return session.get_bind().dialect.insert_executemany_returning
+    
     def update_room(self, room: Room) -> None:
-        self.session.commit()
+        with self.__invalidating(self.rooms_cache, room.room_number), self.session() as session:
+            session.add(room)
+            self.__commit(session)
+        
+        self.room_lists_cache.clear()
+        self.__publish(lambda: RoomUpdated(room.room_number, room_row(room)))
     
     def update_tenant(self, tenant: Tenant) -> None:
-        self.session.commit()
+        # The room the tenant was in, before it is committed
+        moved_from = inspect(tenant).attrs.room_number.history.deleted
+        previous_room_number = moved_from[0] if moved_from else tenant.room_number
+        
+        with self.__invalidating(self.tenants_cache, tenant.tenant_id), self.session() as session:
+            session.add(tenant)
+            self.__commit(session)
+        
+        # The tenant may have moved rooms, changing two tenant counts
+        self.rooms_cache.clear()
+        self.room_lists_cache.clear()
+        self.__update_name_index(lambda index: index.add(tenant_row(tenant)))
+        self.__publish(lambda: TenantUpdated(tenant.room_number, tenant_row(tenant), previous_room_number))
     
     def update_lease(self, lease: Lease) -> None:
-        self.session.commit()
+        with self.session() as session:
+            session.add(lease)
+            self.__commit(session)
+        
+        self.__publish(lambda: LeaseUpdated(lease.room_number, lease.lease_id))
     
     def update_payment(self, payment: Payment) -> None:
-        self.session.commit()
+        with self.__invalidating(self.payments_cache, payment.payment_id), self.session() as session:
+            session.add(payment)
+            self.__commit(session)
+        
+        self.__publish(lambda: PaymentUpdated(payment.room_number, payment_row(payment)))
     
     def delete_room(self, room: Room) -> None:
-        if room.lease:
-            self.session.delete(room.lease)
-        if room.payments:
-            for payment in room.payments:
-                self.session.delete(payment)
-        if room.tenants:
-            for tenant in room.tenants:
-                self.session.delete(tenant)
-        self.session.delete(room)
-        self.session.commit()
+        """
+        Function to delete a room together with its payments, lease and tenants.
+        
+        Each table is cleared with a single set-based DELETE, so the cost does not
+        grow with the number of child rows. Matching objects already in the session
+        are marked as deleted through `synchronize_session`.
+        """
+        room_number = room.room_number
+        
+        with self.session() as session:
+            for entity in (Payment, Lease, Tenant, Room):
+                session.execute(
+                    delete(entity)
+                    .where(entity.room_number == room_number)
+                    .execution_options(synchronize_session="evaluate")
+                )
+            
+            self.__commit(session)
+        
+        self.rooms_cache.invalidate(room_number)
+        self.room_lists_cache.clear()
+        self.tenants_cache.clear()
+        self.payments_cache.clear()
+        self.__update_name_index(lambda index: index.remove_room(room_number))
+        self.__publish(lambda: RoomDeleted(room_number))
     
     def delete_tenant(self, tenant: Tenant) -> None:
-        if tenant.lease:
-            self.session.delete(tenant.lease)
-        if tenant.payments:
-            for payment in tenant.payments:
-                self.session.delete(payment)
-        self.session.delete(tenant)
-        self.session.commit()
+        """
+        Function to delete a tenant together with their payments and lease, using
+        one set-based DELETE per table.
+        """
+        tenant_id = tenant.tenant_id
+        
+        with self.session() as session:
+            for entity, column in (
+                (Payment, Payment.leaser_id),
+                (Lease, Lease.leaser_id),
+                (Tenant, Tenant.tenant_id)
+            ):
+                session.execute(
+                    delete(entity)
+                    .where(column == tenant_id)
+                    .execution_options(synchronize_session="evaluate")
+                )
+            
+            self.__commit(session)
+        
+        self.tenants_cache.invalidate(tenant_id)
+        self.payments_cache.clear()
+        self.rooms_cache.invalidate(tenant.room_number)
+        self.room_lists_cache.clear()
+        self.__update_name_index(lambda index: index.remove(tenant_id))
+        self.__publish(lambda: TenantDeleted(tenant.room_number, tenant_id))
         
     def delete_lease(self, lease: Lease) -> None:
-        self.session.delete(lease)
-        self.session.commit()
+        with self.session() as session:
+            session.execute(
+                delete(Lease)
+                .where(Lease.lease_id == lease.lease_id)
+                .execution_options(synchronize_session="evaluate")
+            )
+            self.__commit(session)
         
+        self.__publish(lambda: LeaseDeleted(lease.room_number, lease.lease_id))
+    
     def delete_payment(self, payment: Payment) -> None:
-        self.session.delete(payment)
-        self.session.commit()
+        with self.session() as session:
+            session.execute(
+                delete(Payment)
+                .where(Payment.payment_id == payment.payment_id)
+                .execution_options(synchronize_session="evaluate")
+            )
+            self.__commit(session)
+        
+        self.payments_cache.invalidate(payment.payment_id)
+        self.__publish(lambda: PaymentDeleted(payment.room_number, payment.payment_id))
 
     def get_room(self, room_number: int) -> Optional[Room]:
-        return self.session.get(Room, room_number)
+        return self.__cached(self.rooms_cache, room_number, lambda: self.__get(Room, room_number))
     
     def get_tenant(self, tenant_id: int) -> Optional[Tenant]:
-        return self.session.get(Tenant, tenant_id)
+        return self.__cached(self.tenants_cache, tenant_id, lambda: self.__get(Tenant, tenant_id))
     
     def get_lease(self, lease_id: int) -> Optional[Lease]:
-        return self.session.get(Lease, lease_id)
+        with self.session() as session:
+            return session.get(Lease, lease_id)
     
     def get_payment(self, paymnet_id: int) -> Optional[Payment]:
-        return self.session.get(Payment, paymnet_id)
+        return self.__cached(self.payments_cache, paymnet_id, lambda: self.__get(Payment, paymnet_id))
+    
+    def __get(self, entity: type, key: int) -> Any:
+        with self.session() as session:
+            return session.get(entity, key)
+
+    def get_room_detail(self, room_number: int) -> Optional[Room]:
+        """
+        Function to get a room together with its lease, leaser, tenants and payments.
+        
+        The whole aggregate is eagerly loaded in three queries: the room joined with
+        its lease and leaser, then one SELECT each for the tenants and the payments.
+        """
+        with self.session() as session:
+            return session.scalars(
+                room_detail_query(room_number).execution_options(populate_existing=True)
+            ).one_or_none()
+    
+    def get_room_with_lease(self, room_number: int) -> Optional[Room]:
+        """
+        Function to get a room together with its lease and leaser, joined in one query.
+        
+        The tenants and payments are not loaded and raise once the room is detached;
+        list them with `get_tenant_rows` and `get_payment_rows`, which return
+        lightweight rows instead of entities, or use `get_room_detail`.
+        """
+        with self.session() as session:
+            return session.scalars(
+                room_lease_query(room_number).execution_options(populate_existing=True)
+            ).one_or_none()
 
     def get_all_rooms(self) -> Iterable[Room]:
-        return self.session.query(Room).order_by(asc(Room.room_number)).all()
+        return list(self.__cached(self.room_lists_cache, "all", self.__get_all_rooms))
+    
+    def __get_all_rooms(self) -> list[Room]:
+        with self.session() as session:
+            return session.query(Room).order_by(asc(Room.room_number)).all()
 
+    def get_rooms_page(
+        self,
+        prefix: str = "",
+        sort_by: str = "room_number",
+        descending: bool = False,
+        after: Optional[RoomRow] = None,
+        limit: int = 100,
+        offset: int = 0
+    ) -> list[RoomRow]:
+        """
+        Function to get one page of rooms using keyset pagination.
+        
+        Rooms are filtered by room number prefix and sorted by `sort_by`
+        (see `ROOM_SORT_COLUMNS`), with the room number as tie-breaker.
+        Pass the last room of the previous page as `after` to get the next page.
+        `offset` skips rows instead, for jumping to a page whose predecessor is
+        unknown; it costs a scan of the skipped rows.
+        """
+        with self.session() as session:
+            return [
+                RoomRow(*row)
+                for row in session.execute(rooms_page_query(prefix, sort_by, descending, after, limit, offset))
+            ]
+    
+    def count_rooms(self, prefix: str = "") -> int:
+        """
+        Function to count the rooms whose room number starts with `prefix`.
+        """
+        with self.session() as session:
+            return session.scalar(rooms_count_query(prefix))
+    
+    def get_room_rows(self, room_numbers: Optional[Iterable[int]] = None) -> list[RoomRow]:
+        """
+        Function to get every room, or only the rooms in `room_numbers`, as
+        read-only rows, for list views that do not need full entities.
+        """
+        query = select(*ROOM_ROW_COLUMNS).order_by(asc(Room.room_number))
+        
+        if room_numbers is not None:
+            query = query.where(Room.room_number.in_(list(room_numbers)))
+        
+        with self.session() as session:
+            return [RoomRow(*row) for row in session.execute(query)]
+    
+    def get_tenant_rows(self, room_number: int) -> list[TenantRow]:
+        with self.session() as session:
+            return [
+                TenantRow(*row)
+                for row in session.execute(
+                    select(*TENANT_ROW_COLUMNS)
+                    .where(Tenant.room_number == room_number)
+                    .order_by(asc(Tenant.tenant_id))
+                )
+            ]
+    
+    def search_tenants(
+        self,
+        text: str,
+        after: Optional[TenantRow] = None,
+        limit: int = 50
+    ) -> list[TenantRow]:
+        """
+        Function to search the tenants of every room by name prefix or contact
+        number (see `tenant_search_query`), one page at a time. Pass the last
+        tenant of the previous page as `after` to get the next page.
+        """
+        with self.session() as session:
+            return [TenantRow(*row) for row in session.execute(tenant_search_query(text, after, limit))]
+    
+    def enable_name_index(self) -> TrigramIndex:
+        """
+        Function to build the in-memory trigram index of tenant names behind
+        `fuzzy_search_tenants`, if it is not built yet. From then on the write
+        methods of this manager keep it up to date, writes made during the build
+        included; writes made elsewhere, e.g. by another process, are not seen.
+        """
+        with self.name_index_build_lock:
+            if self.name_index is None:
+                with self.name_index_lock:
+                    self.name_index_backlog = []
+                
+                index = TrigramIndex()
+                
+                try:
+                    with self.session() as session:
+                        index.add_all(TenantRow(*row) for row in session.execute(select(*TENANT_ROW_COLUMNS)))
+                
+                except BaseException:
+                    with self.name_index_lock:
+                        self.name_index_backlog = None
+                    
+                    raise
+                
+                # Writes that committed during the build may be read already; replaying them is harmless
+                with self.name_index_lock:
+                    for update in self.name_index_backlog:
+                        update(index)
+                    
+                    self.name_index = index
+                    self.name_index_backlog = None
+        
+        return self.name_index
+    
+    def fuzzy_search_tenants(self, text: str, limit: int = SEARCH_LIMIT) -> list[TenantRow]:
+        """
+        Function to get the tenants whose name resembles `text` despite typos,
+        best match first. The name index is built on first use.
+        """
+        return [row for _, row in self.enable_name_index().search(text, limit)]
+    
+    def get_payment_rows(self, room_number: int) -> list[PaymentRow]:
+        """
+        Function to get the payments of a room as read-only rows, newest first.
+        """
+        with self.session() as session:
+            return [
+                PaymentRow(*row)
+                for row in session.execute(
+                    select(*PAYMENT_ROW_COLUMNS)
+                    .where(Payment.room_number == room_number)
+                    .order_by(desc(Payment.payment_id))
+                )
+            ]
+
+    def latest_change_id(self) -> int:
+        """
+        Function to get the id of the last change in the change log, where a
+        client starts following it.
+        """
+        with self.session() as session:
+            return session.scalar(select(func.coalesce(func.max(Change.change_id), 0)))
+    
+    def get_changes(
+        self,
+        after: int,
+        missing: Iterable[int] = (),
+        limit: int = CHANGES_PAGE_SIZE
+    ) -> list[ChangeRow]:
+        """
+        Function to get the changes logged after the change `after`, plus the
+        earlier ones in `missing`, oldest first (see `ChangeFeed`).
+        
+        The changed rows are dropped from the entity caches, as they may have
+        been written by another client.
+        """
+        with self.session() as session:
+            changes = [ChangeRow(*row) for row in session.execute(changes_query(after, missing, limit))]
+        
+        for change in changes:
+            self.rooms_cache.invalidate(change.room_number)
+            
+            if change.table_name == "tenants":
+                self.tenants_cache.invalidate(change.row_id)
+            elif change.table_name == "payments":
+                self.payments_cache.invalidate(change.row_id)
+        
+        if changes:
+            self.room_lists_cache.clear()
+        
+        return changes
+    
+    def prune_changes(self, keep: int = CHANGES_KEPT) -> int:
+        """
+        Function to delete all but the last `keep` changes from the change log.
+        Returns the number of changes deleted.
+        """
+        with self.session() as session:
+            latest = session.scalar(select(func.coalesce(func.max(Change.change_id), 0)))
+            
+            # By id rather than by time, so the clocks of the clients do not matter
+            deleted = session.execute(delete(Change).where(Change.change_id <= latest - keep)).rowcount
+            self.__commit(session)
+        
+        return deleted
+    
     def get_all_tenants(self) -> Iterable[Tenant]:
-        return self.session.query(Tenant).order_by(asc(Tenant.tenant_id)).all()
+        with self.session() as session:
+            return session.query(Tenant).order_by(asc(Tenant.tenant_id)).all()
     
     def get_all_leases(self) -> Iterable[Lease]:
-        return self.session.query(Lease).order_by(asc(Lease.lease_id)).all()
+        with self.session() as session:
+            return session.query(Lease).order_by(asc(Lease.lease_id)).all()
     
     def get_all_payments(self) -> Iterable[Payment]:
-        return self.session.query(Payment).order_by(desc(Payment.payment_date)).all()
+        with self.session() as session:
+            return session.query(Payment).order_by(desc(Payment.payment_date)).all()
 
-    def close_session(self) -> None:
-        self.session.close()
@@ -4,19 +4,26 @@ from datetime import date
 from decimal import Decimal
 
 from sqlalchemy.sql.schema import Index, ForeignKey, CheckConstraint, UniqueConstraint
-from sqlalchemy.dialects.mysql import INTEGER, VARCHAR, DATE, DECIMAL, BOOLEAN
+from sqlalchemy.dialects import mysql
+from sqlalchemy.types import BigInteger, Integer, String, Date, Numeric, Boolean
 from sqlalchemy.orm import relationship, mapped_column, Mapped
 from sqlalchemy.ext.hybrid import hybrid_property
-from sqlalchemy import event
+from sqlalchemy import event, DDL
 
 from src.models.base import Base
 
+# INT UNSIGNED on MySQL, plain INTEGER elsewhere (e.g. SQLite rowid primary keys)
+UNSIGNED_INTEGER = Integer().with_variant(mysql.INTEGER(unsigned=True), "mysql")
+
+# BIGINT UNSIGNED on MySQL; SQLite only autoincrements an INTEGER primary key
+UNSIGNED_BIG_INTEGER = BigInteger().with_variant(mysql.BIGINT(unsigned=True), "mysql").with_variant(Integer(), "sqlite")
+
 class Room(Base):
     __tablename__ = "rooms"
     
-    room_number: Mapped[int] = mapped_column("roomNumber", INTEGER(unsigned=True), primary_key=True, nullable=False)
-    max_capacity: Mapped[int] = mapped_column("maxCapacity", INTEGER(unsigned=True), nullable=False)
-    tenant_count: Mapped[int] = mapped_column("tenantCount", INTEGER(unsigned=True), nullable=False, default=0)
+    room_number: Mapped[int] = mapped_column("roomNumber", UNSIGNED_INTEGER, primary_key=True, nullable=False)
+    max_capacity: Mapped[int] = mapped_column("maxCapacity", UNSIGNED_INTEGER, nullable=False)
+    tenant_count: Mapped[int] = mapped_column("tenantCount", UNSIGNED_INTEGER, nullable=False, default=0)
     
     __table_args__ = (
         CheckConstraint('tenantCount <= maxCapacity', name='chk_tenantCount'),
@@ -38,22 +45,24 @@ class Room(Base):
 class Tenant(Base):
     __tablename__ = 'tenants'
     
-    tenant_id: Mapped[int] = mapped_column("tenantId", INTEGER(unsigned=True), primary_key=True, autoincrement=True)
-    last_name: Mapped[str] = mapped_column("lastName", VARCHAR(255), nullable=False)
-    first_name: Mapped[str] = mapped_column("firstName", VARCHAR(255), nullable=False)
-    middle_name: Mapped[str] = mapped_column("middleName", VARCHAR(127), nullable=False, default="")
-    birth_date: Mapped[date] = mapped_column("birthDate", DATE, nullable=False)
-    contact_number: Mapped[str] = mapped_column("contactNumber", VARCHAR(11), nullable=False)
-    room_number: Mapped[int] = mapped_column("roomNumber", INTEGER(unsigned=True), ForeignKey('rooms.roomNumber', onupdate='CASCADE', ondelete='CASCADE'), nullable=False)
+    tenant_id: Mapped[int] = mapped_column("tenantId", UNSIGNED_INTEGER, primary_key=True, autoincrement=True)
+    last_name: Mapped[str] = mapped_column("lastName", String(255), nullable=False)
+    first_name: Mapped[str] = mapped_column("firstName", String(255), nullable=False)
+    middle_name: Mapped[str] = mapped_column("middleName", String(127), nullable=False, default="")
+    birth_date: Mapped[date] = mapped_column("birthDate", Date, nullable=False)
+    contact_number: Mapped[str] = mapped_column("contactNumber", String(11), nullable=False)
+    room_number: Mapped[int] = mapped_column("roomNumber", UNSIGNED_INTEGER, ForeignKey('rooms.roomNumber', onupdate='CASCADE', ondelete='CASCADE'), nullable=False)
     
     @hybrid_property
     def formatted_name(self) -> str:
         return f"{self.last_name}, {self.first_name} {self.middle_name}".strip()
     
     __table_args__ = (
-        CheckConstraint("REGEXP_LIKE(contactNumber, '^09[0-9]{9}$')", name='chk_contactNumber'),
-        Index('ix_roomNumber', 'roomNumber'),
+        CheckConstraint("REGEXP_LIKE(contactNumber, '^09[0-9]{9}$')", name='chk_contactNumber').ddl_if(dialect="mysql"),
+        CheckConstraint("contactNumber GLOB '09[0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9]'", name='chk_contactNumber').ddl_if(dialect="sqlite"),
+        Index('ix_tenants_roomNumber', 'roomNumber'),
         Index('ix_lastName_firstName', 'lastName', 'firstName'),
+        Index('ix_contactNumber', 'contactNumber'),
     )
     
     room: Mapped[Room] = relationship("Room", back_populates="tenants")
@@ -72,19 +81,19 @@ class Tenant(Base):
 class Lease(Base):
     __tablename__ = 'leases'
     
-    lease_id: Mapped[int] = mapped_column("leaseId", INTEGER(unsigned=True), primary_key=True, autoincrement=True)
-    leaser_id: Mapped[int] = mapped_column("leaserId", INTEGER(unsigned=True), ForeignKey('tenants.tenantId', onupdate='CASCADE', ondelete='CASCADE'), nullable=False)
-    room_number: Mapped[int] = mapped_column("roomNumber", INTEGER(unsigned=True), ForeignKey('rooms.roomNumber', onupdate='CASCADE', ondelete='CASCADE'), nullable=False)
-    lease_start: Mapped[date] = mapped_column("leaseStart", DATE, nullable=False)
-    lease_end: Mapped[date] = mapped_column("leaseEnd", DATE, nullable=False)
-    monthly_rent_amount: Mapped[Decimal] = mapped_column("monthlyRentAmount", DECIMAL(10, 2), nullable=False)
+    lease_id: Mapped[int] = mapped_column("leaseId", UNSIGNED_INTEGER, primary_key=True, autoincrement=True)
+    leaser_id: Mapped[int] = mapped_column("leaserId", UNSIGNED_INTEGER, ForeignKey('tenants.tenantId', onupdate='CASCADE', ondelete='CASCADE'), nullable=False)
+    room_number: Mapped[int] = mapped_column("roomNumber", UNSIGNED_INTEGER, ForeignKey('rooms.roomNumber', onupdate='CASCADE', ondelete='CASCADE'), nullable=False)
+    lease_start: Mapped[date] = mapped_column("leaseStart", Date, nullable=False)
+    lease_end: Mapped[date] = mapped_column("leaseEnd", Date, nullable=False)
+    monthly_rent_amount: Mapped[Decimal] = mapped_column("monthlyRentAmount", Numeric(10, 2), nullable=False)
     
     __table_args__ = (
         CheckConstraint('leaseStart < leaseEnd', name='leases_chk_leaseEnd'),
         UniqueConstraint('leaserId', name='uq_leaserId'),
         UniqueConstraint('roomNumber', name='uq_roomNumber'),
-        Index('ix_leaserId', 'leaserId'),
-        Index('ix_roomNumber', 'roomNumber'),
+        Index('ix_leases_leaserId', 'leaserId'),
+        Index('ix_leases_roomNumber', 'roomNumber'),
     )
     
     leaser: Mapped[Tenant] = relationship("Tenant", back_populates="lease")
@@ -96,16 +105,16 @@ class Lease(Base):
 class Payment(Base):
     __tablename__ = 'payments'
     
-    payment_id: Mapped[int] = mapped_column("paymentId", INTEGER(unsigned=True), primary_key=True, autoincrement=True)
-    room_number: Mapped[int] = mapped_column("roomNumber", INTEGER(unsigned=True), ForeignKey('rooms.roomNumber', onupdate='CASCADE', ondelete='CASCADE'), nullable=False)
-    leaser_id: Mapped[int] = mapped_column("leaserId", INTEGER(unsigned=True), ForeignKey('tenants.tenantId', onupdate='CASCADE', ondelete='CASCADE'), nullable=False)
-    payment_amount: Mapped[Decimal] = mapped_column("paymentAmount", DECIMAL(10, 2), nullable=False)
-    payment_date: Mapped[date] = mapped_column("paymentDate", DATE, nullable=False)
-    paid: Mapped[bool] = mapped_column("paid", BOOLEAN, nullable=False)
+    payment_id: Mapped[int] = mapped_column("paymentId", UNSIGNED_INTEGER, primary_key=True, autoincrement=True)
+    room_number: Mapped[int] = mapped_column("roomNumber", UNSIGNED_INTEGER, ForeignKey('rooms.roomNumber', onupdate='CASCADE', ondelete='CASCADE'), nullable=False)
+    leaser_id: Mapped[int] = mapped_column("leaserId", UNSIGNED_INTEGER, ForeignKey('tenants.tenantId', onupdate='CASCADE', ondelete='CASCADE'), nullable=False)
+    payment_amount: Mapped[Decimal] = mapped_column("paymentAmount", Numeric(10, 2), nullable=False)
+    payment_date: Mapped[date] = mapped_column("paymentDate", Date, nullable=False)
+    paid: Mapped[bool] = mapped_column("paid", Boolean, nullable=False)
     
     __table_args__ = (
-        Index('ix_leaserId', 'leaserId'),
-        Index('ix_roomNumber', 'roomNumber'),
+        Index('ix_payments_leaserId', 'leaserId'),
+        Index('ix_payments_roomNumber', 'roomNumber'),
     )
     
     room: Mapped[Room] = relationship("Room", back_populates="payments")
@@ -117,8 +126,101 @@ class Payment(Base):
     def __str__(self) -> str:
         return f"Payment ID: {self.payment_id} | {self.payment_date} | Amount: {self.payment_amount}"
 
+class Change(Base):
+    """
+    A row change logged by the triggers, for other clients to poll.
+    """
+    __tablename__ = 'changes'
+    
+    change_id: Mapped[int] = mapped_column("changeId", UNSIGNED_BIG_INTEGER, primary_key=True, autoincrement=True)
+    table_name: Mapped[str] = mapped_column("tableName", String(16), nullable=False)
+    row_id: Mapped[int] = mapped_column("rowId", UNSIGNED_INTEGER, nullable=False)
+    room_number: Mapped[int] = mapped_column("roomNumber", UNSIGNED_INTEGER, nullable=False)
+    action: Mapped[str] = mapped_column("action", String(6), nullable=False)
+    
+    def __repr__(self) -> str:
+        return f"Change(change_id={self.change_id}, table_name={self.table_name!r}, row_id={self.row_id}, room_number={self.room_number}, action={self.action!r})"
+
 @event.listens_for(Tenant, "after_insert")
 def uppercase_names(mapper, connection, target):
     target.last_name = target.last_name.upper()
     target.first_name = target.first_name.upper()
     target.middle_name = target.middle_name.upper()
+
+# SQLite equivalents of the tenantCount triggers in database/schema/2. triggers.sql
+for trigger in (
+    """
+    CREATE TRIGGER increment_room_tenantCount_beforeInsert
+    BEFORE INSERT ON tenants
+    FOR EACH ROW
+    BEGIN
+        UPDATE rooms SET tenantCount = tenantCount + 1 WHERE roomNumber = NEW.roomNumber;
+    END
+    """,
+    """
+    CREATE TRIGGER update_room_tenantCount_beforeUpdate
+    BEFORE UPDATE OF roomNumber ON tenants
+    FOR EACH ROW WHEN NEW.roomNumber <> OLD.roomNumber
+    BEGIN
+        UPDATE rooms SET tenantCount = tenantCount + 1 WHERE roomNumber = NEW.roomNumber;
+        UPDATE rooms SET tenantCount = tenantCount - 1 WHERE roomNumber = OLD.roomNumber;
+    END
+    """,
+    """
+    CREATE TRIGGER decrement_room_tenantCount_afterDelete
+    AFTER DELETE ON tenants
+    FOR EACH ROW
+    BEGIN
+        UPDATE rooms SET tenantCount = tenantCount - 1 WHERE roomNumber = OLD.roomNumber;
+    END
+    """
+):
+    event.listen(Tenant.__table__, "after_create", DDL(trigger).execute_if(dialect="sqlite"))
+
+def change_log_triggers(table: str, key: str, moved_to: str, moved_from: str) -> tuple[str, ...]:
+    """
+    Function to build the SQLite equivalents of the change log triggers of
+    `table` in database/schema/2. triggers.sql. A row whose room number
+    changes is logged as `moved_from` for the old room and `moved_to` for the new one.
+    """
+    columns = "INSERT INTO changes (tableName, rowId, roomNumber, action)"
+    
+    return (
+        f"""
+        CREATE TRIGGER log_{table}_afterInsert
+        AFTER INSERT ON {table}
+        FOR EACH ROW
+        BEGIN
+            {columns} VALUES ('{table}', NEW.{key}, NEW.roomNumber, 'INSERT');
+        END
+        """,
+        f"""
+        CREATE TRIGGER log_{table}_afterUpdate
+        AFTER UPDATE ON {table}
+        FOR EACH ROW
+        BEGIN
+            {columns} SELECT '{table}', OLD.{key}, OLD.roomNumber, '{moved_from}' WHERE NEW.roomNumber <> OLD.roomNumber;
+            {columns} VALUES (
+                '{table}', NEW.{key}, NEW.roomNumber,
+                CASE WHEN NEW.roomNumber = OLD.roomNumber THEN 'UPDATE' ELSE '{moved_to}' END
+            );
+        END
+        """,
+        f"""
+        CREATE TRIGGER log_{table}_afterDelete
+        AFTER DELETE ON {table}
+        FOR EACH ROW
+        BEGIN
+            {columns} VALUES ('{table}', OLD.{key}, OLD.roomNumber, 'DELETE');
+        END
+        """
+    )
+
+for entity, key, moved_to, moved_from in (
+    (Room, "roomNumber", "INSERT", "DELETE"),
+    (Tenant, "tenantId", "UPDATE", "UPDATE"),
+    (Lease, "leaseId", "UPDATE", "UPDATE"),
+    (Payment, "paymentId", "UPDATE", "UPDATE")
+):
+    for trigger in change_log_triggers(entity.__tablename__, key, moved_to, moved_from):
+        event.listen(entity.__table__, "after_create", DDL(trigger).execute_if(dialect="sqlite"))
\ No newline at end of file
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from typing import NamedTuple
+
+class RoomRow(NamedTuple):
+    room_number: int
+    tenant_count: int
+    max_capacity: int
+
+class TenantRow(NamedTuple):
+    tenant_id: int
+    last_name: str
+    first_name: str
+    middle_name: str
+    contact_number: str
+    birth_date: date
+    room_number: int
+
+    @property
+    def formatted_name(self) -> str:
+        return f"{self.last_name}, {self.first_name} {self.middle_name}".strip()
+
+class PaymentRow(NamedTuple):
+    payment_id: int
+    payment_date: date
+    payment_amount: Decimal
+    paid: bool
+
+class ChangeRow(NamedTuple):
+    change_id: int
+    table_name: str
+    row_id: int
+    room_number: int
+    action: str
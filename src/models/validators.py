@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from re import fullmatch, match
+
+def valid_contact_number(contact_number: str) -> bool:
+    return bool(match(r"^09[0-9]{9}$", contact_number))
+
+def amount_characters(text: str) -> bool:
+    """
+    Function to check that `text` holds only the characters the amount
+    entries of the forms accept on a keystroke: digits and the decimal point.
+    """
+    return bool(fullmatch(r"[0-9.]*", text))
+
+def valid_amount(amount: str) -> bool:
+    """
+    Function to check that `amount` is a non-negative decimal number made of
+    digits and at most one decimal point, as typed into the forms. Signs,
+    exponents, "nan" and "inf" are refused.
+    """
+    return bool(fullmatch(r"[0-9]+(\.[0-9]*)?|\.[0-9]+", amount))
+
+def valid_name(name: str) -> bool:
+    """
+    Function to check that `name` holds only letters and spaces, the
+    characters the name entries of the forms accept on a keystroke.
+    """
+    return all(c.isalpha() or c.isspace() for c in name)
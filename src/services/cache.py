@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Any, Callable, Hashable
+
+CACHE_MAX_SIZE = 1024
+CACHE_TTL = 60.0  # seconds
+
+class EntityCache:
+    """
+    Thread-safe read-through cache with LRU and TTL eviction.
+    
+    Entries are dropped once they are older than `ttl` seconds, and the least
+    recently used entry is evicted when more than `max_size` entries are held.
+    Values loaded while an invalidation happens are not stored, so a slow load
+    can never put back a value that a write has just invalidated. Neither is
+    `None`, so a missing entity is found as soon as it is added elsewhere.
+    """
+    
+    def __init__(self, max_size: int = CACHE_MAX_SIZE, ttl: float = CACHE_TTL) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        
+        self.entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.lock = Lock()
+        self.generation = 0
+        
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        """
+        Function to get the cached value of `key`, calling `load()` on a miss.
+        """
+        with self.lock:
+            if (entry := self.entries.get(key)) is not None:
+                expires, value = entry
+                
+                if expires > monotonic():
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                
+                del self.entries[key]
+            
+            self.misses += 1
+            generation = self.generation
+        
+        value = load()
+        
+        with self.lock:
+            if value is not None and generation == self.generation:
+                self.entries[key] = (monotonic() + self.ttl, value)
+                self.entries.move_to_end(key)
+                
+                while len(self.entries) > self.max_size:
+                    self.entries.popitem(last=False)
+        
+        return value
+    
+    def invalidate(self, key: Hashable) -> None:
+        with self.lock:
+            self.entries.pop(key, None)
+            self.generation += 1
+    
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.generation += 1
+    
+    def stats(self) -> dict[str, int]:
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self.entries)}
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+from src.models.projections import ChangeRow
+
+# Seconds a missing change id is waited for before it is taken as rolled back.
+# Long enough for a batch import (see `BoardingHouseManager.batch`) to commit:
+# the changes of a transaction open for longer than this are missed.
+GAP_TIMEOUT = 600.0
+
+# Missing change ids asked for per poll, oldest first, well below the bound
+# parameter limit of SQLite (999 before 3.32)
+MAX_MISSING_PER_POLL = 500
+
+class ChangeFeed:
+    """
+    Follows the change log of the database from the change `cursor` on.
+    
+    Change ids are assigned when a row is written but become visible when its
+    transaction commits, so a later id can show up before an earlier one. The
+    ids skipped this way are asked for again (see `pending`) until they show up
+    or `gap_timeout` seconds have passed (see `expire`), as a rolled back
+    transaction leaves its ids unused for good. Every change is handed out once
+    by `advance`.
+    """
+    
+    def __init__(self, cursor: int, gap_timeout: float = GAP_TIMEOUT) -> None:
+        # Every change up to the cursor has been handed out or given up on
+        self.cursor = cursor
+        self.gap_timeout = gap_timeout
+        
+        self.seen: set[int] = set()
+        self.gaps: dict[int, float] = {}
+    
+    def pending(self) -> tuple[int, list[int]]:
+        """
+        Function to get what to ask the change log for next: the changes after
+        the last one seen, and up to `MAX_MISSING_PER_POLL` missing ones before it.
+        """
+        return max(self.seen, default=self.cursor), sorted(self.gaps)[:MAX_MISSING_PER_POLL]
+    
+    def advance(self, changes: Iterable[ChangeRow], now: float) -> list[ChangeRow]:
+        """
+        Function to take in the changes read from the change log at time `now`,
+        returning the ones not handed out before.
+        """
+        new = [
+            change for change in changes
+            if change.change_id > self.cursor and change.change_id not in self.seen
+        ]
+        
+        for change in new:
+            self.seen.add(change.change_id)
+            self.gaps.pop(change.change_id, None)
+        
+        last = max(self.seen, default=self.cursor)
+        
+        for change_id in range(self.cursor + 1, last):
+            if change_id not in self.seen:
+                self.gaps.setdefault(change_id, now)
+        
+        self.expire(now)
+        
+        return new
+    
+    def expire(self, now: float) -> None:
+        """
+        Function to give up on the missing changes waited on for `gap_timeout`
+        seconds at time `now`. Called on every poll, failed ones included, so
+        the gaps expire even while the change log cannot be read.
+        """
+        last = max(self.seen, default=self.cursor)
+        
+        # Move past the changes seen and the gaps waited on long enough
+        while self.cursor < last:
+            change_id = self.cursor + 1
+            
+            if change_id in self.seen:
+                self.seen.remove(change_id)
+            elif now - self.gaps[change_id] >= self.gap_timeout:
+                del self.gaps[change_id]
+            else:
+                break
+            
+            self.cursor = change_id
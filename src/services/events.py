@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from logging import getLogger
+from threading import Lock
+from typing import Any, Callable, NamedTuple, Optional
+
+from src.models.projections import RoomRow, TenantRow, PaymentRow
+
+logger = getLogger("marites.events")
+
+class RoomAdded(NamedTuple):
+    room_number: int
+
+class RoomUpdated(NamedTuple):
+    room_number: int
+    room: RoomRow
+
+class RoomDeleted(NamedTuple):
+    room_number: int
+
+class TenantAdded(NamedTuple):
+    room_number: int
+    tenant: TenantRow
+
+class TenantUpdated(NamedTuple):
+    room_number: int
+    tenant: TenantRow
+    previous_room_number: int  # differs from room_number for a tenant moved to another room
+
+class TenantDeleted(NamedTuple):
+    room_number: int
+    tenant_id: int
+
+class LeaseAdded(NamedTuple):
+    room_number: int
+    lease_id: int
+
+class LeaseUpdated(NamedTuple):
+    room_number: int
+    lease_id: int
+
+class LeaseDeleted(NamedTuple):
+    room_number: int
+    lease_id: int
+
+class PaymentAdded(NamedTuple):
+    room_number: int
+    payment: PaymentRow
+
+class PaymentUpdated(NamedTuple):
+    room_number: int
+    payment: PaymentRow
+
+class PaymentDeleted(NamedTuple):
+    room_number: int
+    payment_id: int
+
+class RecordsImported(NamedTuple):
+    """
+    Published once per bulk insert instead of once per row.
+    """
+    table_name: str
+    count: int
+
+ROOM_EVENTS = (RoomAdded, RoomUpdated, RoomDeleted)
+TENANT_EVENTS = (TenantAdded, TenantUpdated, TenantDeleted)
+LEASE_EVENTS = (LeaseAdded, LeaseUpdated, LeaseDeleted)
+PAYMENT_EVENTS = (PaymentAdded, PaymentUpdated, PaymentDeleted)
+
+class EventBus:
+    """
+    In-process publish/subscribe of the domain events above, which
+    `BoardingHouseManager` publishes once a write has committed.
+    
+    Handlers are called on the publishing thread, unless they were subscribed
+    with a `dispatch` function that hands the call to another thread, such as
+    `DatabaseExecutor.call_soon` for handlers that update widgets.
+    
+    The write has committed by the time its events are published, so a handler
+    that raises is logged and the other handlers still run, instead of the
+    error reaching the caller of the write as if the write had failed.
+    """
+    
+    def __init__(self) -> None:
+        self.handlers: defaultdict[type, list[Callable[[Any], None]]] = defaultdict(list)
+        self.lock = Lock()
+    
+    def subscribe(
+        self,
+        handler: Callable[[Any], None],
+        *event_types: type,
+        dispatch: Optional[Callable[..., None]] = None
+    ) -> Callable[[], None]:
+        """
+        Function to call `handler(event)` for every published event of one of
+        `event_types`. Returns the function that unsubscribes it again.
+        """
+        if dispatch is not None:
+            receive = lambda event: dispatch(handler, event)
+        else:
+            receive = handler
+        
+        with self.lock:
+            for event_type in event_types:
+                self.handlers[event_type].append(receive)
+        
+        def unsubscribe() -> None:
+            with self.lock:
+                for event_type in event_types:
+                    if receive in self.handlers[event_type]:
+                        self.handlers[event_type].remove(receive)
+        
+        return unsubscribe
+    
+    def publish(self, event: Any) -> None:
+        with self.lock:
+            handlers = list(self.handlers.get(type(event), ()))
+        
+        for handler in handlers:
+            try:
+                handler(event)
+            except Exception:
+                logger.exception("Handler %r failed on %r", handler, event)
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import Context, copy_context
+from queue import Empty, SimpleQueue
+from threading import current_thread, main_thread
+from typing import Any, Callable, Optional
+from tkinter import Misc
+
+from src.services.instrumentation import current_action
+
+MAX_WORKERS = 4
+POLL_INTERVAL = 15  # milliseconds
+DEBOUNCE_DELAY = 250  # milliseconds
+
+class DatabaseExecutor:
+    """
+    Runs database calls on a pool of worker threads and hands their results
+    back to the Tk main thread.
+    
+    Tk may only be used from the main thread, so finished calls are queued and
+    delivered by polling the queue with `after()` while calls are pending.
+    
+    A call can be given a key. Submitting another call with the same key
+    supersedes the previous one: it is cancelled if it has not started yet,
+    and its result is dropped otherwise.
+    
+    Calls and their callbacks run in a copy of the submitter's context, so
+    they are recorded as part of the action that submitted them.
+    """
+    
+    def __init__(self, widget: Misc, max_workers: int = MAX_WORKERS) -> None:
+        self.widget = widget
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="marites-db")
+        
+        self.results: SimpleQueue[tuple[Optional[str], Future, Optional[Callable], Optional[Callable], Context]] = SimpleQueue()
+        self.calls: SimpleQueue[tuple[Callable, tuple[Any, ...]]] = SimpleQueue()
+        self.latest: dict[str, Future] = {}
+        self.pending = 0
+        self.poll_job: Optional[str] = None
+    
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        on_success: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[BaseException], None]] = None,
+        key: Optional[str] = None
+    ) -> Future:
+        """
+        Function to run `fn(*args)` on a worker thread. `on_success` receives the
+        result and `on_error` the raised exception, both on the Tk main thread.
+        """
+        if key is not None:
+            self.cancel(key)
+        
+        # The action stays open until the callbacks of this call have run
+        if (action := current_action.get()) is not None:
+            action.hold()
+        
+        context = copy_context()
+        future = self.pool.submit(context.run, fn, *args)
+        
+        if key is not None:
+            self.latest[key] = future
+        
+        self.pending += 1
+        future.add_done_callback(lambda f: self.results.put((key, f, on_success, on_error, context)))
+        
+        if self.poll_job is None:
+            self.poll_job = self.widget.after(POLL_INTERVAL, self.__poll)
+        
+        return future
+    
+    def cancel(self, key: str) -> None:
+        """
+        Function to cancel the latest call submitted with `key`, if any.
+        """
+        if (future := self.latest.pop(key, None)) is not None:
+            future.cancel()
+    
+    def call_soon(self, fn: Callable[..., Any], *args: Any) -> None:
+        """
+        Function to call `fn(*args)` on the Tk main thread, from any thread,
+        e.g. an event handler for an event published by a submitted call.
+        
+        Off the main thread, the call is made on the next poll of the results,
+        before the result of the call that is running, so it must be made while
+        a submitted call is pending. A call that raises is reported like an
+        error of a Tk callback.
+        """
+        if current_thread() is main_thread():
+            fn(*args)
+        else:
+            self.calls.put((fn, args))
+    
+    def __poll(self) -> None:
+        self.poll_job = None
+        
+        try:
+            self.__run_calls()
+            
+            while True:
+                try:
+                    key, future, on_success, on_error, context = self.results.get_nowait()
+                except Empty:
+                    break
+                
+                self.pending -= 1
+                
+                # The calls a worker queued before finishing, e.g. for the events
+                # it published, may have arrived since, and go first
+                self.__run_calls()
+                
+                try:
+                    context.run(self.__deliver, key, future, on_success, on_error)
+                
+                finally:
+                    if (action := context.get(current_action)) is not None:
+                        action.release()
+        
+        finally:
+            if (self.pending > 0 or not self.calls.empty()) and self.poll_job is None:
+                self.poll_job = self.widget.after(POLL_INTERVAL, self.__poll)
+    
+    def __run_calls(self) -> None:
+        while True:
+            try:
+                fn, args = self.calls.get_nowait()
+            except Empty:
+                break
+            
+            try:
+                fn(*args)
+            except Exception as err:
+                self.widget.report_callback_exception(type(err), err, err.__traceback__)
+    
+    def __deliver(
+        self,
+        key: Optional[str],
+        future: Future,
+        on_success: Optional[Callable[[Any], None]],
+        on_error: Optional[Callable[[BaseException], None]]
+    ) -> None:
+        if future.cancelled():
+            return
+        
+        if key is not None:
+            # Drop results of superseded calls
+            if self.latest.get(key) is not future:
+                return
+            
+            del self.latest[key]
+        
+        if (err := future.exception()) is not None:
+            if on_error is not None:
+                on_error(err)
+            else:
+                self.widget.report_callback_exception(type(err), err, err.__traceback__)
+        
+        elif on_success is not None:
+            on_success(future.result())
+    
+    def shutdown(self) -> None:
+        if self.poll_job is not None:
+            self.widget.after_cancel(self.poll_job)
+            self.poll_job = None
+        
+        self.latest.clear()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+class Debouncer:
+    """
+    Calls `fn` once calls have paused for `delay` milliseconds, with the
+    arguments of the last call, e.g. to query only once typing has paused.
+    """
+    
+    def __init__(self, widget: Misc, fn: Callable[..., Any], delay: int = DEBOUNCE_DELAY) -> None:
+        self.widget = widget
+        self.fn = fn
+        self.delay = delay
+        
+        self.job: Optional[str] = None
+    
+    def __call__(self, *args: Any) -> None:
+        self.cancel()
+        self.job = self.widget.after(self.delay, self.__fire, *args)
+    
+    def cancel(self) -> None:
+        if self.job is not None:
+            self.widget.after_cancel(self.job)
+            self.job = None
+    
+    def __fire(self, *args: Any) -> None:
+        self.job = None
+        self.fn(*args)
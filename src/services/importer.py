@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from csv import DictReader
+from datetime import date
+from decimal import Decimal
+from getpass import getpass
+from typing import Any, Callable, Iterable, NamedTuple, TextIO
+
+from sqlalchemy.exc import DBAPIError
+
+from src.managers.manager import BoardingHouseManager, BULK_CHUNK_SIZE
+from src.models.validators import valid_contact_number, valid_amount, valid_name
+from src.services.service import SessionFactory, dispose_engines
+
+TRUE_VALUES = ("1", "true", "yes", "paid")
+FALSE_VALUES = ("0", "false", "no", "unpaid")
+
+class RowReject(NamedTuple):
+    line: int
+    reason: str
+
+class ImportReport:
+    def __init__(self) -> None:
+        self.inserted = 0
+        self.rejects: list[RowReject] = []
+    
+    def __str__(self) -> str:
+        return f"{self.inserted} row(s) imported, {len(self.rejects)} row(s) rejected"
+
+def parse_id(row: dict[str, str], column: str) -> int:
+    value = (row.get(column) or "").strip()
+    
+    if not (value.isnumeric() and int(value) > 0):
+        raise ValueError(f"{column} must be a positive number")
+    
+    return int(value)
+
+def parse_date(row: dict[str, str], column: str) -> date:
+    try:
+        return date.fromisoformat((row.get(column) or "").strip())
+    except ValueError:
+        raise ValueError(f"{column} must be a date in the format YYYY-MM-DD")
+
+def parse_amount(row: dict[str, str], column: str) -> Decimal:
+    value = (row.get(column) or "").strip()
+    
+    if not (valid_amount(value) and len(value) <= 10):
+        raise ValueError(f"{column} is not a valid amount")
+    
+    return Decimal(value)
+
+def parse_name(row: dict[str, str], column: str, required: bool = True) -> str:
+    value = (row.get(column) or "").strip().upper()
+    
+    if (required and not value) or not valid_name(value):
+        raise ValueError(f"{column} is not a valid name")
+    
+    return value
+
+def parse_tenant(row: dict[str, str]) -> dict[str, Any]:
+    contact_number = (row.get("contact_number") or "").strip()
+    
+    if not valid_contact_number(contact_number):
+        raise ValueError("contact_number must be in the format 09XXXXXXXXX")
+    
+    return {
+        "last_name": parse_name(row, "last_name"),
+        "first_name": parse_name(row, "first_name"),
+        "middle_name": parse_name(row, "middle_name", required=False),
+        "birth_date": parse_date(row, "birth_date"),
+        "contact_number": contact_number,
+        "room_number": parse_id(row, "room_number")
+    }
+
+def parse_lease(row: dict[str, str]) -> dict[str, Any]:
+    lease_start = parse_date(row, "lease_start")
+    lease_end = parse_date(row, "lease_end")
+    
+    if not lease_end > lease_start:
+        raise ValueError("lease_end must be after lease_start")
+    
+    return {
+        "leaser_id": parse_id(row, "leaser_id"),
+        "room_number": parse_id(row, "room_number"),
+        "lease_start": lease_start,
+        "lease_end": lease_end,
+        "monthly_rent_amount": parse_amount(row, "monthly_rent_amount")
+    }
+
+def parse_payment(row: dict[str, str]) -> dict[str, Any]:
+    paid = (row.get("paid") or "").strip().lower()
+    
+    if paid not in TRUE_VALUES + FALSE_VALUES:
+        raise ValueError(f"paid must be one of {', '.join(TRUE_VALUES + FALSE_VALUES)}")
+    
+    return {
+        "room_number": parse_id(row, "room_number"),
+        "leaser_id": parse_id(row, "leaser_id"),
+        "payment_amount": parse_amount(row, "payment_amount"),
+        "payment_date": parse_date(row, "payment_date"),
+        "paid": paid in TRUE_VALUES
+    }
+
+class CsvImporter:
+    """
+    Streams CSV files into the manager's bulk insert methods.
+    
+    Rows are validated with the same rules as the forms. Invalid rows, and rows
+    the database refuses (e.g. a room that does not exist), are reported in the
+    returned `ImportReport` without aborting the rest of the load.
+    """
+    
+    def __init__(self, manager: BoardingHouseManager, chunk_size: int = BULK_CHUNK_SIZE) -> None:
+        self.manager = manager
+        self.chunk_size = chunk_size
+    
+    def import_tenants(self, file: TextIO) -> ImportReport:
+        return self.__import(file, parse_tenant, self.manager.bulk_add_tenants)
+    
+    def import_leases(self, file: TextIO) -> ImportReport:
+        return self.__import(file, parse_lease, self.manager.bulk_add_leases)
+    
+    def import_payments(self, file: TextIO) -> ImportReport:
+        return self.__import(file, parse_payment, self.manager.bulk_add_payments)
+    
+    def __import(
+        self,
+        file: TextIO,
+        parse: Callable[[dict[str, str]], dict[str, Any]],
+        bulk_add: Callable[[Iterable[dict[str, Any]]], int]
+    ) -> ImportReport:
+        report = ImportReport()
+        chunk: list[tuple[int, dict[str, Any]]] = []
+        
+        # Line 1 is the header
+        for line, row in enumerate(DictReader(file), start=2):
+            try:
+                chunk.append((line, parse(row)))
+            except ValueError as err:
+                report.rejects.append(RowReject(line, str(err)))
+            
+            if len(chunk) >= self.chunk_size:
+                self.__load(chunk, bulk_add, report)
+                chunk = []
+        
+        if chunk:
+            self.__load(chunk, bulk_add, report)
+        
+        return report
+    
+    def __load(
+        self,
+        chunk: list[tuple[int, dict[str, Any]]],
+        bulk_add: Callable[[Iterable[dict[str, Any]]], int],
+        report: ImportReport
+    ) -> None:
+        try:
+            report.inserted += bulk_add(row for _, row in chunk)
+        
+        except DBAPIError as err:
+            if err.connection_invalidated:
+                raise
+            
+            # The failed chunk inserted nothing, also inside a batch, where the
+            # manager rolls it back to a savepoint; retry it row by row to single
+            # out the rejected rows
+            for line, row in chunk:
+                try:
+                    report.inserted += bulk_add((row,))
+                except DBAPIError as err:
+                    if err.connection_invalidated:
+                        raise
+                    
+                    report.rejects.append(RowReject(line, str(err.orig)))
+
+def main() -> None:
+    parser = ArgumentParser(description="Import tenants, leases or payments from a CSV file.")
+    parser.add_argument("entity", choices=("tenants", "leases", "payments"))
+    parser.add_argument("file")
+    parser.add_argument("-u", "--username", required=True)
+    parser.add_argument("-p", "--password")
+    parser.add_argument("--chunk-size", type=int, default=BULK_CHUNK_SIZE)
+    args = parser.parse_args()
+    
+    password = args.password if args.password is not None else getpass()
+    
+    manager = BoardingHouseManager(SessionFactory(args.username, password).session)
+    importer = CsvImporter(manager, args.chunk_size)
+    
+    with open(args.file, newline="", encoding="utf-8") as file:
+        report = getattr(importer, f"import_{args.entity}")(file)
+    
+    dispose_engines()
+    
+    for reject in report.rejects:
+        print(f"Line {reject.line}: {reject.reason}")
+    
+    print(report)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from heapq import heappush, heappushpop
+from json import dumps
+from logging import getLogger, FileHandler, StreamHandler, INFO, WARNING
+from os import environ
+from threading import Lock
+from time import perf_counter
+from typing import Any, Callable, Iterator, Optional, TypeVar
+
+from sqlalchemy import event, Engine
+
+logger = getLogger("marites.sql")
+
+# Path of the structured SQL log, or "-" for stderr
+SQL_LOG_VARIABLE = "MARITES_SQL_LOG"
+
+SLOWEST_STATEMENTS = 3
+
+# The same SELECT this many times within one action is reported as an N+1 pattern
+N_PLUS_ONE_THRESHOLD = 5
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+class ActionStats:
+    """
+    SQL statistics of one user action, e.g. a button press.
+    
+    An action may outlive the call that started it: each database call the
+    action hands to `DatabaseExecutor` holds it open until its callback has run,
+    and the statistics are logged once the last hold is released.
+    """
+    
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.started = perf_counter()
+        
+        self.statements = 0
+        self.db_time = 0.0  # seconds
+        self.slowest: list[tuple[float, str]] = []  # min-heap of (seconds, statement)
+        self.selects: Counter[str] = Counter()
+        
+        self.lock = Lock()
+        self.holds = 1
+        self.finished = False
+    
+    def record(self, statement: str, seconds: float, executemany: bool) -> None:
+        with self.lock:
+            self.statements += 1
+            self.db_time += seconds
+            
+            if len(self.slowest) < SLOWEST_STATEMENTS:
+                heappush(self.slowest, (seconds, statement))
+            else:
+                heappushpop(self.slowest, (seconds, statement))
+            
+            if not executemany and statement.lstrip()[:6].upper() == "SELECT":
+                self.selects[statement] += 1
+    
+    def n_plus_one(self) -> list[tuple[str, int]]:
+        """
+        Function to get the SELECT statements repeated at least `N_PLUS_ONE_THRESHOLD`
+        times, typically lazy loads of a relationship inside a loop.
+        """
+        with self.lock:
+            return [
+                (statement, count)
+                for statement, count in self.selects.most_common()
+                if count >= N_PLUS_ONE_THRESHOLD
+            ]
+    
+    def hold(self) -> None:
+        with self.lock:
+            self.holds += 1
+    
+    def release(self) -> None:
+        with self.lock:
+            self.holds -= 1
+            
+            if self.holds > 0 or self.finished:
+                return
+            
+            self.finished = True
+        
+        self.log()
+    
+    def as_dict(self) -> dict[str, Any]:
+        n_plus_one = self.n_plus_one()
+        
+        with self.lock:
+            return {
+                "action": self.name,
+                "statements": self.statements,
+                "db_ms": round(self.db_time * 1000, 3),
+                "wall_ms": round((perf_counter() - self.started) * 1000, 3),
+                "slowest": [
+                    {"ms": round(seconds * 1000, 3), "sql": " ".join(statement.split())}
+                    for seconds, statement in sorted(self.slowest, reverse=True)
+                ],
+                "n_plus_one": [
+                    {"count": count, "sql": " ".join(statement.split())}
+                    for statement, count in n_plus_one
+                ]
+            }
+    
+    def log(self) -> None:
+        record = self.as_dict()
+        logger.log(WARNING if record["n_plus_one"] else INFO, dumps(record))
+
+current_action: ContextVar[Optional[ActionStats]] = ContextVar("current_action", default=None)
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if current_action.get() is not None:
+        conn.info.setdefault("marites_started", []).append(perf_counter())
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if (action := current_action.get()) is not None and conn.info.get("marites_started"):
+        action.record(statement, perf_counter() - conn.info["marites_started"].pop(), executemany)
+
+def instrument(engine: Engine) -> None:
+    """
+    Function to record the statements of `engine` into the current action.
+    Statements executed outside of an action cost one context variable lookup.
+    """
+    if not event.contains(engine, "before_cursor_execute", before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", after_cursor_execute)
+
+@contextmanager
+def action(name: str) -> Iterator[ActionStats]:
+    """
+    Function to record the statements executed within the block as the action
+    `name`. Within a running action, the block joins it instead.
+    """
+    if (running := current_action.get()) is not None:
+        yield running
+        return
+    
+    stats = ActionStats(name)
+    token = current_action.set(stats)
+    
+    try:
+        yield stats
+    
+    finally:
+        current_action.reset(token)
+        stats.release()
+
+def instrumented(fn: F) -> F:
+    """
+    Function to decorate a controller method so that each call is an action
+    named after the method, e.g. `RoomListController.open_room_pressed`.
+    """
+    @wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with action(fn.__qualname__):
+            return fn(*args, **kwargs)
+    
+    return wrapper  # type: ignore[return-value]
+
+@contextmanager
+def query_budget(budget: int, name: str = "query budget") -> Iterator[ActionStats]:
+    """
+    Function to fail with `QueryBudgetExceeded` when the block executes more
+    than `budget` statements, or repeats a SELECT as in an N+1 pattern.
+    Meant for tests: the block is recorded as its own action, and database
+    calls handed to a `DatabaseExecutor` must have completed when it exits.
+    
+    Args:
+        budget (int): The maximum number of statements.
+        name (str): The action name used in the failure message.
+    """
+    stats = ActionStats(name)
+    token = current_action.set(stats)
+    
+    try:
+        yield stats
+    
+    finally:
+        current_action.reset(token)
+    
+    if stats.statements > budget:
+        raise QueryBudgetExceeded(f"{name} executed {stats.statements} statements, over its budget of {budget}: {stats.as_dict()}")
+    
+    if n_plus_one := stats.n_plus_one():
+        raise QueryBudgetExceeded(f"{name} repeated {len(n_plus_one)} SELECT statement(s) as in an N+1 pattern: {stats.as_dict()}")
+
+def configure_sql_log() -> None:
+    """
+    Function to write the action records of the `marites.sql` logger, one JSON
+    object per line, to the file named by `MARITES_SQL_LOG` ("-" for stderr).
+    """
+    if (path := environ.get(SQL_LOG_VARIABLE)) is None or logger.handlers:
+        return
+    
+    logger.addHandler(StreamHandler() if path == "-" else FileHandler(path))
+    logger.setLevel(INFO)
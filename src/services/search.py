@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+from heapq import nlargest
+from re import compile
+from threading import Lock
+from typing import Iterable
+
+from src.models.projections import TenantRow
+
+SIMILARITY_THRESHOLD = 0.5
+SEARCH_LIMIT = 50
+
+NON_LETTERS = compile(r"[^A-Z0-9Ñ]+")
+
+def normalize(name: str) -> str:
+    return " ".join(NON_LETTERS.sub(" ", name.upper()).split())
+
+def trigrams(name: str) -> frozenset[str]:
+    """
+    Function to get the trigrams of every word of a normalized name, each word
+    padded with two spaces in front and one behind (e.g. "CRUZ" -> "  C", " CR",
+    "CRU", "RUZ", "UZ "), so the start of a word weighs the most.
+    """
+    grams = set()
+    
+    for word in name.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    
+    return frozenset(grams)
+
+class TrigramIndex:
+    """
+    Thread-safe in-memory trigram index over the formatted names of tenants,
+    for typo-tolerant name search.
+    
+    Tenants sharing a name share one entry, so the postings grow with the number
+    of distinct names rather than with the number of tenants. A name matches
+    when it contains at least `threshold` of the trigrams of the query; matches
+    are ranked by that share, then by how closely the whole name matches.
+    """
+    
+    def __init__(self) -> None:
+        self.lock = Lock()
+        
+        self.rows: dict[int, TenantRow] = {}
+        self.tenant_names: dict[int, str] = {}
+        self.names: dict[str, set[int]] = {}
+        self.name_trigrams: dict[str, frozenset[str]] = {}
+        self.postings: defaultdict[str, set[str]] = defaultdict(set)
+    
+    def __len__(self) -> int:
+        return len(self.rows)
+    
+    def add(self, tenant: TenantRow) -> None:
+        """
+        Function to add a tenant, or replace it if it is already indexed.
+        """
+        with self.lock:
+            self.__remove(tenant.tenant_id)
+            self.__add(tenant)
+    
+    def add_all(self, tenants: Iterable[TenantRow]) -> None:
+        with self.lock:
+            for tenant in tenants:
+                self.__remove(tenant.tenant_id)
+                self.__add(tenant)
+    
+    def remove(self, tenant_id: int) -> None:
+        with self.lock:
+            self.__remove(tenant_id)
+    
+    def remove_room(self, room_number: int) -> None:
+        with self.lock:
+            for tenant_id in [row.tenant_id for row in self.rows.values() if row.room_number == room_number]:
+                self.__remove(tenant_id)
+    
+    def search(
+        self,
+        text: str,
+        limit: int = SEARCH_LIMIT,
+        threshold: float = SIMILARITY_THRESHOLD
+    ) -> list[tuple[float, TenantRow]]:
+        """
+        Function to get up to `limit` tenants whose name resembles `text`, best
+        match first, each with its share of matching query trigrams.
+        """
+        if not (query := trigrams(normalize(text))):
+            return []
+        
+        with self.lock:
+            shared: Counter[str] = Counter()
+            
+            for gram in query:
+                shared.update(self.postings.get(gram, ()))
+            
+            ranked = nlargest(
+                limit,
+                (
+                    (
+                        count / len(query),
+                        count / (len(query) + len(self.name_trigrams[name]) - count),
+                        name
+                    )
+                    for name, count in shared.items()
+                    if count / len(query) >= threshold
+                )
+            )
+            
+            matches = []
+            
+            for score, _, name in ranked:
+                for tenant_id in sorted(self.names[name]):
+                    matches.append((score, self.rows[tenant_id]))
+                
+                if len(matches) >= limit:
+                    break
+            
+            return matches[:limit]
+    
+    def __add(self, tenant: TenantRow) -> None:
+        name = normalize(tenant.formatted_name)
+        
+        self.rows[tenant.tenant_id] = tenant
+        self.tenant_names[tenant.tenant_id] = name
+        
+        if name not in self.names:
+            self.names[name] = set()
+            self.name_trigrams[name] = trigrams(name)
+            
+            for gram in self.name_trigrams[name]:
+                self.postings[gram].add(name)
+        
+        self.names[name].add(tenant.tenant_id)
+    
+    def __remove(self, tenant_id: int) -> None:
+        if (name := self.tenant_names.pop(tenant_id, None)) is None:
+            return
+        
+        del self.rows[tenant_id]
+        self.names[name].discard(tenant_id)
+        
+        # Drop names no tenant has anymore
+        if not self.names[name]:
+            del self.names[name]
+            
+            for gram in self.name_trigrams.pop(name):
+                self.postings[gram].discard(name)
+                
+                if not self.postings[gram]:
+                    del self.postings[gram]
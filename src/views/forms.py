@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-from tkinter import BooleanVar, Toplevel, Tk
+from datetime import date
+from tkinter import BooleanVar
 from tkinter.ttk import Combobox, Button, Label, Entry, Checkbutton
-from tkcalendar import DateEntry
 
-import sv_ttk
+from src.views.root import Window
 
-class LoginForm(Tk):
+class LoginForm(Window):
     def __init__(self) -> None:
         super().__init__()
         
@@ -51,15 +51,15 @@ class LoginForm(Tk):
             sticky="nsew", padx=7, pady=(7, 14)
         )
         
-        sv_ttk.set_theme("light", self)
-        
         self.title("Login")
-        self.eval("tk::PlaceWindow . center")
+        self.center()
         self.resizable(False, False)
 
-class RoomForm(Toplevel):
+class RoomForm(Window):
+    modal = True
+    
     def __init__(self, master) -> None:
-        super().__init__(master=master)
+        super().__init__(master)
         
         self.__init_labels()
         self.__init_entries()
@@ -68,6 +68,9 @@ class RoomForm(Toplevel):
         self.__set_layout()
         
         self.grab_set()
+    
+    def reset(self) -> None:
+        self.room_number_entry.configure(state="normal")
         
     def __init_labels(self) -> None:
         self.room_number_label = Label(master=self, text="*Room Number")
@@ -107,9 +110,11 @@ class RoomForm(Toplevel):
         self.title("Add Room")
         self.resizable(False, False)
         
-class TenantForm(Toplevel):
+class TenantForm(Window):
+    modal = True
+    
     def __init__(self, master) -> None:
-        super().__init__(master=master)
+        super().__init__(master)
         
         self.__init_labels()
         self.__init_entries()
@@ -119,6 +124,9 @@ class TenantForm(Toplevel):
         
         self.grab_set()
     
+    def reset(self) -> None:
+        self.birthdate_dateentry.set_date(date.today())
+    
     def __init_labels(self) -> None:
         self.lastname_label = Label(master=self, text="*Last Name")
         self.firstname_label = Label(master=self, text="*First Name")
@@ -127,6 +135,9 @@ class TenantForm(Toplevel):
         self.birthdate_label = Label(master=self, text="*Birth Date")
     
     def __init_entries(self) -> None:
+        # Imported here as tkcalendar loads Babel, which the login form does not need
+        from tkcalendar import DateEntry
+        
         self.lastname_entry = Entry(master=self)
         self.firstname_entry = Entry(master=self)
         self.middlename_entry = Entry(master=self)
@@ -190,9 +201,11 @@ class TenantForm(Toplevel):
         self.title("Add Tenant")
         self.resizable(False, False)
 
-class LeaseForm(Toplevel):
+class LeaseForm(Window):
+    modal = True
+    
     def __init__(self, master) -> None:
-        super().__init__(master=master)
+        super().__init__(master)
         
         self.__init_labels()
         self.__init_entries()
@@ -203,6 +216,16 @@ class LeaseForm(Toplevel):
         
         self.grab_set()
     
+    def reset(self) -> None:
+        self.leaser_combobox.set("")
+        
+        # The validation command of the previous controller is gone, the next sets its own
+        self.rent_entry.configure(validate="none")
+        self.rent_entry.delete(0, "end")
+        
+        self.startdate_entry.set_date(date.today())
+        self.enddate_entry.set_date(date.today())
+    
     def __init_labels(self) -> None:
         self.leaser_label = Label(master=self, text="*Leaser")
         self.startdate_label = Label(master=self, text="*Lease Start Date")
@@ -210,6 +233,8 @@ class LeaseForm(Toplevel):
         self.rent_label = Label(master=self, text="*Monthly Rent Amount")
     
     def __init_entries(self) -> None:
+        from tkcalendar import DateEntry
+        
         self.rent_entry = Entry(master=self)
         
         self.startdate_entry = DateEntry(master=self, date_pattern="yyyy-mm-dd")
@@ -268,9 +293,11 @@ class LeaseForm(Toplevel):
         self.title("Add Lease")
         self.resizable(False, False)
 
-class PaymentForm(Toplevel):
+class PaymentForm(Window):
+    modal = True
+    
     def __init__(self, master) -> None:
-        super().__init__(master=master)
+        super().__init__(master)
         
         self.__init_labels()
         self.__init_entries()
@@ -280,12 +307,18 @@ class PaymentForm(Toplevel):
         self.__set_layout()
         
         self.grab_set()
+    
+    def reset(self) -> None:
+        self.paid_var.set(False)
+        self.payment_date_entry.set_date(date.today())
         
     def __init_labels(self) -> None:
         self.payment_date_label = Label(master=self, text="*Payment Date")
         self.payment_amount_label = Label(master=self, text="*Amount:")
     
     def __init_entries(self) -> None:
+        from tkcalendar import DateEntry
+        
         self.payment_amount_entry = Entry(master=self)
         self.payment_date_entry = DateEntry(master=self, date_pattern="yyyy-mm-dd")
     
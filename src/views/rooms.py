@@ -1,66 +1,435 @@
 from __future__ import annotations
 
-from tkinter import Tk, Event
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable, Optional
+from tkinter import Event
 from tkinter.ttk import Treeview, Style, Button, Label, Entry, Scrollbar, Separator, Frame
 
-import sv_ttk
+from src.views.root import Window
+
+ROW_BLOCK_SIZE = 100
+OVERSCAN_ROWS = 10
+MAX_CACHED_BLOCKS = 50
+HEADING_HEIGHT = 30  # pixels
+
+HOVER_FRAME = 16  # milliseconds
+HOVER_BUTTON_WIDTH = 75  # pixels
+HOVER_BUTTON_MARGIN = 6  # pixels
+
+class HoverActions:
+    """
+    Action buttons shown at the right end of the row under the mouse pointer,
+    which is selected while hovered.
+    
+    Motion events are coalesced per frame: the pointer is only looked up once
+    `HOVER_FRAME` milliseconds after the first of a burst of events, and the
+    buttons are only moved when that lands on another row.
+    
+    Args:
+        tree (Treeview): The Treeview widget.
+        buttons (Button): The buttons, from left to right, children of `tree`.
+    """
+    
+    def __init__(self, tree: Treeview, *buttons: Button) -> None:
+        self.tree = tree
+        self.buttons = buttons
+        
+        self.row = ""  # row the buttons are shown on
+        self.pointer: Optional[tuple[int, int]] = None  # latest position not handled yet
+        self.job: Optional[str] = None
+        
+        self.tree.bind("<Motion>", self.__moved)
+        self.tree.bind("<Leave>", self.__left)
+        self.tree.bind("<Configure>", lambda e: self.refresh(), add="+")
+    
+    def refresh(self) -> None:
+        """
+        Function to place the buttons again even if the row under the pointer
+        did not change, e.g. after the width of the tree did.
+        """
+        x = self.tree.winfo_pointerx() - self.tree.winfo_rootx()
+        y = self.tree.winfo_pointery() - self.tree.winfo_rooty()
+        
+        if 0 <= x < self.tree.winfo_width() and 0 <= y < self.tree.winfo_height():
+            self.row = ""
+            self.__moved_to(x, y)
+    
+    def hide(self) -> None:
+        if self.job is not None:
+            self.tree.after_cancel(self.job)
+            self.job = None
+        
+        self.row = ""
+        self.pointer = None
+        
+        for button in self.buttons:
+            button.place_forget()
+        
+        self.tree.selection_remove(self.tree.selection())
+    
+    def __moved(self, event: Event) -> None:
+        self.__moved_to(event.x, event.y)
+    
+    def __moved_to(self, x: int, y: int) -> None:
+        self.pointer = (x, y)
+        
+        if self.job is None:
+            self.job = self.tree.after(HOVER_FRAME, self.__update)
+    
+    def __left(self, event: Event) -> None:
+        # Moving onto one of the buttons leaves the tree too
+        if self.tree.winfo_containing(event.x_root, event.y_root) in self.buttons:
+            return
+        
+        self.hide()
+    
+    def __update(self) -> None:
+        self.job = None
+        
+        if self.pointer is None:
+            return
+        
+        _, y = self.pointer
+        self.pointer = None
+        
+        if (row := self.tree.identify_row(y)) == self.row:
+            return
+        
+        if not row:
+            self.hide()
+            return
+        
+        try:
+            _, row_y, _, row_height = self.tree.bbox(row)
+        except ValueError:
+            # Not visible, e.g. scrolled away before the frame
+            self.hide()
+            return
+        
+        self.row = row
+        
+        x = self.tree.winfo_width() - HOVER_BUTTON_MARGIN - HOVER_BUTTON_WIDTH * len(self.buttons)
+        
+        for button in self.buttons:
+            button.place(x=x, y=row_y, width=HOVER_BUTTON_WIDTH, height=row_height)
+            x += HOVER_BUTTON_WIDTH
+        
+        self.tree.selection_set(row)
 
 def customization_buttons(
     tree: Treeview, 
     edit_button: Button, 
     delete_button: Button
-) -> None:
+) -> HoverActions:
     """
     Customize the appearance and behavior of buttons associated with a Treeview widget.
 
     Args:
         tree (Treeview): The Treeview widget.
-        edit_button (CTkButton): The button used for editing.
-        delete_button (CTkButton): The button used for deletion.
+        edit_button (Button): The button used for editing.
+        delete_button (Button): The button used for deletion.
+    """
+    return HoverActions(tree, edit_button, delete_button)
+
+def set_loading(tree: Treeview, loading: bool) -> None:
+    """
+    Show or clear the loading state of a Treeview while its rows are being fetched.
+
+    Args:
+        tree (Treeview): The Treeview widget.
+        loading (bool): Whether the rows are being fetched.
+    """
+    tree.configure(cursor="watch" if loading else "")
+    tree.state(("disabled",) if loading else ("!disabled",))
+
+def reconcile(tree: Treeview, items: Iterable[tuple[str, tuple]]) -> None:
     """
+    Update the rows of a Treeview to the given items with as few changes as
+    possible, so the scroll position and selection survive a refresh.
     
-    def show_buttons(event: Event):
-        # Get the row index under the mouse cursor
-        row = tree.identify_row(event.y)
-        
-        # If a row is under the cursor
-        if row:
-            # Calculate the position for the buttons
-            try:
-                x, y, w, h = tree.bbox(row)  # Adjust x-coordinate as needed
-            except ValueError:
-                return
-            
-            # Show buttons
-            edit_button.place(x=tree.winfo_width() - 156, y=int(y), width=75, height=int(h))
-            delete_button.place(x=tree.winfo_width() - 81, y=int(y), width=75, height=int(h))
-            
-            
-            # # Set button sizes
-            # edit_button.configure(width=50)
-            # delete_button.configure(width=50)
+    Rows are matched by item id: rows missing from `items` are removed, new ones
+    inserted, changed values updated and rows out of order moved in place.
+    An item id given more than once is only shown at its first position.
+
+    Args:
+        tree (Treeview): The Treeview widget.
+        items (Iterable[tuple[str, tuple]]): The item id and values of every row, in order.
+    """
+    unique: dict[str, tuple] = {}
+    
+    for iid, values in items:
+        unique.setdefault(str(iid), values)
+    
+    items = list(unique.items())
+    wanted = set(unique)
+    
+    if stale := [iid for iid in tree.get_children() if iid not in wanted]:
+        tree.delete(*stale)
+    
+    order = list(tree.get_children())
+    existing = set(order)
+    
+    for index, (iid, values) in enumerate(items):
+        if iid not in existing:
+            tree.insert("", index, iid, values=values)
+            order.insert(index, iid)
+            continue
+        
+        # Tk hands values back as strings or numbers, so compare their text
+        if tuple(map(str, tree.item(iid, "values"))) != tuple(map(str, values)):
+            tree.item(iid, values=values)
+        
+        if order[index] != iid:
+            tree.move(iid, "", index)
+            order.remove(iid)
+            order.insert(index, iid)
+
+class VirtualScroller:
+    """
+    Virtual scrolling for a Treeview over a large number of rows.
+    
+    Only the visible rows, plus `overscan` rows above and below, exist as real
+    Treeview items; the scrollbar is driven by the position among all `total`
+    rows instead of by the Treeview. Rows are fetched on demand in blocks of
+    `block_size` through `fetch(offset, limit, after)`, where `after` is the row
+    preceding the block when known (for keyset pagination), and handed back with
+    `set_rows`. Only the most recently used `max_blocks` blocks are kept.
+    
+    `invalidate` refetches the shown rows while keeping the scroll position;
+    the outdated rows stay on screen until their replacements arrive.
+    `update_rows` swaps in a few changed rows without refetching anything.
+    
+    The hover buttons of `customization_buttons` are moved to the row under the
+    pointer again after every scroll.
+    """
+    
+    def __init__(
+        self,
+        tree: Treeview,
+        scrollbar: Scrollbar,
+        fetch: Callable[[int, int, Optional[Any]], None],
+        render: Callable[[Any], tuple[str, tuple]],
+        block_size: int = ROW_BLOCK_SIZE,
+        overscan: int = OVERSCAN_ROWS,
+        max_blocks: int = MAX_CACHED_BLOCKS
+    ) -> None:
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.fetch = fetch
+        self.render = render
+        self.block_size = block_size
+        self.overscan = overscan
+        self.max_blocks = max_blocks
+        
+        self.blocks: OrderedDict[int, list[Any]] = OrderedDict()
+        self.stale_blocks: dict[int, list[Any]] = {}
+        self.pending: set[int] = set()
+        self.generation = 0
+        self.total = 0
+        self.first = 0
+        self.rendered: tuple[int, int] = (0, 0)
+        self.complete = False
+        
+        self.scrollbar.configure(command=self.yview)
+        self.tree.configure(yscrollcommand="")
+        
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1))
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-1))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(1))
+        self.tree.bind("<Configure>", lambda e: self.refresh(), add="+")
+    
+    def reset(self, total: int, rows: Optional[list[Any]] = None) -> None:
+        """
+        Function to drop every fetched row, e.g. for a new search or sort order,
+        and scroll back to the top of `total` rows. `rows` may hold the first
+        block, when it was fetched along with the total.
+        """
+        self.blocks.clear()
+        self.stale_blocks.clear()
+        self.pending.clear()
+        self.generation += 1
+        self.total = total
+        self.first = 0
+        
+        if rows is not None:
+            self.blocks[0] = rows
+        
+        self.refresh(force=True)
+    
+    def invalidate(self, total: int) -> None:
+        """
+        Function to refetch the rows after they changed, e.g. after a write,
+        keeping the scroll position among the now `total` rows.
+        """
+        self.stale_blocks = dict(self.blocks)
+        self.blocks.clear()
+        self.pending.clear()
+        self.generation += 1
+        self.total = total
+        self.first = min(self.first, max(total - self.visible_rows(), 0))
+        
+        self.refresh(force=True)
+    
+    def set_rows(self, offset: int, rows: list[Any], generation: int) -> None:
+        """
+        Function to store a fetched block. Blocks fetched before the last `reset`
+        are dropped, as their `generation` is outdated.
+        """
+        if generation != self.generation:
+            return
+        
+        block = offset // self.block_size
+        
+        self.pending.discard(block)
+        self.stale_blocks.pop(block, None)
+        self.blocks[block] = rows
+        self.blocks.move_to_end(block)
+        
+        while len(self.blocks) > self.max_blocks:
+            self.blocks.popitem(last=False)
+        
+        start, end = self.rendered
+        
+        if offset < end and offset + len(rows) > start:
+            self.refresh(force=True)
+    
+    def update_rows(self, rows: Iterable[Any], key: Callable[[Any], Hashable]) -> None:
+        """
+        Function to replace the fetched rows that have a changed version in
+        `rows`, matched by `key`, when their position is unchanged. Rows not
+        fetched yet are left to be fetched when they are shown.
+        """
+        changed = {key(row): row for row in rows}
+        start, end = self.rendered
+        shown = False
+        
+        for blocks in (self.blocks, self.stale_blocks):
+            for block, block_rows in blocks.items():
+                for i, row in enumerate(block_rows):
+                    if (new := changed.get(key(row))) is not None:
+                        block_rows[i] = new
+                        shown = shown or start <= block * self.block_size + i < end
+        
+        if shown:
+            self.refresh(force=True)
+    
+    def fetch_failed(self, offset: int, generation: int) -> None:
+        if generation == self.generation:
+            self.pending.discard(offset // self.block_size)
+    
+    def row(self, index: int, stale: bool = False) -> Optional[Any]:
+        """
+        Function to get the fetched row at `index`, or with `stale` set, its
+        outdated version while the row is being refetched.
+        """
+        block = self.blocks.get(index // self.block_size)
+        
+        if block is None and stale:
+            block = self.stale_blocks.get(index // self.block_size)
+        
+        if block is None or index % self.block_size >= len(block):
+            return None
+        
+        return block[index % self.block_size]
+    
+    def visible_rows(self) -> int:
+        # Before the first layout the Treeview is 1 pixel high
+        if self.tree.winfo_height() <= 1:
+            return int(self.tree.cget("height"))
+        
+        row_height = int(Style(self.tree).lookup("Treeview", "rowheight") or 20)
+        
+        return max((self.tree.winfo_height() - HEADING_HEIGHT) // row_height, 1)
+    
+    def yview(self, *args: str) -> None:
+        if args[0] == "moveto":
+            self.scroll_to(round(float(args[1]) * self.total))
+        elif args[0] == "scroll":
+            step = self.visible_rows() if args[2].startswith("page") else 1
+            self.scroll_to(self.first + int(args[1]) * step)
+    
+    def scroll(self, units: int) -> str:
+        self.scroll_to(self.first + units)
+        
+        # Keep the Treeview from scrolling its own few items
+        return "break"
+    
+    def scroll_to(self, first: int) -> None:
+        first = min(max(first, 0), max(self.total - self.visible_rows(), 0))
+        
+        if first != self.first:
+            self.first = first
+            self.refresh()
+    
+    def refresh(self, force: bool = False) -> None:
+        """
+        Function to show the rows from `first` on. The Treeview items are only
+        rebuilt when the visible rows leave the rendered overscan window or
+        when `force` is set, e.g. once missing rows have been fetched.
+        """
+        visible = self.visible_rows()
+        start, end = self.rendered
+        last = min(self.first + visible, self.total)
+        
+        if force or not self.complete or self.first < start or last > end:
+            self.__render(
+                max(self.first - self.overscan, 0),
+                min(self.first + visible + self.overscan, self.total)
+            )
+        
+        start, end = self.rendered
+        
+        if end > start:
+            self.tree.yview_moveto((self.first - start) / (end - start))
+        
+        self.scrollbar.set(
+            self.first / self.total if self.total else 0.0,
+            last / self.total if self.total else 1.0
+        )
+        
+        self.__refresh_hover()
+    
+    def __render(self, start: int, end: int) -> None:
+        items: list[Optional[tuple[str, tuple]]] = []
+        missing: set[int] = set()
+        
+        for index in range(start, end):
+            if (row := self.row(index)) is None:
+                missing.add(index // self.block_size)
             
-            tree.selection_set(row)
+            items.append(self.render(row) if row is not None else None)
         
-        else:
-            hide_buttons(event)
+        fresh = {item[0] for item in items if item is not None}
+        
+        for i, index in enumerate(range(start, end)):
+            if items[i] is not None:
+                continue
+            
+            # An outdated row that moved into a fresh block, e.g. past an added
+            # or deleted room, is shown there already
+            if (row := self.row(index, stale=True)) is not None and (item := self.render(row))[0] not in fresh:
+                items[i] = item
+            else:
+                items[i] = (f"pending_{index}", ("Loading...", ""))
+        
+        # Rows still shown after scrolling are kept, along with their selection
+        reconcile(self.tree, items)
+        
+        self.rendered = (start, end)
+        self.complete = not missing
+        
+        for block in sorted(missing - self.pending):
+            self.pending.add(block)
+            self.fetch(block * self.block_size, self.block_size, self.row(block * self.block_size - 1))
     
-    def hide_buttons(event: Event):
-        # Check if the mouse pointer is over the buttons
-        if edit_button.winfo_containing(event.x_root, event.y_root) is edit_button or \
-            delete_button.winfo_containing(event.x_root, event.y_root) is delete_button:
-            return  # Do nothing if the mouse is over the buttons
+    def __refresh_hover(self) -> None:
+        x = self.tree.winfo_pointerx() - self.tree.winfo_rootx()
+        y = self.tree.winfo_pointery() - self.tree.winfo_rooty()
         
-        # Hide buttons
-        edit_button.place_forget()
-        delete_button.place_forget()
-        tree.selection_remove(tree.selection())
-
-    # Bind events
-    tree.bind("<Motion>", show_buttons)  # Show buttons on mouse hover
-    tree.bind("<Leave>", hide_buttons)
+        if 0 <= x < self.tree.winfo_width() and 0 <= y < self.tree.winfo_height():
+            self.tree.event_generate("<Motion>", x=x, y=y)
 
-class RoomListWindow(Tk):
+class RoomListWindow(Window):
     def __init__(self) -> None:
         super().__init__()
         
@@ -98,6 +467,7 @@ class RoomListWindow(Tk):
     
     def __init_buttons(self) -> None:
         self.add_room_button = Button(master=self, text="Add Room", style="Accent.TButton")
+        self.search_tenants_button = Button(master=self, text="Search Tenants")
         self.open_room_button = Button(master=self.rooms_treeview, text="Open")
         self.delete_room_button = Button(master=self.rooms_treeview, text="Delete", style="Accent.TButton")
     
@@ -118,6 +488,10 @@ class RoomListWindow(Tk):
             row=4, column=0, rowspan=1, columnspan=5,
             sticky="e", padx=(14, 7), pady=(7, 7)
         )
+        self.search_tenants_button.grid(
+            row=4, column=0, rowspan=1, columnspan=2,
+            sticky="w", padx=(7, 0), pady=(7, 7)
+        )
         
         self.rooms_treeview.grid(
             row=1, column=0, rowspan=3, columnspan=4,
@@ -128,24 +502,17 @@ class RoomListWindow(Tk):
             sticky="nsew", padx=(0, 7), pady=(7, 7)
         )
         
-        customization_buttons(self.rooms_treeview, self.open_room_button, self.delete_room_button)
+        self.rooms_hover = customization_buttons(self.rooms_treeview, self.open_room_button, self.delete_room_button)
         
         self.rooms_treeview.configure(yscrollcommand=self.rooms_scrollbar.set)
         self.rooms_treeview.column(0, width=125, stretch=False)
         self.rooms_treeview.column(1, width=350, stretch=False)
-
-        sv_ttk.set_theme("light", self)
-        
-        style = Style(self)
-        
-        style.configure("Treeview", rowheight=30)
-        style.configure("Treeview.Heading", padding=(5, 0, 0, 0))
         
         self.title("MARITES")
-        self.eval("tk::PlaceWindow . center")
+        self.center()
         self.resizable(False, False)
 
-class RoomOpenWindow(Tk):
+class RoomOpenWindow(Window):
     def __init__(self) -> None:
         super().__init__()
         
@@ -158,6 +525,16 @@ class RoomOpenWindow(Tk):
         
         self.__set_layout()
     
+    def reset(self) -> None:
+        for tree, hover in (
+            (self.tenants_treeview, self.tenants_hover),
+            (self.payments_treeview, self.payments_hover)
+        ):
+            hover.hide()
+            
+            tree.delete(*tree.get_children())
+            tree.yview_moveto(0)
+    
     def __init_frames(self) -> None:
         self.room_tenant_frame = Frame(master=self)
         self.lease_payment_frame = Frame(master=self)
@@ -322,24 +699,17 @@ class RoomOpenWindow(Tk):
         self.tenants_treeview.configure(yscrollcommand=self.tenants_scrollbar.set)
         self.payments_treeview.configure(yscrollcommand=self.payments_scrollbar.set)
         
-        customization_buttons(self.tenants_treeview, self.edit_tenant_button, self.delete_tenant_button)
-        customization_buttons(self.payments_treeview, self.edit_payment_button, self.delete_payment_button)        
+        self.tenants_hover = customization_buttons(self.tenants_treeview, self.edit_tenant_button, self.delete_tenant_button)
+        self.payments_hover = customization_buttons(self.payments_treeview, self.edit_payment_button, self.delete_payment_button)
 
         for col, width in enumerate((245, 107, 240)):
             self.tenants_treeview.column(col, width=width, stretch=False)
             
         for col, width in enumerate((120, 230, 250)):
             self.payments_treeview.column(col, width=width, stretch=False)
-
-        sv_ttk.set_theme("light", self)
-        
-        style = Style(self)
         
-        style.configure("Treeview", rowheight=30)
-        style.configure("Treeview.Heading", padding=(5, 0, 0, 0))
-
         self.title("Room [Number]")
-        self.eval("tk::PlaceWindow . center")
+        self.center()
         self.resizable(False, False)
    
 def main() -> None:
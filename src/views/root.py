@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Iterator, Optional, TypeVar
+from tkinter import Misc, Tk, Toplevel
+from tkinter.ttk import Style
+
+import sv_ttk
+
+# Hidden windows kept for reuse per window class
+POOLED_WINDOWS = 2
+
+# Widgets whose callbacks the pool may delete; others, like tkcalendar's, manage their own
+POOLED_MODULES = ("tkinter", "tkinter.ttk")
+
+root: Optional[Tk] = None
+
+def get_root() -> Tk:
+    """
+    Function to get the one Tk root of the application, creating it hidden and
+    themed on the first call. Every window is a `Toplevel` of this root, so the
+    application runs a single Tcl interpreter and loads the theme only once.
+    """
+    global root
+    
+    if root is None:
+        root = Tk()
+        root.withdraw()
+        
+        apply_theme(root)
+    
+    return root
+
+def apply_theme(master: Tk) -> None:
+    sv_ttk.set_theme("light", master)
+    
+    style = Style(master)
+    
+    style.configure("Treeview", rowheight=30)
+    style.configure("Treeview.Heading", padding=(5, 0, 0, 0))
+
+class Window(Toplevel):
+    """
+    Top-level window of the application. The hidden root, and with it the
+    main loop, is destroyed together with the last window not kept by the
+    `window_pool`.
+    
+    Args:
+        parent (Optional[Misc]): The window this one stays on top of.
+    """
+    
+    # Whether the window grabs the input, so the pool grabs it again when reused
+    modal = False
+    
+    def __init__(self, parent: Optional[Misc] = None) -> None:
+        super().__init__(master=get_root())
+        
+        self.pooled = False
+        
+        if parent is not None:
+            self.transient(parent)
+    
+    def reset(self) -> None:
+        """
+        Function to clear what the previous controller left in the window
+        before the `window_pool` hands it out again. Values bound to a
+        controller variable are reset when the next controller binds its own.
+        """
+    
+    def destroy(self) -> None:
+        master = self.master
+        
+        window_pool.discard(self)
+        super().destroy()
+        
+        destroy_unused_root(master)
+    
+    def center(self) -> None:
+        self.eval(f"tk::PlaceWindow {self} center")
+
+W = TypeVar("W", bound=Window)
+
+def destroy_unused_root(master: Misc) -> None:
+    """
+    Function to destroy the hidden root, and with it the main loop, once every
+    window is either destroyed or kept hidden by the `window_pool`.
+    """
+    global root
+    
+    if master is root and not any(
+        isinstance(child, Window) and not child.pooled
+        for child in master.children.values()
+    ):
+        root = None
+        master.destroy()
+
+def widgets(window: Window) -> Iterator[Misc]:
+    stack: list[Misc] = [window]
+    
+    while stack:
+        widget = stack.pop()
+        yield widget
+        
+        if widget is window or type(widget).__module__ in POOLED_MODULES:
+            stack.extend(widget.children.values())
+
+def own_commands(widget: Misc) -> list[str]:
+    return list(widget._tclCommands or ())  # type: ignore[attr-defined]
+
+class WindowPool:
+    """
+    Hides closed windows for reuse instead of destroying them, since building
+    a window, its date entries above all, is what makes opening it slow.
+    
+    A released window is withdrawn and the callbacks bound to it since it was
+    built are deleted, so it no longer references the controller that had it.
+    Before it is shown again it is reset, and the next controller binds its own
+    callbacks as it would on a new window.
+    """
+    
+    def __init__(self, size: int = POOLED_WINDOWS) -> None:
+        self.size = size
+        
+        self.idle: defaultdict[type[Window], list[Window]] = defaultdict(list)
+        self.parents: dict[Window, Optional[Misc]] = {}
+        
+        # Callbacks registered while the window was built, which survive a release
+        self.built_commands: dict[Window, dict[str, set[str]]] = {}
+    
+    def acquire(self, window_class: type[W], parent: Optional[Misc] = None) -> W:
+        """
+        Function to get a shown window of `window_class`, a pooled one if any.
+        """
+        if idle := self.idle[window_class]:
+            window = idle.pop()
+            window.reset()
+            window.pooled = False
+            
+            if parent is not None:
+                window.transient(parent)
+            
+            window.deiconify()
+            
+            if window.modal:
+                window.grab_set()
+        
+        else:
+            window = window_class() if parent is None else window_class(parent)
+            
+            self.built_commands[window] = {
+                str(widget): set(own_commands(widget))
+                for widget in widgets(window)
+            }
+        
+        self.parents[window] = parent
+        
+        return window  # type: ignore[return-value]
+    
+    def release(self, window: Window) -> None:
+        """
+        Function to hide `window` for reuse, or destroy it if the pool of its
+        class is full or it was not acquired from the pool.
+        """
+        if window.pooled:
+            return
+        
+        if window not in self.built_commands or len(self.idle[type(window)]) >= self.size:
+            window.destroy()
+            return
+        
+        if window.modal:
+            window.grab_release()
+        
+        window.withdraw()
+        
+        # Run the pending idle callbacks, e.g. scroll updates, while they still exist
+        window.update_idletasks()
+        
+        built_commands = self.built_commands[window]
+        stale_commands = {
+            (widget, name)
+            for widget in widgets(window)
+            for name in own_commands(widget)
+            if name not in built_commands.get(str(widget), ())
+        }
+        
+        # Cancel the timers that would call a deleted command, e.g. a pending hover update
+        stale_names = {name for _, name in stale_commands}
+        
+        for job in window.tk.splitlist(window.tk.call("after", "info")):
+            if window.tk.splitlist(window.tk.call("after", "info", job))[0] in stale_names:
+                window.tk.call("after", "cancel", job)
+        
+        for widget, name in stale_commands:
+            widget.deletecommand(name)
+        
+        window.pooled = True
+        
+        self.parents.pop(window, None)
+        self.idle[type(window)].append(window)
+        
+        # Hiding the last window ends the application, as destroying it would
+        destroy_unused_root(window.master)
+    
+    def release_children(self, parent: Misc) -> None:
+        """
+        Function to release the windows shown on top of `parent`, which used
+        to be destroyed along with it.
+        """
+        for window in [window for window, window_parent in self.parents.items() if window_parent is parent]:
+            self.release(window)
+    
+    def discard(self, window: Window) -> None:
+        self.parents.pop(window, None)
+        self.built_commands.pop(window, None)
+        
+        if window in self.idle[type(window)]:
+            self.idle[type(window)].remove(window)
+
+window_pool = WindowPool()
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from tkinter.ttk import Treeview, Button, Label, Entry, Scrollbar
+
+from src.views.root import Window
+
+class TenantSearchWindow(Window):
+    def __init__(self) -> None:
+        super().__init__()
+        
+        self.__init_entries()
+        self.__init_labels()
+        self.__init_treeviews()
+        self.__init_scrollbars()
+        self.__init_buttons()
+        
+        self.__set_layout()
+    
+    def reset(self) -> None:
+        self.tenants_treeview.delete(*self.tenants_treeview.get_children())
+        self.tenants_treeview.yview_moveto(0)
+    
+    def __init_entries(self) -> None:
+        self.search_tenant_entry = Entry(master=self, width=30)
+    
+    def __init_labels(self) -> None:
+        self.search_tenant_label = Label(master=self, text="Name or Contact Number: ")
+        self.hint_label = Label(master=self, text="e.g. SANTOS, SANTOS, JU or 09171234567")
+    
+    def __init_treeviews(self) -> None:
+        self.tenants_treeview = Treeview(
+            master=self,
+            columns=("tenant_name", "contact_number", "room_number"),
+            show="headings",
+            selectmode="browse"
+        )
+        
+        self.tenants_treeview.heading(column="tenant_name", text="Tenant Name", anchor="w")
+        self.tenants_treeview.heading(column="contact_number", text="Contact Number", anchor="w")
+        self.tenants_treeview.heading(column="room_number", text="Room", anchor="w")
+    
+    def __init_scrollbars(self) -> None:
+        self.tenants_scrollbar = Scrollbar(
+            self,
+            orient="vertical",
+            command=self.tenants_treeview.yview
+        )
+    
+    def __init_buttons(self) -> None:
+        self.open_room_button = Button(master=self, text="Open Room", style="Accent.TButton")
+    
+    def __set_layout(self) -> None:
+        self.search_tenant_label.grid(
+            row=0, column=0, rowspan=1, columnspan=1,
+            sticky="w", padx=(7, 0), pady=(7, 0)
+        )
+        self.search_tenant_entry.grid(
+            row=0, column=1, rowspan=1, columnspan=1,
+            sticky="w", padx=(0, 7), pady=(7, 0)
+        )
+        self.hint_label.grid(
+            row=1, column=1, rowspan=1, columnspan=1,
+            sticky="w", padx=(0, 7), pady=(0, 7)
+        )
+        
+        self.tenants_treeview.grid(
+            row=2, column=0, rowspan=1, columnspan=2,
+            sticky="nsew", padx=(7, 0), pady=(0, 7)
+        )
+        self.tenants_scrollbar.grid(
+            row=2, column=2, rowspan=1, columnspan=1,
+            sticky="nsew", padx=(0, 7), pady=(0, 7)
+        )
+        
+        self.open_room_button.grid(
+            row=3, column=0, rowspan=1, columnspan=3,
+            sticky="e", padx=7, pady=(0, 7)
+        )
+        
+        self.tenants_treeview.configure(yscrollcommand=self.tenants_scrollbar.set)
+        
+        for col, width in enumerate((300, 130, 100)):
+            self.tenants_treeview.column(col, width=width, stretch=False)
+        
+        self.title("Search Tenants")
+        self.center()
+        self.resizable(False, False)
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from typing import Iterator
+
+import pytest
+
+from src.managers.manager import BoardingHouseManager
+from src.models.base import Base
+from src.models.entities import Room, Tenant, Lease, Payment
+from src.services.service import get_engine, dispose_engines, sessionmaker
+
+@pytest.fixture
+def manager() -> Iterator[BoardingHouseManager]:
+    """
+    A manager on an empty in-memory SQLite database, dropped after the test.
+    """
+    engine = get_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    
+    yield BoardingHouseManager(sessionmaker(bind=engine, expire_on_commit=False))
+    
+    dispose_engines()
+
+def add_leased_room(
+    manager: BoardingHouseManager,
+    room_number: int = 101,
+    tenants: int = 3,
+    payments: int = 4
+) -> Room:
+    """
+    Function to add a room with `tenants` tenants, a lease held by the first
+    of them and `payments` payments.
+    """
+    room = manager.add_room(Room(room_number=room_number, max_capacity=tenants + 1))
+    
+    leaser, *_ = [
+        manager.add_tenant(Tenant(
+            last_name=f"Tenant{i}",
+            first_name="Test",
+            birth_date=date(2000, 1, 1),
+            contact_number=f"0912345678{i}",
+            room_number=room_number
+        ))
+        for i in range(tenants)
+    ]
+    
+    manager.add_lease(Lease(
+        leaser_id=leaser.tenant_id,
+        room_number=room_number,
+        lease_start=date(2024, 1, 1),
+        lease_end=date(2025, 1, 1),
+        monthly_rent_amount=Decimal("5000.00")
+    ))
+    
+    for month in range(1, payments + 1):
+        manager.add_payment(Payment(
+            room_number=room_number,
+            leaser_id=leaser.tenant_id,
+            payment_amount=Decimal("5000.00"),
+            payment_date=date(2024, month, 1),
+            paid=True
+        ))
+    
+    return room
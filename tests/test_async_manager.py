@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+
+from datetime import date
+from typing import Awaitable, Callable
+
+from src.managers.async_manager import AsyncBoardingHouseManager
+from src.models.base import Base
+from src.models.entities import Room, Tenant
+from src.models.projections import RoomRow
+from src.services.service import get_async_engine, dispose_engines, dispose_async_engines, async_engines, async_sessionmaker
+from src.services.instrumentation import query_budget
+
+def run(test: Callable[[AsyncBoardingHouseManager], Awaitable[None]]) -> None:
+    """
+    Function to run `test` with an async manager on an empty in-memory
+    SQLite database, on an event loop of its own.
+    """
+    async def main() -> None:
+        engine = get_async_engine("sqlite+aiosqlite://")
+        
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        
+        try:
+            await test(AsyncBoardingHouseManager(async_sessionmaker(bind=engine, expire_on_commit=False)))
+        finally:
+            await dispose_async_engines()
+    
+    asyncio.run(main())
+
+def test_add_and_get_room() -> None:
+    async def test(manager: AsyncBoardingHouseManager) -> None:
+        await manager.add_room(Room(room_number=101, max_capacity=4))
+        
+        room = await manager.get_room(101)
+        
+        assert room is not None
+        assert room.max_capacity == 4
+        assert await manager.get_room(102) is None
+    
+    run(test)
+
+def test_concurrent_bulk_inserts_and_pages() -> None:
+    async def test(manager: AsyncBoardingHouseManager) -> None:
+        counts = await asyncio.gather(
+            manager.bulk_add_rooms({"room_number": number, "max_capacity": 2} for number in range(100, 150)),
+            manager.bulk_add_rooms({"room_number": number, "max_capacity": 2} for number in range(150, 200))
+        )
+        
+        assert counts == [50, 50]
+        assert await manager.count_rooms() == 100
+        assert await manager.count_rooms("12") == 10
+        
+        page = await manager.get_rooms_page(limit=3)
+        
+        assert page == [RoomRow(100, 0, 2), RoomRow(101, 0, 2), RoomRow(102, 0, 2)]
+        assert (await manager.get_rooms_page(after=page[-1], limit=1))[0].room_number == 103
+    
+    run(test)
+
+def test_get_room_detail_loads_the_tenants() -> None:
+    async def test(manager: AsyncBoardingHouseManager) -> None:
+        await manager.add_room(Room(room_number=101, max_capacity=4))
+        await manager.add_tenant(Tenant(
+            last_name="Santos",
+            first_name="Juan",
+            birth_date=date(2000, 1, 1),
+            contact_number="09123456780",
+            room_number=101
+        ))
+        
+        room = await manager.get_room_detail(101)
+        
+        # The relationships of the detached room are read without a query
+        with query_budget(0):
+            assert [tenant.contact_number for tenant in room.tenants] == ["09123456780"]
+            assert room.payments == []
+    
+    run(test)
+
+def test_writes_are_logged_as_changes() -> None:
+    async def test(manager: AsyncBoardingHouseManager) -> None:
+        start = await manager.latest_change_id()
+        room = await manager.add_room(Room(room_number=101, max_capacity=4))
+        
+        await manager.delete_room(room)
+        
+        changes = await manager.get_changes(start)
+        
+        assert [(change.room_number, change.action) for change in changes] == [(101, "INSERT"), (101, "DELETE")]
+    
+    run(test)
+
+def test_engines_are_disposed() -> None:
+    async def test(manager: AsyncBoardingHouseManager) -> None:
+        assert async_engines
+    
+    run(test)
+    
+    assert not async_engines
+
+def test_dispose_engines_disposes_the_async_engines() -> None:
+    engine = get_async_engine("sqlite+aiosqlite://")
+    
+    async def connect() -> None:
+        async with engine.connect():
+            pass
+    
+    asyncio.run(connect())
+    dispose_engines()
+    
+    assert not async_engines
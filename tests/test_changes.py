@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from src.models.projections import ChangeRow
+from src.services.changes import ChangeFeed, MAX_MISSING_PER_POLL
+
+def change(change_id: int) -> ChangeRow:
+    return ChangeRow(change_id, "rooms", 101, 101, "UPDATE")
+
+def test_changes_are_handed_out_once() -> None:
+    feed = ChangeFeed(0)
+    
+    assert feed.advance([change(1), change(2)], now=0.0) == [change(1), change(2)]
+    assert feed.advance([change(2), change(3)], now=1.0) == [change(3)]
+    assert feed.cursor == 3
+
+def test_late_change_fills_its_gap() -> None:
+    feed = ChangeFeed(0, gap_timeout=10.0)
+    
+    feed.advance([change(1), change(3)], now=0.0)
+    
+    assert feed.pending() == (3, [2])
+    assert feed.advance([change(2)], now=5.0) == [change(2)]
+    assert feed.pending() == (3, [])
+    assert feed.cursor == 3
+
+def test_gaps_expire_without_a_successful_poll() -> None:
+    feed = ChangeFeed(0, gap_timeout=10.0)
+    
+    feed.advance([change(1), change(3)], now=0.0)
+    feed.expire(now=9.0)
+    
+    assert feed.cursor == 1
+    
+    feed.expire(now=10.0)
+    
+    assert feed.cursor == 3
+    assert feed.pending() == (3, [])
+
+def test_missing_ids_per_poll_are_capped() -> None:
+    feed = ChangeFeed(0)
+    
+    feed.advance([change(MAX_MISSING_PER_POLL * 3)], now=0.0)
+    after, missing = feed.pending()
+    
+    assert after == MAX_MISSING_PER_POLL * 3
+    assert missing == list(range(1, MAX_MISSING_PER_POLL + 1))
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from datetime import date
+from types import SimpleNamespace
+
+from src.controllers.controller import RoomOpenController
+from src.managers.manager import BoardingHouseManager
+from src.models.entities import Room, Tenant
+from src.services.events import TenantAdded, TenantUpdated
+
+def tenant(i: int) -> Tenant:
+    return Tenant(
+        last_name=f"Tenant{i}",
+        first_name="Test",
+        birth_date=date(2000, 1, 1),
+        contact_number=f"0912345678{i}",
+        room_number=101
+    )
+
+def test_editing_an_open_room_keeps_the_tenant_count(manager: BoardingHouseManager) -> None:
+    manager.add_room(Room(room_number=101, max_capacity=3))
+    
+    # The open room, with the tenant events of this desk patched in
+    room = manager.get_room_with_lease(101)
+    controller = SimpleNamespace(room=room, tenant_rows=[], load_room=lambda: None, load_tenants=lambda: None)
+    manager.events.subscribe(lambda event: RoomOpenController.tenant_changed(controller, event), TenantAdded, TenantUpdated)
+    
+    # Another desk adds a tenant, then this desk does
+    BoardingHouseManager(manager.session_factory).add_tenant(tenant(0))
+    manager.add_tenant(tenant(1))
+    
+    assert room.tenant_count == 1
+    
+    room.max_capacity = 4
+    manager.update_room(room)
+    manager.clear_cache()
+    
+    assert manager.get_room(101).tenant_count == 2
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import logging
+
+from concurrent.futures import wait
+from typing import Any, Callable
+
+import pytest
+
+from src.services.events import EventBus, RoomAdded, RoomDeleted
+from src.services.executor import DatabaseExecutor
+
+class FakeWidget:
+    """
+    Stands in for the Tk widget of a `DatabaseExecutor`, running its `after`
+    jobs only when told to.
+    """
+    
+    def __init__(self) -> None:
+        self.jobs: list[Callable[[], None]] = []
+        self.errors: list[BaseException] = []
+    
+    def after(self, delay: int, fn: Callable[..., None], *args: Any) -> str:
+        self.jobs.append(lambda: fn(*args))
+        return f"after#{len(self.jobs)}"
+    
+    def after_cancel(self, job: str) -> None:
+        pass
+    
+    def report_callback_exception(self, exc_type: type, err: BaseException, traceback: Any) -> None:
+        self.errors.append(err)
+    
+    def run_jobs(self) -> None:
+        while self.jobs:
+            self.jobs.pop(0)()
+
+def test_failing_handler_does_not_reach_the_publisher(caplog: pytest.LogCaptureFixture) -> None:
+    bus = EventBus()
+    received = []
+    
+    def fail(event: Any) -> None:
+        raise RuntimeError("handler failed")
+    
+    bus.subscribe(fail, RoomAdded)
+    bus.subscribe(received.append, RoomAdded, RoomDeleted)
+    
+    with caplog.at_level(logging.ERROR, logger="marites.events"):
+        bus.publish(RoomAdded(101))
+    
+    assert received == [RoomAdded(101)]
+    assert "handler failed" in caplog.text
+
+def test_unsubscribe() -> None:
+    bus = EventBus()
+    received = []
+    
+    unsubscribe = bus.subscribe(received.append, RoomAdded)
+    unsubscribe()
+    bus.publish(RoomAdded(101))
+    
+    assert received == []
+
+def test_events_dispatched_by_a_call_arrive_before_its_result() -> None:
+    widget = FakeWidget()
+    executor = DatabaseExecutor(widget)  # type: ignore[arg-type]
+    bus = EventBus()
+    received = []
+    
+    bus.subscribe(lambda event: received.append(event), RoomAdded, dispatch=executor.call_soon)
+    
+    def write() -> str:
+        bus.publish(RoomAdded(101))
+        return "written"
+    
+    future = executor.submit(write, on_success=received.append)
+    wait([future])
+    widget.run_jobs()
+    
+    executor.shutdown()
+    
+    assert received == [RoomAdded(101), "written"]
+
+def test_call_queued_while_polling_arrives_before_the_result() -> None:
+    widget = FakeWidget()
+    executor = DatabaseExecutor(widget)  # type: ignore[arg-type]
+    received = []
+    results = executor.results
+    
+    class RacingQueue:
+        """
+        The worker queues its call and finishes after the poll has run the
+        queued calls, but before it reads the results.
+        """
+        
+        def get_nowait(self) -> Any:
+            result = results.get_nowait()
+            executor.calls.put((received.append, (RoomAdded(101),)))
+            return result
+    
+    future = executor.submit(lambda: "written", on_success=received.append)
+    wait([future])
+    
+    executor.results = RacingQueue()  # type: ignore[assignment]
+    widget.run_jobs()
+    executor.shutdown()
+    
+    assert received == [RoomAdded(101), "written"]
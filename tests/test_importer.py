@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from io import StringIO
+
+import pytest
+
+from src.managers.manager import BoardingHouseManager
+from src.models.entities import Room
+from src.models.validators import amount_characters, valid_amount, valid_name
+from src.services.importer import CsvImporter
+
+@pytest.mark.parametrize("amount", ["5000", "5000.50", "0.5", ".5", "5."])
+def test_valid_amount_accepts_what_the_forms_accept(amount: str) -> None:
+    assert amount_characters(amount)
+    assert valid_amount(amount)
+
+@pytest.mark.parametrize("amount", ["", ".", "nan", "inf", "1e5", "-5", "+5", "5.0.0", " 5", "5,000"])
+def test_valid_amount_refuses_what_the_forms_refuse(amount: str) -> None:
+    assert not valid_amount(amount)
+
+def test_valid_name() -> None:
+    assert valid_name("DELA CRUZ")
+    assert not valid_name("O'NEIL")
+    assert not valid_name("JUAN2")
+
+def test_invalid_amounts_are_rejected(manager: BoardingHouseManager) -> None:
+    manager.add_room(Room(room_number=101, max_capacity=2))
+    
+    report = CsvImporter(manager).import_payments(StringIO(
+        "room_number,leaser_id,payment_amount,payment_date,paid\n"
+        "101,1,nan,2024-01-01,paid\n"
+        "101,1,1e5,2024-01-01,paid\n"
+        "101,1,-5,2024-01-01,paid\n"
+    ))
+    
+    assert report.inserted == 0
+    assert [reject.line for reject in report.rejects] == [2, 3, 4]
+
+def test_failed_chunk_in_a_batch_is_retried_without_duplicates(manager: BoardingHouseManager) -> None:
+    manager.add_room(Room(room_number=101, max_capacity=5))
+    
+    tenants = StringIO(
+        "last_name,first_name,middle_name,birth_date,contact_number,room_number\n"
+        "SANTOS,JUAN,,2000-01-01,09123456780,101\n"
+        "REYES,ANA,,2000-01-01,09123456781,404\n"
+        "CRUZ,JOSE,,2000-01-01,09123456782,101\n"
+    )
+    
+    with manager.batch():
+        report = CsvImporter(manager).import_tenants(tenants)
+    
+    assert report.inserted == 2
+    assert [reject.line for reject in report.rejects] == [3]
+    assert sorted(tenant.last_name for tenant in manager.get_all_tenants()) == ["CRUZ", "SANTOS"]
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import pytest
+
+from src.managers.manager import BoardingHouseManager
+from src.services.instrumentation import action, query_budget, current_action, QueryBudgetExceeded, N_PLUS_ONE_THRESHOLD
+
+from tests.conftest import add_leased_room
+
+def test_query_budget_within_budget(manager: BoardingHouseManager) -> None:
+    add_leased_room(manager)
+    
+    with query_budget(1) as stats:
+        manager.get_payment_rows(101)
+    
+    assert stats.statements == 1
+    assert current_action.get() is None
+
+def test_query_budget_exceeded(manager: BoardingHouseManager) -> None:
+    add_leased_room(manager)
+    
+    with pytest.raises(QueryBudgetExceeded, match="executed 2 statements, over its budget of 1"):
+        with query_budget(1):
+            manager.get_payment_rows(101)
+            manager.count_rooms()
+
+def test_query_budget_reports_n_plus_one(manager: BoardingHouseManager) -> None:
+    for room_number in range(101, 101 + N_PLUS_ONE_THRESHOLD):
+        add_leased_room(manager, room_number=room_number, tenants=1, payments=1)
+    
+    # Within budget, but the same SELECT once per room
+    with pytest.raises(QueryBudgetExceeded, match="N\\+1"):
+        with query_budget(100):
+            for room_number in range(101, 101 + N_PLUS_ONE_THRESHOLD):
+                manager.get_payment_rows(room_number)
+
+def test_nested_action_joins_the_running_one(manager: BoardingHouseManager) -> None:
+    with action("outer") as outer:
+        manager.count_rooms()
+        
+        with action("inner") as inner:
+            manager.count_rooms()
+    
+    assert inner is outer
+    assert outer.statements == 2
+    assert outer.finished
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import pytest
+
+from datetime import date
+from typing import Iterable
+
+from sqlalchemy.exc import IntegrityError
+
+from src.managers.manager import BoardingHouseManager
+from src.models.entities import Room, Tenant
+from src.models.projections import TenantRow
+from src.services.search import TrigramIndex
+from src.services.instrumentation import query_budget
+
+from tests.conftest import add_leased_room
+
+def test_get_room_detail_loads_the_aggregate_in_three_queries(manager: BoardingHouseManager) -> None:
+    add_leased_room(manager, tenants=3, payments=4)
+    
+    # The room with its lease and leaser, then the tenants, then the payments
+    with query_budget(3, "get_room_detail") as stats:
+        room = manager.get_room_detail(101)
+    
+    assert stats.statements == 3
+    
+    # Detached, so any relationship not loaded above would raise
+    with query_budget(0, "detached room"):
+        assert room.lease.leaser.tenant_id in {tenant.tenant_id for tenant in room.tenants}
+        assert len(room.tenants) == 3
+        assert len(room.payments) == 4
+
+def test_get_room_detail_of_a_missing_room(manager: BoardingHouseManager) -> None:
+    assert manager.get_room_detail(404) is None
+
+def test_failed_update_leaves_no_changed_room_in_the_cache(manager: BoardingHouseManager) -> None:
+    add_leased_room(manager, tenants=3)
+    
+    # The forms change the cached instance before writing it
+    room = manager.get_room(101)
+    room.max_capacity = 1
+    
+    with pytest.raises(IntegrityError):
+        manager.update_room(room)
+    
+    assert manager.get_room(101).max_capacity == 4
+
+def test_missing_room_is_not_cached(manager: BoardingHouseManager) -> None:
+    assert manager.get_room(101) is None
+    
+    add_leased_room(manager, room_number=101)
+    
+    assert manager.get_room(101) is not None
+
+def test_name_index_sees_bulk_tenants_with_lower_ids(manager: BoardingHouseManager) -> None:
+    add_leased_room(manager, tenants=1)
+    manager.add_room(Room(room_number=102, max_capacity=2))
+    manager.add_tenant(Tenant(
+        last_name="Reyes",
+        first_name="Ana",
+        birth_date=date(2000, 1, 1),
+        contact_number="09123456789",
+        room_number=101,
+        tenant_id=100
+    ))
+    manager.enable_name_index()
+    
+    manager.bulk_add_tenants([{
+        "tenant_id": 50,
+        "last_name": "Bautista",
+        "first_name": "Jose",
+        "birth_date": date(2000, 1, 1),
+        "contact_number": "09123456788",
+        "room_number": 102
+    }])
+    
+    assert [tenant.tenant_id for tenant in manager.fuzzy_search_tenants("bautista")] == [50]
+
+def test_name_index_replays_writes_made_during_the_build(manager: BoardingHouseManager, monkeypatch: pytest.MonkeyPatch) -> None:
+    add_leased_room(manager, tenants=1)
+    
+    build = TrigramIndex.add_all
+    
+    def add_all_and_write(index: TrigramIndex, tenants: Iterable[TenantRow]) -> None:
+        build(index, tenants)
+        
+        # A write committing after the build has read the tenants
+        monkeypatch.setattr(TrigramIndex, "add_all", build)
+        manager.add_tenant(Tenant(
+            last_name="Bautista",
+            first_name="Jose",
+            birth_date=date(2000, 1, 1),
+            contact_number="09123456788",
+            room_number=101
+        ))
+    
+    monkeypatch.setattr(TrigramIndex, "add_all", add_all_and_write)
+    
+    assert [tenant.last_name for tenant in manager.fuzzy_search_tenants("bautista")] == ["BAUTISTA"]